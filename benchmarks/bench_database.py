@@ -0,0 +1,204 @@
+"""
+Scaling benchmark for the simulated database: EnglishExecutionEngine's simulate_*
+methods and database_functionality's AdvancedDatabaseOperations, on synthetic
+tables from 1k to 10M rows.
+
+Each table size runs in its own subprocess, so its peak RSS is measured in
+isolation and a size that runs out of memory does not take the others down. Every
+operation runs for up to --time-budget seconds; the report lists throughput, p50
+and p99 latency per operation and size, and how latency grows with the row count
+(an exponent near 1 means linear in the table size).
+
+    python benchmarks/bench_database.py --sizes 1000,100000,1000000
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+from harness import ROOT_DIR, Runner, metadata
+
+sys.path.insert(0, os.path.join(ROOT_DIR, 'database_functionality'))
+
+from advanced_database_operations import AdvancedDatabaseOperations  # noqa: E402
+from english_execution_engine import EnglishExecutionEngine  # noqa: E402
+from perf_stats import LatencyHistogram  # noqa: E402
+
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000, 10000000)
+QUICK_SIZES = (1000, 10000)
+CITIES = ('Austin', 'Berlin', 'Chennai', 'Lagos', 'Lima', 'Osaka', 'Oslo', 'Perth')
+
+
+def generate_tables(rows: int, seed: int = 0) -> Dict[str, List[Dict[str, Any]]]:
+    """A users table with rows rows and an orders table with one order per user."""
+    rng = random.Random(seed)
+    users = [{'id': i, 'name': f"user{i}", 'age': rng.randint(18, 90), 'city': CITIES[i % len(CITIES)]}
+             for i in range(rows)]
+    orders = [{'id': i, 'user_id': rng.randrange(rows), 'total': rng.randint(1, 500)} for i in range(rows)]
+    return {'users': users, 'orders': orders}
+
+
+def operations(engine: EnglishExecutionEngine, advanced: AdvancedDatabaseOperations, rows: int,
+               seed: int = 0) -> Dict[str, Any]:
+    """
+    The workloads, by name: (category, operation). Operations that change a table
+    undo the change, so every run sees the same table size.
+    """
+    rng = random.Random(seed)
+
+    def point_update():
+        engine.simulate_update('users', {'id': rng.randrange(rows), 'age': 30})
+
+    def point_delete():
+        key = rng.randrange(rows)
+        engine.simulate_delete('users', {'id': key})
+        engine.simulate_insert('users', {'id': key, 'name': f"user{key}", 'age': 30, 'city': CITIES[key % len(CITIES)]})
+
+    def insert():
+        engine.simulate_insert('users', {'id': rows, 'name': 'new', 'age': 40, 'city': 'Oslo'})
+        engine.simulated_database['users'].pop()
+
+    return {
+        'point_update': ('point', point_update),
+        'point_delete': ('point', point_delete),
+        'insert': ('point', insert),
+        'select_all': ('range', lambda: engine.simulate_select('users')),
+        'select_instruction': ('range', lambda: engine.process_database_instruction("show all users")),
+        'complex_query': ('range', lambda: advanced.execute_complex_query("select * from users")),
+        'aggregate': ('aggregate', lambda: advanced.aggregate_data("select count from orders")),
+        'join': ('join', lambda: advanced.join_tables("users join orders")),
+    }
+
+
+def measure(operation: Callable[[], Any], time_budget: float, max_ops: int) -> Dict[str, Any]:
+    histogram = LatencyHistogram()
+    start = time.perf_counter()
+    ops = 0
+    while ops < max_ops and (ops == 0 or time.perf_counter() - start < time_budget):
+        began = time.perf_counter_ns()
+        operation()
+        histogram.record(time.perf_counter_ns() - began)
+        ops += 1
+    elapsed = time.perf_counter() - start
+    summary = histogram.summary()
+    return {
+        'ops': ops,
+        'throughput': ops / elapsed if elapsed else 0.0,
+        'median': summary['p50_us'] / 1e6,
+        'p99': summary['p99_us'] / 1e6,
+        'max': summary['max_us'] / 1e6
+    }
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_size(rows: int, names: List[str], time_budget: float, max_ops: int) -> Dict[str, Any]:
+    """Benchmark one table size in this process."""
+    start = time.perf_counter()
+    tables = generate_tables(rows)
+    generate_seconds = time.perf_counter() - start
+    table_rss_mb = peak_rss_mb()
+
+    engine = EnglishExecutionEngine()
+    advanced = AdvancedDatabaseOperations()
+    engine.simulated_database = advanced.simulated_database = tables
+    workloads = operations(engine, advanced, rows)
+    results = {}
+    for name in names:
+        category, operation = workloads[name]
+        results[name] = dict(measure(operation, time_budget, max_ops), category=category)
+    return {
+        'rows': rows,
+        'generate_seconds': generate_seconds,
+        'table_rss_mb': table_rss_mb,
+        'peak_rss_mb': peak_rss_mb(),
+        'operations': results
+    }
+
+
+def run_size_in_subprocess(rows: int, names: List[str], time_budget: float, max_ops: int) -> Dict[str, Any]:
+    command = [sys.executable, os.path.abspath(__file__), '--child', str(rows), '--operations', ','.join(names),
+               '--time-budget', str(time_budget), '--max-ops', str(max_ops)]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        reason = completed.stderr.strip().splitlines()[-1:] or [f"exit status {completed.returncode}"]
+        return {'rows': rows, 'error': reason[0]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def growth_exponent(sizes: List[Dict[str, Any]], name: str) -> float:
+    """The slope of log latency against log rows between the two largest sizes."""
+    points = [(size['rows'], size['operations'][name]['median']) for size in sizes
+              if 'operations' in size and size['operations'][name]['median'] > 0]
+    if len(points) < 2:
+        return float('nan')
+    (rows1, time1), (rows2, time2) = points[-2], points[-1]
+    return math.log(time2 / time1) / math.log(rows2 / rows1)
+
+
+def print_report(sizes: List[Dict[str, Any]], names: List[str]):
+    measured = [size for size in sizes if 'operations' in size]
+    columns = ''.join(f"{size['rows']:>14,}" for size in measured)
+    for key, title, scale, unit in (('median', 'p50 latency', 1e6, 'us'), ('p99', 'p99 latency', 1e6, 'us'),
+                                    ('throughput', 'throughput', 1, '/s')):
+        print(f"{title:<20}{columns}" + (f"{'growth':>9}" if key == 'median' else ''))
+        for name in names:
+            cells = ''.join(f"{size['operations'][name][key] * scale:>11.1f} {unit}" for size in measured)
+            growth = f"{growth_exponent(measured, name):>9.2f}" if key == 'median' else ''
+            print(f"  {name:<18}{cells}{growth}")
+        print()
+    print(f"{'peak RSS':<20}" + ''.join(f"{size['peak_rss_mb']:>11.1f} MB" for size in measured))
+
+
+def main():
+    runner = Runner('database', "Simulated database scaling benchmark")
+    runner.add_argument('--sizes', help="Comma-separated table sizes (default 1k to 10M)")
+    runner.add_argument('--operations', help="Comma-separated operations to run (default all)")
+    runner.add_argument('--time-budget', type=float, default=2.0, help="Seconds spent on each operation per size")
+    runner.add_argument('--max-ops', type=int, default=10000, help="Most calls of each operation per size")
+    runner.add_argument('--child', type=int, help=argparse.SUPPRESS)
+    args = runner.parse_args()
+
+    names = args.operations.split(',') if args.operations else list(operations(None, None, 1))
+    if args.child is not None:
+        print(json.dumps(run_size(args.child, names, args.time_budget, args.max_ops)))
+        return
+
+    if args.sizes:
+        row_counts = [int(size) for size in args.sizes.split(',')]
+    else:
+        row_counts = list(QUICK_SIZES if args.quick else DEFAULT_SIZES)
+    time_budget = min(args.time_budget, 0.2) if args.quick else args.time_budget
+
+    sizes = []
+    for rows in row_counts:
+        size = run_size_in_subprocess(rows, names, time_budget, args.max_ops)
+        sizes.append(size)
+        if 'error' in size:
+            print(f"{rows:>12,} rows  failed: {size['error']}")
+        else:
+            print(f"{rows:>12,} rows  generated in {size['generate_seconds']:.2f} s, peak RSS {size['peak_rss_mb']:.1f} MB")
+    print()
+    print_report(sizes, names)
+
+    results = {'suite': runner.suite, 'metadata': metadata(), 'sizes': sizes, 'benchmarks': {}}
+    for size in sizes:
+        for name, result in size.get('operations', {}).items():
+            results['benchmarks'][f"{name}/{size['rows']}"] = dict(result, rows=size['rows'],
+                                                                  peak_rss_mb=size['peak_rss_mb'])
+    raise SystemExit(runner.report(results))
+
+
+if __name__ == '__main__':
+    main()
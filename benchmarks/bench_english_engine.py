@@ -0,0 +1,155 @@
+"""
+Benchmarks for EnglishExecutionEngine: parse_instruction for each grammar rule,
+execute_instruction for each operation, loops and function calls of growing length,
+and stack, queue, list and dictionary operations on containers of growing size.
+
+    python benchmarks/bench_english_engine.py --compare
+"""
+
+from harness import Benchmark, Runner
+
+from english_execution_engine import EnglishExecutionEngine
+
+# One instruction per grammar rule in parse_instruction
+GRAMMAR_RULES = {
+    'function_call_with_assignment': "Set 'r' to the result of calling 'double' with 5",
+    'variable_management': "Create a variable named 'x' with value 5",
+    'arithmetic': "Set 'y' to 'x' plus 'x'",
+    'set_literal': "set 'z' to 3",
+    'add': "add 'z' to 'x'",
+    'control_structure': "If 'x' is greater than 3, set 'z' to 1, otherwise set 'z' to 2",
+    'loop': "For i from 1 to 10, add 'i' to 'x'",
+    'function_definition': "Define function 'double' that takes n as parameters and returns n * 2",
+    'function_call': "Call function 'double' that takes 4 as parameters",
+    'list_operation': "Create list 'numbers' with [1, 2, 3]",
+    'dictionary_operation': "Create dictionary 'person'",
+    'file_operation': "Read file 'notes.txt'",
+    'process_management': "Start process 'worker'",
+    'network_operation': "GET request to 'http://localhost:8080/status'",
+    'system_operation': "Execute system command 'ls -l'",
+    'stack_operation': "Push stack 'calls' item 1",
+    'queue_operation': "Enqueue queue 'jobs' item 1",
+    'class_operation': "Create a class named Point",
+}
+
+# Instructions whose execution has no side effects outside the engine
+EXECUTED_RULES = ('variable_management', 'arithmetic', 'set_literal', 'add', 'control_structure',
+                  'function_definition', 'function_call', 'function_call_with_assignment',
+                  'list_operation', 'dictionary_operation', 'stack_operation', 'queue_operation')
+
+LOOP_LENGTHS = (10, 100, 1000)
+CALL_COUNTS = (1, 10, 100)
+CONTAINER_SIZES = (10, 1000, 100000)
+
+
+def new_engine() -> EnglishExecutionEngine:
+    engine = EnglishExecutionEngine()
+    for instruction in ("Create a variable named 'x' with value 5", "set 'z' to 3",
+                        "Define function 'double' that takes n as parameters and returns n * 2",
+                        "Create stack 'calls'", "Create queue 'jobs'"):
+        engine.execute_instruction(engine.parse_instruction(instruction))
+    return engine
+
+
+def parse_benchmarks(engine):
+    for rule, instruction in GRAMMAR_RULES.items():
+        yield Benchmark(f"parse/{rule}", lambda instruction=instruction: engine.parse_instruction(instruction))
+
+
+def execute_benchmarks(engine):
+    for rule in EXECUTED_RULES:
+        parsed = engine.parse_instruction(GRAMMAR_RULES[rule])
+        yield Benchmark(f"execute/{rule}", lambda parsed=parsed: engine.execute_instruction(parsed))
+
+
+def loop_benchmarks(engine):
+    for length in LOOP_LENGTHS:
+        parsed = engine.parse_instruction(f"For i from 1 to {length}, add 'i' to 'z'")
+        reset = engine.parse_instruction("set 'z' to 0")
+
+        def run(parsed=parsed, reset=reset):
+            engine.execute_instruction(reset)
+            engine.execute_instruction(parsed)
+        yield Benchmark(f"loop/for/{length}", run)
+
+        condition = engine.parse_instruction(f"While 'z' is less than {length}, add 'x' to 'z'")
+        one = engine.parse_instruction("set 'x' to 1")
+
+        def run_while(condition=condition, reset=reset, one=one):
+            engine.execute_instruction(one)
+            engine.execute_instruction(reset)
+            engine.execute_instruction(condition)
+        yield Benchmark(f"loop/while/{length}", run_while)
+
+
+def call_benchmarks(engine):
+    call = engine.parse_instruction("Call function 'double' that takes 4 as parameters")
+    assign = engine.parse_instruction("Set 'r' to the result of calling 'double' with 5")
+    for count in CALL_COUNTS:
+        def run(count=count):
+            for _ in range(count):
+                engine.execute_instruction(call)
+        yield Benchmark(f"call/function/{count}", run)
+    yield Benchmark("call/with_assignment", lambda: engine.execute_instruction(assign))
+
+
+def container_benchmarks(engine):
+    # Operations are paired (push then pop, ...) so the container keeps its size
+    for size in CONTAINER_SIZES:
+        def fill_stack(size=size):
+            engine.variables['bench_stack'] = list(range(size))
+        push = {'operation': 'stack_operation', 'stack_operation': 'push', 'stack_name': 'bench_stack', 'item': 1}
+        pop = {'operation': 'stack_operation', 'stack_operation': 'pop', 'stack_name': 'bench_stack'}
+        peek = {'operation': 'stack_operation', 'stack_operation': 'peek', 'stack_name': 'bench_stack'}
+        yield Benchmark(f"stack/push_pop/{size}",
+                        lambda push=push, pop=pop: (engine.execute_instruction(push), engine.execute_instruction(pop)),
+                        setup=fill_stack)
+        yield Benchmark(f"stack/peek/{size}", lambda peek=peek: engine.execute_instruction(peek), setup=fill_stack)
+
+        def fill_queue(size=size):
+            engine.variables['bench_queue'] = list(range(size))
+        enqueue = {'operation': 'queue_operation', 'queue_operation': 'enqueue', 'queue_name': 'bench_queue', 'item': 1}
+        dequeue = {'operation': 'queue_operation', 'queue_operation': 'dequeue', 'queue_name': 'bench_queue'}
+        yield Benchmark(f"queue/enqueue_dequeue/{size}",
+                        lambda enqueue=enqueue, dequeue=dequeue: (engine.execute_instruction(enqueue),
+                                                                  engine.execute_instruction(dequeue)),
+                        setup=fill_queue)
+
+        def fill_list(size=size):
+            engine.variables['bench_list'] = list(range(size))
+        append = {'operation': 'list_operation', 'list_operation': 'append', 'list_name': 'bench_list', 'item': -1}
+        remove = {'operation': 'list_operation', 'list_operation': 'remove', 'list_name': 'bench_list', 'item': -1}
+        get = {'operation': 'list_operation', 'list_operation': 'get', 'list_name': 'bench_list', 'index': size // 2}
+        yield Benchmark(f"list/append_remove/{size}",
+                        lambda append=append, remove=remove: (engine.execute_instruction(append),
+                                                              engine.execute_instruction(remove)),
+                        setup=fill_list)
+        yield Benchmark(f"list/get/{size}", lambda get=get: engine.execute_instruction(get), setup=fill_list)
+
+        def fill_dictionary(size=size):
+            engine.variables['bench_dict'] = {f"key{i}": i for i in range(size)}
+        set_key = {'operation': 'dictionary_operation', 'dict_operation': 'set', 'dict_name': 'bench_dict',
+                   'key': 'extra', 'value': 1}
+        remove_key = {'operation': 'dictionary_operation', 'dict_operation': 'remove', 'dict_name': 'bench_dict',
+                      'key': 'extra'}
+        get_key = {'operation': 'dictionary_operation', 'dict_operation': 'get', 'dict_name': 'bench_dict',
+                   'key': f"key{size // 2}"}
+        yield Benchmark(f"dict/set_remove/{size}",
+                        lambda set_key=set_key, remove_key=remove_key: (engine.execute_instruction(set_key),
+                                                                        engine.execute_instruction(remove_key)),
+                        setup=fill_dictionary)
+        yield Benchmark(f"dict/get/{size}", lambda get_key=get_key: engine.execute_instruction(get_key),
+                        setup=fill_dictionary)
+
+
+def benchmarks():
+    engine = new_engine()
+    yield from parse_benchmarks(engine)
+    yield from execute_benchmarks(engine)
+    yield from loop_benchmarks(engine)
+    yield from call_benchmarks(engine)
+    yield from container_benchmarks(engine)
+
+
+if __name__ == '__main__':
+    Runner('english_engine', __doc__.strip().splitlines()[0]).main(benchmarks)
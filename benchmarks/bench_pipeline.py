@@ -0,0 +1,197 @@
+"""
+End-to-end benchmark of EnglishInterpreter with local stand-ins for CoreNLP, the LLM
+and the embedding model (see fakes.py). Each configuration processes the same
+instruction stream and reports throughput and tail latency.
+
+Configurations:
+    sequential         process_single_instruction, one instruction at a time
+    sequential_cached  the same with the on-disk embedding cache enabled
+    async              aprocess_single_instruction, --concurrency instructions in flight
+    batched            process_single_instruction(batched=True) from --concurrency threads,
+                       sharing micro-batched LLM prompts
+
+    python benchmarks/bench_pipeline.py --instructions 200 --llm-latency 50
+"""
+
+import asyncio
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from harness import Runner, metadata
+from fakes import FakeCoreNLPServer, FakeEmbeddings, FakeLLM
+
+from embedding_index import DEFAULT_INSTRUCTION_EXEMPLARS
+from english_interpreter import EnglishInterpreter
+from input_processor import InputProcessor
+from intent_recognizer import IntentRecognizer
+from perf_stats import LatencyHistogram
+
+CONFIGURATIONS = {
+    'sequential': {'mode': 'sequential', 'embedding_cache': False},
+    'sequential_cached': {'mode': 'sequential', 'embedding_cache': True},
+    'async': {'mode': 'async', 'embedding_cache': True},
+    'batched': {'mode': 'batched', 'embedding_cache': True},
+}
+
+
+def make_workload(count: int, repeat_ratio: float, seed: int = 0) -> List[str]:
+    """
+    Build a deterministic instruction stream from the known exemplars.
+
+    A repeat_ratio share of the instructions is drawn from a small hot set, the
+    rest are exemplars with fresh names and numbers.
+    """
+    rng = random.Random(seed)
+    exemplars = [text for text, _ in DEFAULT_INSTRUCTION_EXEMPLARS]
+    hot = exemplars[:5]
+    workload = []
+    for i in range(count):
+        if rng.random() < repeat_ratio:
+            workload.append(rng.choice(hot))
+        else:
+            text = rng.choice(exemplars).replace("'count'", f"'count{i}'")
+            workload.append(text.replace('10', str(rng.randint(1, 1000))))
+    return workload
+
+
+def build_interpreter(config: Dict[str, Any], args, corenlp_url: str, cache_dir: str):
+    embeddings = FakeEmbeddings(latency=args.embedding_latency / 1000.0)
+    intent_recognizer = IntentRecognizer(max_batch_size=args.max_batch_size, max_batch_wait_ms=args.max_batch_wait_ms)
+    llm = FakeLLM(latency=args.llm_latency / 1000.0,
+                  per_item_latency=args.llm_item_latency / 1000.0).install(intent_recognizer)
+    interpreter = EnglishInterpreter(embeddings=embeddings,
+                                     embedding_cache_dir=cache_dir if config['embedding_cache'] else None,
+                                     input_processor=InputProcessor(corenlp_url=corenlp_url),
+                                     intent_recognizer=intent_recognizer)
+    # Load NLTK data and embed the exemplars before timing starts
+    interpreter.input_processor.lemmatizer
+    interpreter.match_known_instruction("warm up")
+    return interpreter, llm, embeddings
+
+
+class Recorder:
+    """Collects per-instruction latencies and failures from any thread."""
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, start: int, error: Exception = None):
+        duration = time.perf_counter_ns() - start
+        with self._lock:
+            self.histogram.record(duration)
+            if error is not None:
+                name = type(error).__name__
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+
+def run_sequential(interpreter, workload, recorder, args):
+    for instruction in workload:
+        start = time.perf_counter_ns()
+        try:
+            interpreter.process_single_instruction(instruction)
+        except Exception as e:
+            recorder.record(start, e)
+        else:
+            recorder.record(start)
+
+
+def run_async(interpreter, workload, recorder, args):
+    async def process(instruction, semaphore):
+        async with semaphore:
+            start = time.perf_counter_ns()
+            try:
+                await interpreter.aprocess_single_instruction(instruction)
+            except Exception as e:
+                recorder.record(start, e)
+            else:
+                recorder.record(start)
+
+    async def process_all():
+        semaphore = asyncio.Semaphore(args.concurrency)
+        await asyncio.gather(*(process(instruction, semaphore) for instruction in workload))
+
+    asyncio.run(process_all())
+
+
+def run_batched(interpreter, workload, recorder, args):
+    def process(instruction):
+        start = time.perf_counter_ns()
+        try:
+            interpreter.process_single_instruction(instruction, batched=True)
+        except Exception as e:
+            recorder.record(start, e)
+        else:
+            recorder.record(start)
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(process, workload))
+
+
+MODES = {'sequential': run_sequential, 'async': run_async, 'batched': run_batched}
+
+
+def run_configuration(name: str, args, server: FakeCoreNLPServer, workload: List[str]) -> Dict[str, Any]:
+    config = CONFIGURATIONS[name]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        interpreter, llm, embeddings = build_interpreter(config, args, server.url, cache_dir)
+        requests_before, llm_calls_before, embedding_calls_before = server.requests, llm.calls, embeddings.calls
+        recorder = Recorder()
+        start = time.perf_counter()
+        MODES[config['mode']](interpreter, workload, recorder, args)
+        elapsed = time.perf_counter() - start
+        interpreter.intent_recognizer.intent_batcher.close()
+
+    summary = recorder.histogram.summary()
+    return {
+        'median': summary['p50_us'] / 1e6,
+        'p90': summary['p90_us'] / 1e6,
+        'p99': summary['p99_us'] / 1e6,
+        'max': summary['max_us'] / 1e6,
+        'mean': summary['mean_us'] / 1e6,
+        'throughput': len(workload) / elapsed if elapsed else 0.0,
+        'instructions': len(workload),
+        'errors': recorder.errors,
+        'corenlp_requests': server.requests - requests_before,
+        'llm_calls': llm.calls - llm_calls_before,
+        'embedding_calls': embeddings.calls - embedding_calls_before,
+        'config': dict(config, concurrency=args.concurrency, max_batch_size=args.max_batch_size)
+    }
+
+
+def main():
+    runner = Runner('pipeline', "End-to-end EnglishInterpreter benchmark with local fakes")
+    runner.add_argument('--instructions', type=int, default=200, help="Instructions per configuration")
+    runner.add_argument('--repeat-ratio', type=float, default=0.5, help="Share of instructions drawn from a hot set")
+    runner.add_argument('--configs', default=','.join(CONFIGURATIONS), help="Comma-separated configurations to run")
+    runner.add_argument('--concurrency', type=int, default=8, help="Instructions in flight for async and batched")
+    runner.add_argument('--max-batch-size', type=int, default=8, help="Most instructions per batched LLM prompt")
+    runner.add_argument('--max-batch-wait-ms', type=float, default=10, help="How long a batch waits to fill")
+    runner.add_argument('--corenlp-latency', type=float, default=5, help="Simulated CoreNLP latency, ms")
+    runner.add_argument('--llm-latency', type=float, default=50, help="Simulated LLM latency per prompt, ms")
+    runner.add_argument('--llm-item-latency', type=float, default=5, help="Simulated LLM latency per instruction, ms")
+    runner.add_argument('--embedding-latency', type=float, default=2, help="Simulated embedding latency per call, ms")
+    args = runner.parse_args()
+    if args.quick:
+        args.instructions = min(args.instructions, 20)
+
+    workload = make_workload(args.instructions, args.repeat_ratio)
+    results = {'suite': runner.suite, 'metadata': metadata(), 'benchmarks': {}}
+    with FakeCoreNLPServer(latency=args.corenlp_latency / 1000.0) as server:
+        for name in [name.strip() for name in args.configs.split(',') if name.strip()]:
+            result = run_configuration(name, args, server, workload)
+            results['benchmarks'][name] = result
+            failed = sum(result['errors'].values())
+            print(f"{name:<20} {result['throughput']:>8.1f} instr/s  p50 {result['median'] * 1000:>8.2f} ms  "
+                  f"p99 {result['p99'] * 1000:>8.2f} ms  llm calls {result['llm_calls']:>5}  "
+                  f"corenlp {result['corenlp_requests']:>5}  failed {failed}")
+    raise SystemExit(runner.report(results))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+"""
+Deterministic local stand-ins for the interpreter's external services, with
+configurable simulated latency:
+
+- FakeCoreNLPServer answers CoreNLP annotation requests over local HTTP, so both
+  NLTK's CoreNLPDependencyParser and corenlp_client can talk to it.
+- FakeLLM replaces the LangChain chains IntentRecognizer prompts, answering in the
+  format the recognizer parses. Batched prompts pay the base latency once.
+- FakeEmbeddings is HashingEmbeddings with a simulated model round-trip.
+"""
+
+import asyncio
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from embedding_index import HashingEmbeddings
+
+_TOKEN = re.compile(r"'[^']*'|\"[^\"]*\"|\d+(?:\.\d+)?|\w+|[^\w\s]")
+_VERBS = {'set', 'create', 'define', 'call', 'display', 'print', 'show', 'read', 'write', 'add', 'remove',
+          'sort', 'find', 'repeat', 'increase', 'decrease', 'ask', 'import', 'run', 'calculate', 'append'}
+
+# Keywords checked in order; the first one found in the instruction picks the intent
+INTENT_KEYWORDS = (
+    ('define', 'function_definition'),
+    ('call', 'function_call'),
+    ('while', 'control_structure'),
+    ('if', 'control_structure'),
+    ('repeat', 'control_structure'),
+    ('for each', 'control_structure'),
+    ('list', 'data_structure_operation'),
+    ('dictionary', 'data_structure_operation'),
+    ('sort', 'algorithm_execution'),
+    ('find', 'algorithm_execution'),
+    ('display', 'io_operation'),
+    ('print', 'io_operation'),
+    ('file', 'io_operation'),
+    ('ask', 'io_operation'),
+    ('import', 'module_import'),
+    ('variable', 'variable_assignment'),
+    ('set', 'variable_assignment'),
+    ('increase', 'variable_assignment'),
+    ('decrease', 'variable_assignment'),
+)
+
+
+def annotate(text: str) -> Dict[str, Any]:
+    """
+    Build a CoreNLP-style JSON annotation of text as a single sentence.
+
+    The first token is the root; quoted words and numbers are tagged as nouns and
+    cardinals, and the first of them is its direct object.
+    """
+    tokens = []
+    for index, match in enumerate(_TOKEN.finditer(text), 1):
+        word = match.group()
+        lower = word.lower()
+        if re.fullmatch(r"\d+(?:\.\d+)?", word):
+            pos = 'CD'
+        elif word[0] in '\'"':
+            pos = 'NN'
+        elif lower in _VERBS:
+            pos = 'VB'
+        elif re.fullmatch(r'\W', word):
+            pos = '.' if word in '.!?' else ':'
+        else:
+            pos = 'NN'
+        tokens.append({
+            'index': index,
+            'word': word,
+            'originalText': word,
+            'lemma': lower,
+            'characterOffsetBegin': match.start(),
+            'characterOffsetEnd': match.end(),
+            'pos': pos,
+            'ner': 'NUMBER' if pos == 'CD' else 'O',
+            'before': ' ',
+            'after': ' '
+        })
+    dependencies = []
+    if tokens:
+        dependencies.append({'dep': 'ROOT', 'governor': 0, 'governorGloss': 'ROOT',
+                             'dependent': 1, 'dependentGloss': tokens[0]['word']})
+        direct_object = next((token['index'] for token in tokens[1:] if token['pos'] in ('NN', 'CD')), None)
+        for token in tokens[1:]:
+            dep = 'dobj' if token['index'] == direct_object else ('punct' if token['pos'] in '.:' else 'dep')
+            dependencies.append({'dep': dep, 'governor': 1, 'governorGloss': tokens[0]['word'],
+                                 'dependent': token['index'], 'dependentGloss': token['word']})
+    sentence = {
+        'index': 0,
+        'tokens': tokens,
+        'basicDependencies': dependencies,
+        'enhancedDependencies': dependencies,
+        'enhancedPlusPlusDependencies': dependencies
+    }
+    return {'sentences': [sentence]}
+
+
+class FakeCoreNLPServer:
+    """
+    A local HTTP server that answers annotation requests like a CoreNLP server.
+
+    Args:
+        latency (float): Seconds each request waits before answering.
+        port (int): The port to listen on; 0 picks a free one.
+    """
+
+    def __init__(self, latency: float = 0.0, host: str = '127.0.0.1', port: int = 0):
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FakeCoreNLPServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-corenlp', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'FakeCoreNLPServer':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _handler(self):
+        fake = self
+
+        class CoreNLPHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                text = self.rfile.read(length).decode('utf-8')
+                with fake._lock:
+                    fake.requests += 1
+                if fake.latency:
+                    time.sleep(fake.latency)
+                body = json.dumps(annotate(text)).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return CoreNLPHandler
+
+
+def classify(instruction: str) -> str:
+    text = instruction.lower()
+    for keyword, intent in INTENT_KEYWORDS:
+        if re.search(rf"\b{keyword}\b", text):
+            return intent
+    return 'expression_evaluation'
+
+
+def intent_response(instruction: str) -> str:
+    """The answer the intent prompt asks the model for."""
+    entities = re.findall(r"'([^']*)'", instruction) or ['none']
+    return f"Intent: {classify(instruction)}\nEntities: {', '.join(entities)}\nConfidence: 0.9"
+
+
+class FakeLLM:
+    """
+    A deterministic stand-in for the LLM behind IntentRecognizer's chains.
+
+    It exposes the run/arun interface of the LangChain chains, so install() can put
+    it in place of intent_chain and batch_intent_chain without loading LangChain or
+    a model. A prompt takes latency seconds plus per_item_latency for each
+    instruction it classifies.
+    """
+
+    def __init__(self, latency: float = 0.0, per_item_latency: float = 0.0):
+        self.latency = latency
+        self.per_item_latency = per_item_latency
+        self.calls = 0
+        self.items = 0
+        self._lock = threading.Lock()
+
+    def install(self, recognizer) -> 'FakeLLM':
+        recognizer.intent_chain = self
+        recognizer.batch_intent_chain = self
+        return self
+
+    def _respond(self, inputs: Dict[str, str]):
+        if 'instructions' in inputs:
+            items = re.findall(r'^\s*\[(\d+)\]\s*(.*)$', inputs['instructions'], re.MULTILINE)
+            response = '\n'.join(f"[{number}] {intent_response(text)}" for number, text in items)
+        else:
+            items = [inputs['instruction']]
+            response = intent_response(inputs['instruction'])
+        with self._lock:
+            self.calls += 1
+            self.items += len(items)
+        return response, self.latency + self.per_item_latency * len(items)
+
+    def run(self, **inputs: str) -> str:
+        response, delay = self._respond(inputs)
+        if delay:
+            time.sleep(delay)
+        return response
+
+    async def arun(self, **inputs: str) -> str:
+        response, delay = self._respond(inputs)
+        if delay:
+            await asyncio.sleep(delay)
+        return response
+
+
+class FakeEmbeddings(HashingEmbeddings):
+    """HashingEmbeddings that take latency seconds per call plus per_text_latency per text."""
+
+    def __init__(self, latency: float = 0.0, per_text_latency: float = 0.0, dimensions: int = 256):
+        super().__init__(dimensions)
+        self.model = f"fake-{dimensions}"
+        self.latency = latency
+        self.per_text_latency = per_text_latency
+        self.calls = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls += 1
+        delay = self.latency + self.per_text_latency * len(texts)
+        if delay:
+            time.sleep(delay)
+        return [HashingEmbeddings.embed_query(self, text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
@@ -0,0 +1,259 @@
+"""
+This module defines a small, dependency-free benchmark harness in the style of pyperf.
+
+Each benchmark is calibrated so one run lasts at least --min-time seconds, warmed up,
+then timed over several runs with the garbage collector paused. Results are written
+as JSON and can be compared against a stored baseline; the process exits with status
+1 when a benchmark's median regressed by more than --threshold.
+
+Every run also times a fixed reference workload, and comparisons use each median
+relative to the reference of its own run, so differences in machine speed and load
+largely cancel out. Quick runs are too noisy to gate on and never fail a comparison.
+
+Usage:
+    python benchmarks/bench_english_engine.py --output results.json
+    python benchmarks/bench_english_engine.py --update-baseline
+    python benchmarks/bench_english_engine.py --compare
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, 'src')
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+# The interpreter modules import each other as top-level modules
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+
+class Benchmark:
+    """
+    A named unit of work to time.
+
+    Args:
+        name (str): A unique, '/'-separated name such as 'execute/loop/100'.
+        func (callable): The operation to time; called with no arguments.
+        setup (callable, optional): Called once before calibration, e.g. to populate
+            the state func works on.
+    """
+
+    def __init__(self, name: str, func: Callable[[], Any], setup: Optional[Callable[[], Any]] = None):
+        self.name = name
+        self.func = func
+        self.setup = setup
+
+
+def _time_loops(func: Callable[[], Any], loops: int) -> float:
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        return time.perf_counter() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def run_benchmark(benchmark: Benchmark, runs: int = 10, warmups: int = 1, min_time: float = 0.1) -> Dict[str, Any]:
+    """
+    Time a benchmark.
+
+    Returns:
+        dict: Seconds per call: mean, median, stdev, min and max over the runs,
+            plus the number of loops per run and the raw values.
+    """
+    if benchmark.setup is not None:
+        benchmark.setup()
+    loops = 1
+    while True:
+        elapsed = _time_loops(benchmark.func, loops)
+        if elapsed >= min_time or loops >= 1 << 24:
+            break
+        loops *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    for _ in range(warmups):
+        _time_loops(benchmark.func, loops)
+
+    values = []
+    for _ in range(runs):
+        gc.collect()
+        values.append(_time_loops(benchmark.func, loops) / loops)
+    return {
+        'mean': statistics.fmean(values),
+        'median': statistics.median(values),
+        'stdev': statistics.stdev(values) if len(values) > 1 else 0.0,
+        'min': min(values),
+        'max': max(values),
+        'loops': loops,
+        'runs': runs,
+        'values': values
+    }
+
+
+def reference_workload():
+    """A fixed mix of dict, string and call work standing in for the machine's speed."""
+    table = {}
+    for i in range(200):
+        table[f"key{i}"] = i
+    return sum(len(key) + value for key, value in sorted(table.items()))
+
+
+REFERENCE = Benchmark('reference', reference_workload)
+
+
+def metadata() -> Dict[str, Any]:
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'date': datetime.datetime.now().isoformat(timespec='seconds')
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.25) -> List[Dict[str, Any]]:
+    """
+    Compare the medians of results against a baseline.
+
+    When both carry the median of the reference workload, each median is divided by
+    its own run's reference first, so the change does not depend on the machine.
+
+    Returns:
+        list: One row per benchmark present in both, with the relative change and
+            whether it counts as a regression or an improvement.
+    """
+    scale = 1.0
+    if results.get('reference') and baseline.get('reference'):
+        scale = baseline['reference'] / results['reference']
+    rows = []
+    for name, result in results['benchmarks'].items():
+        reference = baseline.get('benchmarks', {}).get(name)
+        if reference is None:
+            continue
+        change = result['median'] * scale / reference['median'] - 1.0 if reference['median'] else 0.0
+        rows.append({
+            'name': name,
+            'baseline': reference['median'],
+            'current': result['median'],
+            'change': change,
+            'regression': change > threshold,
+            'improvement': change < -threshold
+        })
+    return rows
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (('s', 1.0), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def load_json(path: str) -> Dict[str, Any]:
+    with open(path, 'r') as file:
+        return json.load(file)
+
+
+def write_json(path: str, data: Dict[str, Any]):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as file:
+        json.dump(data, file, indent=2, sort_keys=True)
+        file.write('\n')
+
+
+class Runner:
+    """
+    Command-line front end shared by the benchmark scripts.
+
+    Args:
+        suite (str): The suite name; the default baseline is baselines/<suite>.json.
+    """
+
+    def __init__(self, suite: str, description: Optional[str] = None):
+        self.suite = suite
+        self.default_baseline = os.path.join(BASELINE_DIR, f"{suite}.json")
+        self.parser = argparse.ArgumentParser(description=description or f"{suite} benchmarks")
+        self.parser.add_argument('--output', help="Write the results to this JSON file")
+        self.parser.add_argument('--baseline', default=self.default_baseline, help="Baseline JSON to compare against")
+        self.parser.add_argument('--compare', action='store_true', help="Compare the results against the baseline")
+        self.parser.add_argument('--update-baseline', action='store_true', help="Overwrite the baseline with these results")
+        self.parser.add_argument('--threshold', type=float, default=0.25,
+                                 help="Relative slowdown of the median counted as a regression")
+        self.parser.add_argument('--filter', help="Only run benchmarks whose name matches this regex")
+        self.parser.add_argument('--runs', type=int, default=10, help="Timed runs per benchmark")
+        self.parser.add_argument('--min-time', type=float, default=0.1, help="Minimum seconds per run")
+        self.parser.add_argument('--quick', action='store_true', help="Fewer, shorter runs for a smoke test")
+
+    def add_argument(self, *args, **kwargs):
+        """Add a suite-specific option; its value is in self.args after main() parses them."""
+        self.parser.add_argument(*args, **kwargs)
+
+    def parse_args(self, argv: Optional[list] = None):
+        self.args = self.parser.parse_args(argv)
+        if self.args.quick:
+            self.args.runs = min(self.args.runs, 3)
+            self.args.min_time = min(self.args.min_time, 0.01)
+        return self.args
+
+    def run(self, benchmarks: Iterable[Benchmark]) -> Dict[str, Any]:
+        pattern = re.compile(self.args.filter) if self.args.filter else None
+        results = {'suite': self.suite, 'metadata': metadata(), 'benchmarks': {}}
+        # The reference is timed before and after the suite, so drift during the run averages out
+        references = [run_benchmark(REFERENCE, runs=self.args.runs, min_time=self.args.min_time)['median']]
+        for benchmark in benchmarks:
+            if pattern is not None and not pattern.search(benchmark.name):
+                continue
+            result = run_benchmark(benchmark, runs=self.args.runs, min_time=self.args.min_time)
+            results['benchmarks'][benchmark.name] = result
+            print(f"{benchmark.name:<48} {format_time(result['median']):>12} +- {format_time(result['stdev'])}")
+        references.append(run_benchmark(REFERENCE, runs=self.args.runs, min_time=self.args.min_time)['median'])
+        results['reference'] = statistics.fmean(references)
+        print(f"{'reference workload':<48} {format_time(results['reference']):>12}")
+        return results
+
+    def report(self, results: Dict[str, Any]) -> int:
+        """Write, compare and store results as requested; return the exit status."""
+        if self.args.output:
+            write_json(self.args.output, results)
+        status = 0
+        if self.args.compare:
+            if not os.path.exists(self.args.baseline):
+                print(f"No baseline at {self.args.baseline}; run with --update-baseline first")
+                status = 1
+            else:
+                rows = compare(results, load_json(self.args.baseline), self.args.threshold)
+                print()
+                print(f"{'benchmark':<48} {'baseline':>12} {'current':>12} {'change':>9}")
+                for row in rows:
+                    flag = ' REGRESSION' if row['regression'] else (' faster' if row['improvement'] else '')
+                    print(f"{row['name']:<48} {format_time(row['baseline']):>12} {format_time(row['current']):>12} "
+                          f"{row['change']:>+8.1%}{flag}")
+                if self.args.quick:
+                    print("Quick runs are too short to gate on; regressions are not counted")
+                elif any(row['regression'] for row in rows):
+                    status = 1
+        if self.args.update_baseline:
+            # The raw per-run values are only useful for the run that produced them
+            summary = dict(results, benchmarks={name: {key: value for key, value in result.items() if key != 'values'}
+                                                for name, result in results['benchmarks'].items()})
+            write_json(self.args.baseline, summary)
+            print(f"Baseline written to {self.args.baseline}")
+        return status
+
+    def main(self, make_benchmarks: Callable[[], Iterable[Benchmark]], argv: Optional[list] = None):
+        """Parse arguments, run the benchmarks make_benchmarks returns and exit with the report's status."""
+        self.parse_args(argv)
+        sys.exit(self.report(self.run(make_benchmarks())))
@@ -0,0 +1,248 @@
+"""
+This module compiles conditions written in English or infix notation, such as
+"'x' is greater than 5 and 'y' equals 3", into Python closures. The condition is
+translated to infix, parsed with ast, checked against a whitelist of node types and
+turned into calls to operator functions, so no eval is involved. Compiled
+conditions are cached per condition string and reused across loop iterations.
+"""
+
+import ast
+import keyword
+import operator
+import re
+from functools import lru_cache
+from typing import Any, Callable, Mapping
+
+
+class ConditionError(ValueError):
+    """Raised when a condition cannot be compiled or evaluated."""
+
+
+# English phrases and their infix operators, longest phrases first
+_PHRASES = [
+    (r'\bthe\s+value\s+of\b', ''),
+    (r'\bis\s+not\s+in\b', ' not in '),
+    (r'\bis\s+in\b', ' in '),
+    (r'\b(?:is\s+)?greater\s+than\s+or\s+equal\s+to\b', ' >= '),
+    (r'\b(?:is\s+)?less\s+than\s+or\s+equal\s+to\b', ' <= '),
+    (r'\bis\s+at\s+least\b', ' >= '),
+    (r'\bis\s+at\s+most\b', ' <= '),
+    (r'\b(?:is\s+)?(?:greater|more|larger|bigger)\s+than\b', ' > '),
+    (r'\b(?:is\s+)?(?:less|fewer|smaller)\s+than\b', ' < '),
+    (r'\b(?:is\s+not\s+equal\s+to|does\s+not\s+equal|is\s+not)\b', ' != '),
+    (r'\b(?:is\s+)?equal\s+to\b|\bequals\b', ' == '),
+    (r'\bis\b', ' == '),
+    (r'\bplus\b', ' + '),
+    (r'\bminus\b', ' - '),
+    (r'\b(?:times|multiplied\s+by)\b', ' * '),
+    (r'\bdivided\s+by\b', ' / '),
+    (r'\b(?:modulo|mod)\b', ' % '),
+    (r'\btrue\b', 'True'),
+    (r'\bfalse\b', 'False'),
+    (r'(?<![<>=!])=(?!=)', ' == '),
+]
+_COMPILED_PHRASES = [(re.compile(pattern, re.IGNORECASE), replacement) for pattern, replacement in _PHRASES]
+_STRING_LITERAL = re.compile(r"'([^']*)'|\"([^\"]*)\"")
+_IDENTIFIER = re.compile(r'[A-Za-z_]\w*$')
+
+# Longest string, list or tuple a multiplication may build, so "[0] * 1000000000000" fails instead of exhausting memory
+MAX_REPEAT_LENGTH = 10_000_000
+
+
+def _multiply(left, right):
+    for sequence, count in ((left, right), (right, left)):
+        if (isinstance(sequence, (str, bytes, list, tuple)) and isinstance(count, int)
+                and len(sequence) * count > MAX_REPEAT_LENGTH):
+            raise ConditionError(f"Repeating a sequence of length {len(sequence)} {count} times "
+                                 f"exceeds {MAX_REPEAT_LENGTH} items")
+    return left * right
+
+
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: _multiply,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+}
+_UNARY_OPERATORS = {
+    ast.Not: operator.not_,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+_COMPARISONS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda left, right: left in right,
+    ast.NotIn: lambda left, right: left not in right,
+}
+_FUNCTIONS = {'len': len, 'abs': abs, 'min': min, 'max': max}
+
+Evaluator = Callable[[Mapping[str, Any]], Any]
+
+
+def to_infix(condition: str):
+    """
+    Translate an English condition to infix notation.
+
+    Single-quoted identifiers such as 'count' become names; they refer to the
+    variable when it is defined and to the string otherwise. Other quoted text is
+    kept as a string literal. Like literals, quoted names are held out of the phrase
+    rewriting, so 'times' or 'is' stay names rather than becoming operators; a quoted
+    Python keyword is renamed in the expression.
+
+    Returns:
+        tuple: The infix expression and a dict mapping each quoted name in the
+        expression to the variable it refers to.
+    """
+    literals = []
+    names = []
+
+    def extract(match):
+        text = match.group(1) if match.group(1) is not None else match.group(2)
+        if match.group(1) is not None and _IDENTIFIER.match(text):
+            names.append(text)
+            return f" __name{len(names) - 1}__ "
+        literals.append(text)
+        return f" __literal{len(literals) - 1}__ "
+
+    expression = _STRING_LITERAL.sub(extract, condition.strip().rstrip('.?!'))
+    for pattern, replacement in _COMPILED_PHRASES:
+        expression = pattern.sub(replacement, expression)
+    quoted_names = {}
+    for index, name in enumerate(names):
+        identifier = f"__name{index}__" if keyword.iskeyword(name) else name
+        quoted_names[identifier] = name
+        expression = expression.replace(f"__name{index}__", identifier)
+    for index, text in enumerate(literals):
+        expression = expression.replace(f"__literal{index}__", repr(text))
+    return ' '.join(expression.split()), quoted_names
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(text: str) -> Evaluator:
+    """
+    Compile an English or infix expression into a function of the variables.
+
+    Raises:
+        ConditionError: If the expression does not parse or uses an unsupported construct.
+    """
+    expression, quoted_names = to_infix(text)
+    try:
+        tree = ast.parse(expression, mode='eval')
+    except SyntaxError as e:
+        raise ConditionError(f"Cannot parse condition '{text}' (as '{expression}'): {e.msg}") from None
+    evaluate_node = _compile_node(tree.body, quoted_names)
+
+    def evaluate(variables: Mapping[str, Any]) -> Any:
+        try:
+            return evaluate_node(variables)
+        except ConditionError:
+            raise
+        except (TypeError, ValueError, ArithmeticError, LookupError) as e:
+            raise ConditionError(f"Cannot evaluate condition '{text}': {str(e)}") from None
+
+    evaluate.expression = expression
+    return evaluate
+
+
+@lru_cache(maxsize=1024)
+def compile_condition(condition: str) -> Callable[[Mapping[str, Any]], bool]:
+    """
+    Compile a condition into a function of the variables that returns a bool.
+
+    Raises:
+        ConditionError: If the condition does not parse or uses an unsupported construct.
+    """
+    evaluate = compile_expression(condition)
+
+    def condition_holds(variables: Mapping[str, Any]) -> bool:
+        return bool(evaluate(variables))
+
+    condition_holds.expression = evaluate.expression
+    return condition_holds
+
+
+def _compile_node(node: ast.AST, quoted_names) -> Evaluator:
+    if isinstance(node, ast.Constant):
+        value = node.value
+        return lambda variables: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name in quoted_names:
+            name = quoted_names[name]
+            return lambda variables: variables[name] if name in variables else name
+
+        def lookup(variables):
+            if name not in variables:
+                raise ConditionError(f"Unknown variable '{name}' in condition")
+            return variables[name]
+        return lookup
+
+    if isinstance(node, ast.BoolOp):
+        operands = [_compile_node(value, quoted_names) for value in node.values]
+        if isinstance(node.op, ast.And):
+            def all_true(variables):
+                result = True
+                for operand in operands:
+                    result = operand(variables)
+                    if not result:
+                        return result
+                return result
+            return all_true
+
+        def any_true(variables):
+            result = False
+            for operand in operands:
+                result = operand(variables)
+                if result:
+                    return result
+            return result
+        return any_true
+
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS:
+        apply, operand = _UNARY_OPERATORS[type(node.op)], _compile_node(node.operand, quoted_names)
+        return lambda variables: apply(operand(variables))
+
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+        apply = _BINARY_OPERATORS[type(node.op)]
+        left, right = _compile_node(node.left, quoted_names), _compile_node(node.right, quoted_names)
+        return lambda variables: apply(left(variables), right(variables))
+
+    if isinstance(node, ast.Compare) and all(type(op) in _COMPARISONS for op in node.ops):
+        first = _compile_node(node.left, quoted_names)
+        steps = [(_COMPARISONS[type(op)], _compile_node(comparator, quoted_names))
+                 for op, comparator in zip(node.ops, node.comparators)]
+
+        def compare(variables):
+            left = first(variables)
+            for apply, comparator in steps:
+                right = comparator(variables)
+                if not apply(left, right):
+                    return False
+                left = right
+            return True
+        return compare
+
+    if isinstance(node, (ast.List, ast.Tuple)):
+        elements = [_compile_node(element, quoted_names) for element in node.elts]
+        container = list if isinstance(node, ast.List) else tuple
+        return lambda variables: container(element(variables) for element in elements)
+
+    if isinstance(node, ast.Subscript):
+        value, index = _compile_node(node.value, quoted_names), _compile_node(node.slice, quoted_names)
+        return lambda variables: value(variables)[index(variables)]
+
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in _FUNCTIONS
+            and not node.keywords):
+        function = _FUNCTIONS[node.func.id]
+        arguments = [_compile_node(argument, quoted_names) for argument in node.args]
+        return lambda variables: function(*(argument(variables) for argument in arguments))
+
+    raise ConditionError(f"Unsupported expression in condition: {ast.dump(node)}")
@@ -0,0 +1,60 @@
+"""
+This module provides blocking and asyncio helpers for requesting annotations from a
+Stanford CoreNLP server.
+"""
+
+import json
+import time
+from typing import Any, Dict, Optional
+from metrics import REGISTRY
+
+CORENLP_URL = "http://localhost:9000"
+
+ROUND_TRIPS = REGISTRY.counter('codetalk_corenlp_requests_total', 'Annotation requests sent to CoreNLP', ('mode',))
+ROUND_TRIP_SECONDS = REGISTRY.histogram('codetalk_corenlp_request_duration_seconds',
+                                        'CoreNLP annotation round-trip time', ('mode',))
+
+
+def _request_params(properties: Dict[str, Any]) -> Dict[str, str]:
+    return {'properties': json.dumps(properties)}
+
+
+def get_annotations(text: str, properties: Dict[str, Any], url: str = CORENLP_URL) -> Dict[str, Any]:
+    """Annotate text with a blocking HTTP request."""
+    import requests
+
+    ROUND_TRIPS.labels('sync').inc()
+    start = time.perf_counter()
+    try:
+        response = requests.post(url, params=_request_params(properties), data=text.encode('utf-8'))
+    finally:
+        ROUND_TRIP_SECONDS.labels('sync').observe(time.perf_counter() - start)
+    return json.loads(response.text)
+
+
+async def aget_annotations(text: str, properties: Dict[str, Any], url: str = CORENLP_URL,
+                           session: Optional[Any] = None) -> Dict[str, Any]:
+    """
+    Annotate text without blocking the event loop. This needs the optional aiohttp
+    package; without it an ImportError says so.
+
+    Args:
+        session (aiohttp.ClientSession, optional): A session to reuse; a temporary
+            one is created when omitted.
+    """
+    try:
+        import aiohttp
+    except ImportError as e:
+        raise ImportError("Asynchronous CoreNLP requests need aiohttp; install it with 'pip install aiohttp'") from e
+
+    if session is None:
+        async with aiohttp.ClientSession() as own_session:
+            return await aget_annotations(text, properties, url, own_session)
+    ROUND_TRIPS.labels('async').inc()
+    start = time.perf_counter()
+    try:
+        async with session.post(url, params=_request_params(properties), data=text.encode('utf-8')) as response:
+            body = await response.text()
+    finally:
+        ROUND_TRIP_SECONDS.labels('async').observe(time.perf_counter() - start)
+    return json.loads(body)
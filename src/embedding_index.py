@@ -0,0 +1,267 @@
+"""
+This module defines an embedding index of known English instruction exemplars that
+maps new instructions to the closest known intent using cosine similarity. NumPy
+is imported where it is used, so importing this module does not load it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from metrics import REGISTRY
+
+if TYPE_CHECKING:
+    import numpy as np
+
+DEFAULT_EMBEDDING_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'codetalkpython', 'embeddings')
+
+_CACHE_LOOKUPS = REGISTRY.counter('codetalk_embedding_cache_lookups_total',
+                                  'Embedding cache lookups, by result (hit or miss)', ('result',))
+_CACHE_HITS = _CACHE_LOOKUPS.labels('hit')
+_CACHE_MISSES = _CACHE_LOOKUPS.labels('miss')
+
+# Known instructions for each intent type handled by EnglishInterpreter._execute_instruction
+DEFAULT_INSTRUCTION_EXEMPLARS: Tuple[Tuple[str, str], ...] = (
+    ("Create a variable named 'count' and set its value to 10", 'variable_assignment'),
+    ("Set the value of 'count' to twice its current value", 'variable_assignment'),
+    ("Increase the value of 'counter' by 3", 'variable_assignment'),
+    ("If the value of 'count' is greater than 15, display 'High count'", 'control_structure'),
+    ("While 'count' is greater than 0, decrease 'count' by 1", 'control_structure'),
+    ("Repeat the following 3 times: display 'Hello, World!'", 'control_structure'),
+    ("Define a function called 'greet' that takes a 'name' parameter", 'function_definition'),
+    ("Define a function 'add' that takes two numbers and returns their sum", 'function_definition'),
+    ("Call the 'greet' function with the value of the 'name' variable", 'function_call'),
+    ("Call the 'add' function with 5 and 7", 'function_call'),
+    ("Ask the user to enter their age", 'io_operation'),
+    ("Display the value of 'user_age' to the screen", 'io_operation'),
+    ("Write the value of 'sum' to a file named 'result.txt'", 'io_operation'),
+    ("Read the contents of 'result.txt' and display them", 'io_operation'),
+    ("Create a list called 'fruits' with items 'apple', 'banana', and 'orange'", 'data_structure_operation'),
+    ("Add 'grape' to the end of the 'fruits' list", 'data_structure_operation'),
+    ("Remove 'banana' from the 'fruits' list", 'data_structure_operation'),
+    ("Create a dictionary called 'person' with keys 'name' and 'age'", 'data_structure_operation'),
+    ("Sort the 'fruits' list in alphabetical order", 'algorithm_execution'),
+    ("Find the largest number in the list [3, 7, 2, 9, 1]", 'algorithm_execution'),
+    ("Search for 7 in the list [3, 7, 2, 9, 1]", 'algorithm_execution'),
+    ("Calculate 5 plus 7 times 2", 'expression_evaluation'),
+    ("Try to divide 10 by 0 and handle the error", 'error_handling'),
+    ("Import the module named 'math'", 'module_import'),
+    ("Create a new user named 'alice'", 'create_user'),
+    ("Set the IP address of interface 'eth0' to 192.168.1.10", 'set_network_config'),
+    ("Install the package named 'curl'", 'install_package'),
+    ("Create a directory named 'logs'", 'configure_filesystem'),
+    ("Set the system time to 12:00", 'set_system_time'),
+)
+
+
+class HashingEmbeddings:
+    """
+    A deterministic, offline stand-in for an embedding model.
+
+    Words and word bigrams are hashed into a fixed number of signed buckets, so
+    instructions that share vocabulary end up close to each other. It exposes the
+    same embed_documents/embed_query interface as LangChain embeddings.
+    """
+
+    def __init__(self, dimensions: int = 256):
+        self.dimensions = dimensions
+        self.model = f"hashing-{dimensions}"
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        words = re.findall(r"[a-z0-9_]+", text.lower())
+        features = words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], 'little') % self.dimensions
+            sign = 1.0 if digest[4] & 1 else -1.0
+            vector[bucket] += sign
+        return vector
+
+
+class EmbeddingCache:
+    """
+    A disk cache of embedding vectors, stored as one .npz file per embedding model.
+    """
+
+    def __init__(self, directory: str, model_key: str):
+        self.directory = directory
+        self.path = os.path.join(directory, f"{model_key}.npz")
+        self.vectors: Dict[str, np.ndarray] = {}
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def _load(self):
+        import numpy as np
+        if not os.path.exists(self.path):
+            return
+        with np.load(self.path) as data:
+            for key, vector in zip(data['keys'], data['vectors']):
+                self.vectors[str(key)] = vector
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        vector = self.vectors.get(self.key(text))
+        if vector is None:
+            self.misses += 1
+            _CACHE_MISSES.inc()
+        else:
+            self.hits += 1
+            _CACHE_HITS.inc()
+        return vector
+
+    def put_many(self, texts: List[str], vectors: np.ndarray):
+        for text, vector in zip(texts, vectors):
+            self.vectors[self.key(text)] = vector
+        self.save()
+
+    def save(self):
+        import numpy as np
+        if not self.vectors:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        keys = list(self.vectors)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as file:
+            np.savez(file, keys=np.array(keys), vectors=np.stack([self.vectors[key] for key in keys]))
+        os.replace(temp_path, self.path)
+
+
+class IVFIndex:
+    """
+    An inverted-file approximate index over normalized vectors.
+
+    Vectors are clustered with spherical k-means; a query only scores the vectors
+    in the n_probe clusters whose centroids are closest to it.
+    """
+
+    def __init__(self, matrix: np.ndarray, n_lists: Optional[int] = None, n_probe: int = 4,
+                 iterations: int = 10, seed: int = 0):
+        import numpy as np
+        self.n_probe = n_probe
+        n_lists = n_lists or max(1, int(np.sqrt(len(matrix))))
+        rng = np.random.default_rng(seed)
+        self.centroids = matrix[rng.choice(len(matrix), size=n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(matrix @ self.centroids.T, axis=1)
+            for cluster in range(n_lists):
+                members = matrix[assignments == cluster]
+                if len(members):
+                    self.centroids[cluster] = _normalize(members.sum(axis=0, keepdims=True))[0]
+        assignments = np.argmax(matrix @ self.centroids.T, axis=1)
+        self.lists = [np.flatnonzero(assignments == cluster) for cluster in range(n_lists)]
+
+    def candidates(self, query: np.ndarray) -> np.ndarray:
+        import numpy as np
+        n_probe = min(self.n_probe, len(self.centroids))
+        closest = np.argsort(self.centroids @ query)[::-1][:n_probe]
+        return np.concatenate([self.lists[cluster] for cluster in closest])
+
+
+class EmbeddingIndex:
+    """
+    A vector index of known instruction exemplars and the intent each one expresses.
+
+    Exemplar vectors are kept L2-normalized in a single NumPy matrix, so a search
+    is one matrix-vector product. Once the index grows past ivf_threshold
+    exemplars, searches go through an IVFIndex instead of scanning every row.
+    """
+
+    def __init__(self, embeddings: Any, cache_dir: Optional[str] = None,
+                 ivf_threshold: int = 5000, n_probe: int = 4):
+        self.embeddings = embeddings
+        self.cache = EmbeddingCache(cache_dir, self._model_key(embeddings)) if cache_dir else None
+        self.ivf_threshold = ivf_threshold
+        self.n_probe = n_probe
+        self.texts: List[str] = []
+        self.intents: List[str] = []
+        self.matrix: Optional[np.ndarray] = None
+        self.ivf: Optional[IVFIndex] = None
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    @staticmethod
+    def _model_key(embeddings: Any) -> str:
+        model = getattr(embeddings, 'model', '') or ''
+        key = re.sub(r'[^A-Za-z0-9_.-]+', '_', f"{type(embeddings).__name__}-{model}")
+        return key.strip('_')
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts, reusing cached vectors and caching new ones."""
+        import numpy as np
+        vectors: List[Optional[np.ndarray]] = [None] * len(texts)
+        missing = list(range(len(texts)))
+        if self.cache is not None:
+            cached = [self.cache.get(text) for text in texts]
+            vectors = cached
+            missing = [i for i, vector in enumerate(cached) if vector is None]
+        if missing:
+            new_texts = [texts[i] for i in missing]
+            new_vectors = np.asarray(self.embeddings.embed_documents(new_texts), dtype=np.float32)
+            for i, vector in zip(missing, new_vectors):
+                vectors[i] = vector
+            if self.cache is not None:
+                self.cache.put_many(new_texts, new_vectors)
+        return np.stack(vectors).astype(np.float32)
+
+    def add_exemplars(self, exemplars: Iterable[Tuple[str, str]]):
+        """
+        Add known instructions to the index.
+
+        Args:
+            exemplars (iterable): (instruction text, intent type) pairs.
+        """
+        import numpy as np
+        exemplars = list(exemplars)
+        if not exemplars:
+            return
+        texts = [text for text, _ in exemplars]
+        vectors = _normalize(self._embed(texts))
+        self.matrix = vectors if self.matrix is None else np.vstack([self.matrix, vectors])
+        self.texts.extend(texts)
+        self.intents.extend(intent for _, intent in exemplars)
+        self.ivf = IVFIndex(self.matrix, n_probe=self.n_probe) if len(self) >= self.ivf_threshold else None
+
+    def search(self, text: str, k: int = 1) -> List[Dict[str, Any]]:
+        """
+        Find the k known instructions most similar to the given text.
+
+        Returns:
+            list: Dictionaries with 'intent', 'exemplar' and cosine 'score', best first.
+        """
+        if self.matrix is None:
+            return []
+        import numpy as np
+        query = _normalize(self._embed([text]))[0]
+        rows = self.ivf.candidates(query) if self.ivf is not None else np.arange(len(self))
+        scores = self.matrix[rows] @ query
+        top = np.argsort(scores)[::-1][:k]
+        return [
+            {'intent': self.intents[rows[i]], 'exemplar': self.texts[rows[i]], 'score': float(scores[i])}
+            for i in top
+        ]
+
+    def match(self, text: str, min_score: float = 0.0) -> Optional[Dict[str, Any]]:
+        """Return the closest known instruction, or None if it scores below min_score."""
+        results = self.search(text, k=1)
+        if results and results[0]['score'] >= min_score:
+            return results[0]
+        return None
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    import numpy as np
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
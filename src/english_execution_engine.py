@@ -1,11 +1,58 @@
 import re
 import ast
+import time
 import types
+import weakref
 from typing import Any, Dict, List, Union, Optional, Tuple
 from language_templates import LanguageTemplates
+from instruction_scheduler import InstructionScheduler
+from session_manager import InterpreterSession, bind_session
+from condition_compiler import compile_condition
+from tracing import DEBUG, ERROR, Tracer
+from metrics import REGISTRY, write_to_textfile
+from script_profiler import CPU, WALL, ScriptProfiler
+from execution_engine import HANDLER_ERRORS, INSTRUCTION_SECONDS, INSTRUCTIONS
+
+_ENGINE = 'english_execution_engine'
+_INSTRUCTION_SECONDS = INSTRUCTION_SECONDS.labels(_ENGINE)
+_LIVE_ENGINES = weakref.WeakSet()
+
+# Commands system operations may run, for security
+ALLOWED_SYSTEM_COMMANDS = ('ls', 'dir', 'echo', 'pwd', 'whoami', 'date', 'time', 'uptime')
+# Most commands a "Run ... in parallel" instruction has running at once
+MAX_PARALLEL_COMMANDS = 8
+
+
+def _simulated_table_sizes():
+    sizes = {}
+    for engine in list(_LIVE_ENGINES):
+        for table, rows in list(getattr(engine, 'simulated_database', {}).items()):
+            sizes[(table,)] = sizes.get((table,), 0) + len(rows)
+    return sizes
+
+
+def _run_coroutine(coroutine):
+    """asyncio.run, also from a thread that is already running an event loop."""
+    import asyncio
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
+REGISTRY.gauge('codetalk_simulated_database_rows', 'Rows in each simulated database table', ('table',),
+               callback=_simulated_table_sizes)
 
 class EnglishExecutionEngine:
-    def __init__(self):
+    # Per-user state swapped in by use_session
+    SESSION_ATTRIBUTES = ('variables', 'functions', 'function_parameters', 'simulated_database',
+                          'simulated_apps', 'defined_functions', 'tracer')
+
+    def __init__(self, tracer: Optional[Tracer] = None):
         self.variables: Dict[str, Any] = {}
         self.functions: Dict[str, callable] = {}
         self.function_parameters: Dict[str, List[str]] = {}  # New attribute to store function parameters
@@ -14,6 +61,16 @@ class EnglishExecutionEngine:
         self.simulated_database = {}
         self.simulated_apps = {}  # Dictionary to store simulated apps
         self.defined_functions = {}  # Dictionary to store user-defined functions
+        # Without a tracer only errors are recorded and nothing is printed; the CLI passes one that echoes status
+        self.tracer = tracer if tracer is not None else Tracer(level=ERROR)
+        # A ScriptProfiler attributing time to English instructions, when profiling
+        self.profiler: Optional[ScriptProfiler] = None
+        _LIVE_ENGINES.add(self)
+
+    def use_session(self, session: InterpreterSession):
+        """Execute instructions against an InterpreterSession's state for the duration of a with block."""
+        return bind_session(self, session, self.SESSION_ATTRIBUTES, factories={'tracer': self.tracer.fork})
+
     def process_database_instruction(self, instruction: str) -> str:
         """Process natural language database instructions."""
         words = instruction.lower().split()
@@ -57,7 +114,13 @@ class EnglishExecutionEngine:
 
     def parse_instruction(self, instruction: str) -> Dict[str, Any]:
         """Parse English instructions into executable operations."""
-        print(f"Parsing instruction: {instruction}")  # Add this line for debugging
+        parsed_instruction = self._parse_instruction(instruction)
+        if self.profiler is not None:
+            self.profiler.label(parsed_instruction, instruction)
+        return parsed_instruction
+
+    def _parse_instruction(self, instruction: str) -> Dict[str, Any]:
+        self.tracer.debug('parse', 'instruction', instruction=instruction)
 
         # Function call with assignment
         if match := re.match(r"Set '(\w+)' to the result of calling '(\w+)' with (.*)", instruction):
@@ -196,6 +259,13 @@ class EnglishExecutionEngine:
                 'operation': 'system_operation',
                 'command': match.group(1)
             }
+        elif match := re.match(r"Run (.+?) (?:in parallel|concurrently)(?: with at most (\d+) at a time)?$", instruction):
+            commands = re.findall(r"'([^']+)'", match.group(1)) or re.split(r",\s*(?:and\s+)?|\s+and\s+", match.group(1))
+            return {
+                'operation': 'parallel_system_operation',
+                'commands': [command.strip() for command in commands if command.strip()],
+                'max_concurrency': int(match.group(2)) if match.group(2) else None
+            }
 
         # Stack operations
         elif match := re.match(r"(Create|Push|Pop|Peek) (?:a )?stack (?:named )?'(\w+)'(?: (?:with|item) (.+))?", instruction):
@@ -304,6 +374,22 @@ class EnglishExecutionEngine:
     def execute_instruction(self, parsed_instruction: Dict[str, Any]) -> Any:
         """Execute the parsed instructions."""
         operation = parsed_instruction['operation']
+        INSTRUCTIONS.labels(_ENGINE, operation).inc()
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.enter(parsed_instruction)
+        start = time.perf_counter()
+        try:
+            return self._dispatch_instruction(operation, parsed_instruction)
+        except Exception:
+            HANDLER_ERRORS.labels(_ENGINE, operation).inc()
+            raise
+        finally:
+            _INSTRUCTION_SECONDS.observe(time.perf_counter() - start)
+            if profiler is not None:
+                profiler.exit()
+
+    def _dispatch_instruction(self, operation: str, parsed_instruction: Dict[str, Any]) -> Any:
 
         # Handle database operations
         if operation == 'database_operation':
@@ -333,7 +419,7 @@ class EnglishExecutionEngine:
             parsed_instruction['params'] = parsed_instruction.get('params', [])
             parsed_instruction['body'] = parsed_instruction.get('body', '')  # Add default empty string for 'body'
             code_snippet = self.language_templates.fill_template(template, **parsed_instruction)
-            print(f"Generated code snippet: {code_snippet}")
+            self.tracer.debug('execute', 'code_snippet', language=self.current_language, code=code_snippet)
             # TODO: Execute or return the code snippet as needed
         if operation == 'variable_management':
             return self.handle_variable_management(
@@ -371,25 +457,25 @@ class EnglishExecutionEngine:
                 parsed_instruction['return_expression']
             )
         elif operation == 'function_call':
-            print(f"Executing function call: {parsed_instruction}")
+            self.tracer.debug('execute', 'function_call', instruction=parsed_instruction)
             result = self.handle_function_call(
                 parsed_instruction['name'],
                 *parsed_instruction['arguments']
             )
             if 'result_var' in parsed_instruction:
                 self.variables[parsed_instruction['result_var']] = result
-                print(f"Function call result stored in variable '{parsed_instruction['result_var']}': {result}")
+                self.tracer.info('execute', 'result', "Function call result stored in variable '%s': %s", parsed_instruction['result_var'], result)
             else:
-                print(f"Function call result: {result}")
+                self.tracer.info('execute', 'result', "Function call result: %s", result)
             return result
         elif operation == 'function_call_with_assignment':
-            print(f"Executing function call with assignment: {parsed_instruction}")
+            self.tracer.debug('execute', 'function_call', instruction=parsed_instruction)
             result = self.handle_function_call(
                 parsed_instruction['function_name'],
                 *parsed_instruction['arguments']
             )
             self.variables[parsed_instruction['result_var']] = result
-            print(f"Function call result stored in variable '{parsed_instruction['result_var']}': {result}")
+            self.tracer.info('execute', 'result', "Function call result stored in variable '%s': %s", parsed_instruction['result_var'], result)
             return result
         elif operation == 'list_operation':
             return self.handle_list_operation(
@@ -427,6 +513,11 @@ class EnglishExecutionEngine:
             return self.handle_system_operation(
                 parsed_instruction['command']
             )
+        elif operation == 'parallel_system_operation':
+            return self.handle_parallel_system_operation(
+                parsed_instruction['commands'],
+                parsed_instruction.get('max_concurrency')
+            )
         elif operation == 'stack_operation':
             return self.handle_stack_operation(
                 parsed_instruction['stack_operation'],
@@ -466,6 +557,40 @@ class EnglishExecutionEngine:
         else:
             raise ValueError(f"Unknown operation: {operation}")
 
+    def execute_instructions(self, instructions: List[str], parallel: bool = False,
+                             max_workers: Optional[int] = None,
+                             line_numbers: Optional[List[int]] = None) -> List[Tuple[str, Any]]:
+        """
+        Parse and execute a batch of English instructions.
+
+        With parallel=True, instructions that touch disjoint variables, functions and
+        files run concurrently on a thread pool; the results and final state are the
+        same as executing the instructions one after another.
+
+        line_numbers gives each instruction's line in its source script; the profiler
+        uses them to name the instruction's frames. They default to 1, 2, 3, ...
+
+        Returns:
+            List of (instruction, result) tuples in input order. An instruction that
+            fails to parse or raises has the exception as its result.
+        """
+        if line_numbers is None:
+            line_numbers = list(range(1, len(instructions) + 1))
+        if parallel:
+            return InstructionScheduler(self, max_workers=max_workers).run(instructions, line_numbers)
+
+        results = []
+        for instruction, line_number in zip(instructions, line_numbers):
+            try:
+                parsed_instruction = self.parse_instruction(instruction)
+                if self.profiler is not None:
+                    self.profiler.label_line(parsed_instruction, line_number, instruction)
+                result = self.execute_instruction(parsed_instruction)
+            except Exception as e:
+                result = e
+            results.append((instruction, result))
+        return results
+
     def handle_database_operation(self, db_operation: str, table: str, **kwargs) -> str:
         """Handle simulated database operations (SELECT, INSERT, UPDATE, DELETE)."""
         if not hasattr(self, 'simulated_database'):
@@ -486,7 +611,7 @@ class EnglishExecutionEngine:
             else:
                 raise ValueError(f"Unknown database operation: {db_operation}")
         except Exception as e:
-            print(f"Error in simulated database operation: {str(e)}")
+            self.tracer.error('database', 'error', "Error in simulated database operation: %s", e)
             return str(e)
 
     def simulate_select(self, table: str) -> str:
@@ -514,54 +639,46 @@ class EnglishExecutionEngine:
                 if isinstance(value, str):
                     value = eval(value, {}, self.variables)
                 self.variables[name] = value
-                print(f"Variable '{name}' has been assigned the value: {value}")
+                self.tracer.info('variable', 'assigned', "Variable '%s' has been assigned the value: %s", name, value)
             elif action == 'get':
                 if name not in self.variables:
                     raise ValueError(f"Variable '{name}' is not defined.")
-                print(f"Value of variable '{name}': {self.variables[name]}")
+                self.tracer.info('variable', 'value', "Value of variable '%s': %s", name, self.variables[name])
                 return self.variables[name]
             elif action == 'delete':
                 if name not in self.variables:
                     raise ValueError(f"Variable '{name}' is not defined.")
                 del self.variables[name]
-                print(f"Variable '{name}' has been deleted.")
+                self.tracer.info('variable', 'deleted', "Variable '%s' has been deleted.", name)
             else:
                 raise ValueError(f"Unknown variable management action: {action}")
         except Exception as e:
-            print(f"Error in variable management: {str(e)}")
+            self.tracer.error('variable', 'error', "Error in variable management: %s", e)
 
     def handle_control_structure(self, structure_type: str, condition_var: str, comparison: str,
                                  comparison_value: int, true_action: Dict[str, Any],
                                  false_action: Optional[Dict[str, Any]] = None) -> None:
         """Handle control structures (if/else, while)."""
         try:
-            condition_result = self.variables.get(condition_var)
-            if condition_result is None:
+            if self.variables.get(condition_var) is None:
                 raise ValueError(f"Variable '{condition_var}' is not defined.")
-
-            if comparison == 'greater than':
-                result = condition_result > comparison_value
-            elif comparison == 'less than':
-                result = condition_result < comparison_value
-            elif comparison == 'equal to':
-                result = condition_result == comparison_value
-            else:
+            if comparison not in ('greater than', 'less than', 'equal to'):
                 raise ValueError(f"Unknown comparison: {comparison}")
+            value_text = f'"{comparison_value}"' if isinstance(comparison_value, str) else repr(comparison_value)
+            condition_holds = compile_condition(f"'{condition_var}' is {comparison} {value_text}")
 
             if structure_type == 'if':
-                if result:
+                if condition_holds(self.variables):
                     self.execute_instruction(true_action)
                 elif false_action:
                     self.execute_instruction(false_action)
             elif structure_type == 'while':
-                while result:
+                while condition_holds(self.variables):
                     self.execute_instruction(true_action)
-                    condition_result = self.variables.get(condition_var)
-                    result = eval(f"{condition_result} {comparison} {comparison_value}")
             else:
                 raise ValueError(f"Unknown control structure type: {structure_type}")
         except Exception as e:
-            print(f"Error in control structure execution: {str(e)}")
+            self.tracer.error('control', 'error', "Error in control structure execution: %s", e)
 
     def handle_loop(self, loop_var: str, start: int, end: int, action: Dict[str, Any]) -> None:
         """Handle loop structures."""
@@ -569,13 +686,13 @@ class EnglishExecutionEngine:
             for i in range(start, end + 1):
                 self.variables[loop_var] = i
                 self.execute_instruction(action)
-            print(f"Loop completed. Final value of {loop_var}: {self.variables[loop_var]}")
+            self.tracer.info('control', 'loop_completed', "Loop completed. Final value of %s: %s", loop_var, self.variables[loop_var])
         except Exception as e:
-            print(f"Error in loop execution: {str(e)}")
+            self.tracer.error('control', 'error', "Error in loop execution: %s", e)
 
     def handle_function_definition(self, name: str, parameters: List[str], return_expression: str) -> None:
         """Define functions based on English instructions."""
-        print(f"DEBUG: Defining function '{name}' with parameters: {parameters}")
+        self.tracer.debug('function', 'define', name=name, parameters=parameters)
         try:
             # Ensure parameters is a list of individual parameter names
             param_list = []
@@ -590,32 +707,29 @@ class EnglishExecutionEngine:
             }
 
             self.function_parameters[name] = param_list  # Store parameter names as a list
-            print(f"DEBUG: Function '{name}' has been defined and stored with parameters: {param_list}")
-            print(f"Function '{name}' has been defined with parameters: {', '.join(param_list)}")
+            self.tracer.info('function', 'defined', "Function '%s' has been defined with parameters: %s", name, ', '.join(param_list))
         except Exception as e:
-            print(f"DEBUG: Error in function definition for '{name}': {str(e)}")
-            print(f"Error in function definition: {str(e)}")
+            self.tracer.error('function', 'error', "Error in function definition: %s", e)
 
     def handle_function_call(self, name: str, *args) -> Any:
         """Execute function calls with variable arguments."""
-        print(f"DEBUG: Entering handle_function_call with name: {name}, args: {args}")
+        tracing = self.tracer.enabled('function')
         try:
             if name not in self.functions:
-                print(f"DEBUG: Function '{name}' is not defined.")
                 raise ValueError(f"Function '{name}' is not defined.")
 
             func_info = self.functions[name]
             expected_params = func_info['parameters']
             return_expression = func_info['return_expression']
-            print(f"DEBUG: Expected parameters: {expected_params}, got arguments: {args}")
 
             # Create a local scope for the function parameters
             local_scope = {}
             for param, arg in zip(expected_params, args):
                 local_scope[param] = arg
 
-            print(f"DEBUG: Local scope: {local_scope}")
-            print(f"DEBUG: Executing function '{name}' with return expression: {return_expression}")
+            if tracing:
+                self.tracer.debug('function', 'call', name=name, arguments=args, scope=dict(local_scope),
+                                  return_expression=return_expression)
 
             # Interpret and execute the return expression using the local scope
             if 'plus' in return_expression:
@@ -627,37 +741,33 @@ class EnglishExecutionEngine:
                 # Use eval with the local_scope to support more operations
                 result = eval(return_expression, {}, local_scope)
 
-            print(f"DEBUG: Function '{name}' executed successfully")
-            print(f"DEBUG: Result: {result}")
+            if tracing:
+                self.tracer.debug('function', 'return', name=name, result=result)
             return result
-        except ValueError as ve:
-            print(f"DEBUG: ValueError in function call: {str(ve)}")
-            raise
         except TypeError as te:
-            print(f"DEBUG: TypeError in function call: {str(te)}. Check if the correct number of arguments were provided.")
+            self.tracer.debug('function', 'error', name=name, arguments=args,
+                              error=f"{str(te)}. Check if the correct number of arguments were provided.")
             raise
         except Exception as e:
-            print(f"DEBUG: Unexpected error in function call: {str(e)}")
+            self.tracer.debug('function', 'error', name=name, arguments=args, error=str(e))
             raise
-        finally:
-            print(f"DEBUG: Exiting handle_function_call")
 
     def handle_list_operation(self, operation: str, list_name: str, item: Any = None, index: int = None) -> Any:
         """Handle list operations (create, append, remove, get)."""
         try:
             if operation == "create":
                 self.variables[list_name] = []
-                print(f"Created a new list '{list_name}'")
+                self.tracer.info('data', 'created', "Created a new list '%s'", list_name)
             elif operation == "append":
                 if list_name not in self.variables:
                     raise ValueError(f"List '{list_name}' does not exist")
                 self.variables[list_name].append(item)
-                print(f"Appended {item} to list '{list_name}'")
+                self.tracer.info('data', 'appended', "Appended %s to list '%s'", item, list_name)
             elif operation == "remove":
                 if list_name not in self.variables:
                     raise ValueError(f"List '{list_name}' does not exist")
                 self.variables[list_name].remove(item)
-                print(f"Removed {item} from list '{list_name}'")
+                self.tracer.info('data', 'removed', "Removed %s from list '%s'", item, list_name)
             elif operation == "get":
                 if list_name not in self.variables:
                     raise ValueError(f"List '{list_name}' does not exist")
@@ -667,19 +777,19 @@ class EnglishExecutionEngine:
             else:
                 raise ValueError(f"Unknown list operation: {operation}")
         except Exception as e:
-            print(f"Error in list operation: {str(e)}")
+            self.tracer.error('data', 'error', "Error in list operation: %s", e)
 
     def handle_dictionary_operation(self, operation: str, dict_name: str, key: Any = None, value: Any = None) -> Any:
         """Handle dictionary operations (create, set, get, remove)."""
         try:
             if operation == "create":
                 self.variables[dict_name] = {}
-                print(f"Created a new dictionary '{dict_name}'")
+                self.tracer.info('data', 'created', "Created a new dictionary '%s'", dict_name)
             elif operation == "set":
                 if dict_name not in self.variables:
                     raise ValueError(f"Dictionary '{dict_name}' does not exist")
                 self.variables[dict_name][key] = value
-                print(f"Set key '{key}' to value '{value}' in dictionary '{dict_name}'")
+                self.tracer.info('data', 'set', "Set key '%s' to value '%s' in dictionary '%s'", key, value, dict_name)
             elif operation == "get":
                 if dict_name not in self.variables:
                     raise ValueError(f"Dictionary '{dict_name}' does not exist")
@@ -692,39 +802,39 @@ class EnglishExecutionEngine:
                 if key not in self.variables[dict_name]:
                     raise KeyError(f"Key '{key}' not found in dictionary '{dict_name}'")
                 del self.variables[dict_name][key]
-                print(f"Removed key '{key}' from dictionary '{dict_name}'")
+                self.tracer.info('data', 'removed', "Removed key '%s' from dictionary '%s'", key, dict_name)
             else:
                 raise ValueError(f"Unknown dictionary operation: {operation}")
         except Exception as e:
-            print(f"Error in dictionary operation: {str(e)}")
+            self.tracer.error('data', 'error', "Error in dictionary operation: %s", e)
 
     def handle_file_operation(self, operation: str, filename: str, content: str = None, mode: str = 'r') -> Any:
         """Handle file operations (open, close, read, write, append)."""
         try:
             if operation == "open":
                 self.variables[filename] = open(filename, mode)
-                print(f"Opened file '{filename}' in mode '{mode}'")
+                self.tracer.info('file', 'opened', "Opened file '%s' in mode '%s'", filename, mode)
             elif operation == "close":
                 if filename not in self.variables or not hasattr(self.variables[filename], 'close'):
                     raise ValueError(f"No open file object found for '{filename}'")
                 self.variables[filename].close()
                 del self.variables[filename]
-                print(f"Closed file '{filename}'")
+                self.tracer.info('file', 'closed', "Closed file '%s'", filename)
             elif operation == "read":
                 if filename not in self.variables or not hasattr(self.variables[filename], 'read'):
                     raise ValueError(f"No open file object found for '{filename}'")
                 content = self.variables[filename].read()
-                print(f"Read content from file '{filename}'")
+                self.tracer.info('file', 'read', "Read content from file '%s'", filename)
                 return content
             elif operation in ["write", "append"]:
                 if filename not in self.variables or not hasattr(self.variables[filename], 'write'):
                     raise ValueError(f"No open file object found for '{filename}'")
                 self.variables[filename].write(content)
-                print(f"{'Wrote' if operation == 'write' else 'Appended'} content to file '{filename}'")
+                self.tracer.info('file', 'wrote', "%s content to file '%s'", 'Wrote' if operation == 'write' else 'Appended', filename)
             else:
                 raise ValueError(f"Unknown file operation: {operation}")
         except Exception as e:
-            print(f"Error in file operation: {str(e)}")
+            self.tracer.error('file', 'error', "Error in file operation: %s", e)
 
     def handle_process_management(self, action: str, process_name: str) -> None:
         """Handle process management operations (start, stop, restart)."""
@@ -732,26 +842,26 @@ class EnglishExecutionEngine:
             import psutil
             if action == "start":
                 # This is a simplified version. In reality, you'd need more information to start a process.
-                print(f"Starting process '{process_name}'")
+                self.tracer.info('process', 'started', "Starting process '%s'", process_name)
                 # os.system(f"start {process_name}")  # This is Windows-specific
             elif action in ["stop", "restart"]:
                 for proc in psutil.process_iter(['name']):
                     if proc.info['name'] == process_name:
                         if action == "stop":
                             proc.terminate()
-                            print(f"Stopped process '{process_name}'")
+                            self.tracer.info('process', 'stopped', "Stopped process '%s'", process_name)
                         else:  # restart
                             proc.terminate()
                             proc.wait()
                             # Again, this is simplified. You'd need the full command to restart.
-                            print(f"Restarted process '{process_name}'")
+                            self.tracer.info('process', 'restarted', "Restarted process '%s'", process_name)
                         break
                 else:
-                    print(f"No process named '{process_name}' found")
+                    self.tracer.info('process', 'not_found', "No process named '%s' found", process_name)
             else:
                 raise ValueError(f"Unknown process management action: {action}")
         except Exception as e:
-            print(f"Error in process management: {str(e)}")
+            self.tracer.error('process', 'error', "Error in process management: %s", e)
 
     def handle_network_operation(self, method: str, url: str, data: Any = None) -> Any:
         """Handle network operations (GET, POST, PUT, DELETE requests)."""
@@ -768,36 +878,99 @@ class EnglishExecutionEngine:
             else:
                 raise ValueError(f"Unknown HTTP method: {method}")
 
-            print(f"Performed {method} request to {url}")
+            self.tracer.info('network', 'request', "Performed %s request to %s", method, url)
             return response.json()
         except Exception as e:
-            print(f"Error in network operation: {str(e)}")
+            self.tracer.error('network', 'error', "Error in network operation: %s", e)
 
     def handle_system_operation(self, command: str) -> str:
         """Handle system-level operations (execute system commands)."""
         import subprocess
-        import shlex
-
-        # List of allowed commands for security
-        allowed_commands = ['ls', 'dir', 'echo', 'pwd', 'whoami', 'date', 'time', 'uptime']
 
         try:
-            # Split the command into parts
-            cmd_parts = shlex.split(command)
-
-            # Check if the base command is in the allowed list
-            if cmd_parts[0] not in allowed_commands:
-                raise ValueError(f"Command '{cmd_parts[0]}' is not allowed for security reasons.")
+            cmd_parts = self._validate_system_command(command)
 
             # Execute the command
             result = subprocess.run(cmd_parts, check=True, capture_output=True, text=True)
-            print(f"Executed system command: {command}")
+            self.tracer.info('system', 'executed', "Executed system command: %s", command)
             return result.stdout
         except subprocess.CalledProcessError as e:
-            print(f"Error executing system command: {e}")
+            self.tracer.error('system', 'error', "Error executing system command: %s", e)
             return e.output
         except Exception as e:
-            print(f"Error in system operation: {str(e)}")
+            self.tracer.error('system', 'error', "Error in system operation: %s", e)
+            return str(e)
+
+    def _validate_system_command(self, command: str) -> List[str]:
+        """Split a system command into arguments, raising ValueError unless it is allowed."""
+        import shlex
+
+        cmd_parts = shlex.split(command)
+        if not cmd_parts or cmd_parts[0] not in ALLOWED_SYSTEM_COMMANDS:
+            raise ValueError(f"Command '{cmd_parts[0] if cmd_parts else command}' is not allowed for security reasons.")
+        return cmd_parts
+
+    async def stream_system_commands(self, commands: List[str], max_concurrency: Optional[int] = None):
+        """
+        Run allowed system commands as concurrent subprocesses, at most max_concurrency
+        at a time, yielding (index, command, output) as each one finishes.
+
+        Every command is validated before any of them starts.
+
+        Raises:
+            ValueError: If a command is not allowed.
+        """
+        import asyncio
+
+        cmd_parts = [self._validate_system_command(command) for command in commands]
+        semaphore = asyncio.Semaphore(max_concurrency or MAX_PARALLEL_COMMANDS)
+
+        async def run(index: int) -> Tuple[int, str, str]:
+            async with semaphore:
+                process = await asyncio.create_subprocess_exec(*cmd_parts[index], stdout=asyncio.subprocess.PIPE,
+                                                               stderr=asyncio.subprocess.PIPE)
+                try:
+                    stdout, stderr = await process.communicate()
+                except asyncio.CancelledError:
+                    process.kill()
+                    await process.wait()
+                    raise
+            if process.returncode != 0:
+                self.tracer.error('system', 'error', "Error executing system command: %s exited with %s: %s",
+                                  commands[index], process.returncode, stderr.decode(errors='replace'))
+            return index, commands[index], stdout.decode(errors='replace')
+
+        tasks = [asyncio.ensure_future(run(index)) for index in range(len(commands))]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def handle_parallel_system_operation(self, commands: List[str], max_concurrency: Optional[int] = None) -> Any:
+        """
+        Run several allowed system commands concurrently.
+
+        Each command's output is reported as soon as it finishes, so the whole batch
+        takes about as long as its slowest command.
+
+        Returns:
+            list: The commands' outputs in the order the commands were given, or the
+            error message if a command is not allowed.
+        """
+        async def collect():
+            outputs = [None] * len(commands)
+            async for index, command, output in self.stream_system_commands(commands, max_concurrency):
+                outputs[index] = output
+                self.tracer.info('system', 'executed', "Executed system command: %s", command, output=output)
+            return outputs
+
+        try:
+            return _run_coroutine(collect())
+        except Exception as e:
+            self.tracer.error('system', 'error', "Error in system operation: %s", e)
             return str(e)
 
     def handle_arithmetic_operation(self, result_var: str, operand1: str, operation_type: str, operand2: str) -> None:
@@ -823,27 +996,27 @@ class EnglishExecutionEngine:
                 raise ValueError(f"Unknown arithmetic operation: {operation_type}")
 
             self.variables[result_var] = result
-            print(f"Result of {operand1} {operation_type} {operand2}: {result}")
-            print(f"Stored result in variable '{result_var}'")
+            self.tracer.info('arithmetic', 'result', "Result of %s %s %s: %s", operand1, operation_type, operand2, result)
+            self.tracer.info('arithmetic', 'stored', "Stored result in variable '%s'", result_var)
         except Exception as e:
-            print(f"Error in arithmetic operation: {str(e)}")
+            self.tracer.error('arithmetic', 'error', "Error in arithmetic operation: %s", e)
 
     def handle_list_operation(self, operation: str, list_name: str, item: Any = None, index: int = None) -> Any:
         """Perform list operations (create, append, remove, get)."""
         try:
             if operation == "create":
                 self.variables[list_name] = []
-                print(f"Created a new list '{list_name}'")
+                self.tracer.info('data', 'created', "Created a new list '%s'", list_name)
             elif operation == "append":
                 if list_name not in self.variables:
                     raise ValueError(f"List '{list_name}' does not exist")
                 self.variables[list_name].append(item)
-                print(f"Appended {item} to list '{list_name}'")
+                self.tracer.info('data', 'appended', "Appended %s to list '%s'", item, list_name)
             elif operation == "remove":
                 if list_name not in self.variables:
                     raise ValueError(f"List '{list_name}' does not exist")
                 self.variables[list_name].remove(item)
-                print(f"Removed {item} from list '{list_name}'")
+                self.tracer.info('data', 'removed', "Removed %s from list '%s'", item, list_name)
             elif operation == "get":
                 if list_name not in self.variables:
                     raise ValueError(f"List '{list_name}' does not exist")
@@ -853,19 +1026,19 @@ class EnglishExecutionEngine:
             else:
                 raise ValueError(f"Unknown list operation: {operation}")
         except Exception as e:
-            print(f"Error in list operation: {str(e)}")
+            self.tracer.error('data', 'error', "Error in list operation: %s", e)
 
     def handle_dictionary_operation(self, operation: str, dict_name: str, key: Any = None, value: Any = None) -> Any:
         """Perform dictionary operations (create, set, get, remove)."""
         try:
             if operation == "create":
                 self.variables[dict_name] = {}
-                print(f"Created a new dictionary '{dict_name}'")
+                self.tracer.info('data', 'created', "Created a new dictionary '%s'", dict_name)
             elif operation == "set":
                 if dict_name not in self.variables:
                     raise ValueError(f"Dictionary '{dict_name}' does not exist")
                 self.variables[dict_name][key] = value
-                print(f"Set key '{key}' to value '{value}' in dictionary '{dict_name}'")
+                self.tracer.info('data', 'set', "Set key '%s' to value '%s' in dictionary '%s'", key, value, dict_name)
             elif operation == "get":
                 if dict_name not in self.variables:
                     raise ValueError(f"Dictionary '{dict_name}' does not exist")
@@ -878,11 +1051,11 @@ class EnglishExecutionEngine:
                 if key not in self.variables[dict_name]:
                     raise KeyError(f"Key '{key}' not found in dictionary '{dict_name}'")
                 del self.variables[dict_name][key]
-                print(f"Removed key '{key}' from dictionary '{dict_name}'")
+                self.tracer.info('data', 'removed', "Removed key '%s' from dictionary '%s'", key, dict_name)
             else:
                 raise ValueError(f"Unknown dictionary operation: {operation}")
         except Exception as e:
-            print(f"Error in dictionary operation: {str(e)}")
+            self.tracer.error('data', 'error', "Error in dictionary operation: %s", e)
 
     def handle_input_output(self, operation: str, value: Any = None) -> Any:
         """Handle user input and output operations."""
@@ -898,19 +1071,19 @@ class EnglishExecutionEngine:
         try:
             if operation == "create":
                 self.variables[stack_name] = []
-                print(f"Created a new stack '{stack_name}'")
+                self.tracer.info('data', 'created', "Created a new stack '%s'", stack_name)
             elif operation == "push":
                 if stack_name not in self.variables:
                     raise ValueError(f"Stack '{stack_name}' does not exist")
                 self.variables[stack_name].append(item)
-                print(f"Pushed {item} onto stack '{stack_name}'")
+                self.tracer.info('data', 'pushed', "Pushed %s onto stack '%s'", item, stack_name)
             elif operation == "pop":
                 if stack_name not in self.variables:
                     raise ValueError(f"Stack '{stack_name}' does not exist")
                 if not self.variables[stack_name]:
                     raise IndexError(f"Stack '{stack_name}' is empty")
                 item = self.variables[stack_name].pop()
-                print(f"Popped {item} from stack '{stack_name}'")
+                self.tracer.info('data', 'popped', "Popped %s from stack '%s'", item, stack_name)
                 return item
             elif operation == "peek":
                 if stack_name not in self.variables:
@@ -921,26 +1094,26 @@ class EnglishExecutionEngine:
             else:
                 raise ValueError(f"Unknown stack operation: {operation}")
         except Exception as e:
-            print(f"Error in stack operation: {str(e)}")
+            self.tracer.error('data', 'error', "Error in stack operation: %s", e)
 
     def handle_queue_operation(self, operation: str, queue_name: str, item: Any = None) -> Any:
         """Handle queue operations (create, enqueue, dequeue, peek)."""
         try:
             if operation == "create":
                 self.variables[queue_name] = []
-                print(f"Created a new queue '{queue_name}'")
+                self.tracer.info('data', 'created', "Created a new queue '%s'", queue_name)
             elif operation == "enqueue":
                 if queue_name not in self.variables:
                     raise ValueError(f"Queue '{queue_name}' does not exist")
                 self.variables[queue_name].append(item)
-                print(f"Enqueued {item} to queue '{queue_name}'")
+                self.tracer.info('data', 'enqueued', "Enqueued %s to queue '%s'", item, queue_name)
             elif operation == "dequeue":
                 if queue_name not in self.variables:
                     raise ValueError(f"Queue '{queue_name}' does not exist")
                 if not self.variables[queue_name]:
                     raise IndexError(f"Queue '{queue_name}' is empty")
                 item = self.variables[queue_name].pop(0)
-                print(f"Dequeued {item} from queue '{queue_name}'")
+                self.tracer.info('data', 'dequeued', "Dequeued %s from queue '%s'", item, queue_name)
                 return item
             elif operation == "peek":
                 if queue_name not in self.variables:
@@ -951,11 +1124,47 @@ class EnglishExecutionEngine:
             else:
                 raise ValueError(f"Unknown queue operation: {operation}")
         except Exception as e:
-            print(f"Error in queue operation: {str(e)}")
+            self.tracer.error('data', 'error', "Error in queue operation: %s", e)
 
 def main():
-    engine = EnglishExecutionEngine()
-    # TODO: Add example usage of the EnglishExecutionEngine
+    import argparse
+
+    parser = argparse.ArgumentParser(description="English Execution Engine")
+    parser.add_argument("file", help="Path to a file of English instructions, one per line")
+    parser.add_argument("--parallel", action="store_true", help="Run independent instructions concurrently")
+    parser.add_argument("--workers", type=int, help="Maximum number of worker threads")
+    parser.add_argument("--trace", metavar="SUBSYSTEMS", help="Comma-separated subsystems to trace at debug level, or '*'")
+    parser.add_argument("--trace-file", help="Append trace events to this JSONL file")
+    parser.add_argument("--quiet", action="store_true", help="Do not echo status messages to the console")
+    parser.add_argument("--metrics-file", help="Write Prometheus metrics to this file when done")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="Sample the script and write a collapsed-stack profile of its English lines to FILE")
+    parser.add_argument("--profile-metric", choices=(WALL, CPU), default=WALL, help="Time to put in the profile")
+    parser.add_argument("--profile-interval", type=float, default=1.0, help="Milliseconds between profile samples")
+    args = parser.parse_args()
+
+    tracer = Tracer(sink_path=args.trace_file, echo=not args.quiet)
+    if args.trace:
+        tracer.set_level(DEBUG, [subsystem.strip() for subsystem in args.trace.split(',')])
+    engine = EnglishExecutionEngine(tracer=tracer)
+    with open(args.file, 'r') as file:
+        lines = [(number, line.strip()) for number, line in enumerate(file, 1) if line.strip()]
+    instructions = [instruction for _, instruction in lines]
+    if args.profile:
+        engine.profiler = ScriptProfiler(interval=args.profile_interval / 1000.0).start()
+    try:
+        for instruction, result in engine.execute_instructions(instructions, parallel=args.parallel,
+                                                               max_workers=args.workers,
+                                                               line_numbers=[number for number, _ in lines]):
+            print(f"{instruction} -> {result}")
+    finally:
+        tracer.close()
+        if engine.profiler is not None:
+            engine.profiler.stop()
+            engine.profiler.write_collapsed(args.profile, args.profile_metric)
+            print(engine.profiler.report())
+        if args.metrics_file:
+            write_to_textfile(args.metrics_file)
 
 if __name__ == "__main__":
     main()
@@ -1,25 +1,97 @@
 import argparse
+import asyncio
+import json
+import threading
+from functools import cached_property
 from execution_engine import ExecutionEngine
 from output_generator import OutputGenerator
 from intent_recognizer import IntentRecognizer
 from input_processor import InputProcessor
-from langchain_community.embeddings import OllamaEmbeddings
 from language_templates import LanguageTemplates
+from session_manager import bind_session
+from scope import Scope
+from condition_compiler import compile_condition, compile_expression
+from switch_dispatch import SwitchTable
+from perf_stats import NULL_SPAN, PerformanceStats
+from embedding_index import (
+    DEFAULT_EMBEDDING_CACHE_DIR,
+    DEFAULT_INSTRUCTION_EXEMPLARS,
+    EmbeddingIndex,
+    HashingEmbeddings,
+)
 
 class EnglishInterpreter:
-    def __init__(self, default_language='python'):
+    # Per-user state swapped in by use_session; everything else is shared between sessions
+    # Compiled switches go with the session too: their actions were recognized in its context
+    SESSION_ATTRIBUTES = ('variables', 'functions', 'data_structures', 'algorithms', 'current_scope',
+                          '_switch_tables')
+
+    # Nested English function calls allowed before a call fails with a recursion error
+    MAX_CALL_DEPTH = 200
+
+    # Intent types recognition may name directly, without an embedding lookup
+    KNOWN_INTENT_TYPES = frozenset(intent for _, intent in DEFAULT_INSTRUCTION_EXEMPLARS) | {'return_statement',
+                                                                                               'code_block'}
+
+    # Compiled switch statements kept, keyed by their cases and default
+    MAX_SWITCH_TABLES = 256
+
+    # Instructions answered from the interpreter's own performance histograms
+    PERFORMANCE_STATS_INSTRUCTIONS = ('show performance stats', 'show performance statistics')
+
+    def __init__(self, default_language='python', embeddings=None, embedding_cache_dir=DEFAULT_EMBEDDING_CACHE_DIR,
+                 perf_sample_rate=0.0, input_processor=None, intent_recognizer=None):
         self.execution_engine = ExecutionEngine()
         self.output_generator = OutputGenerator()
-        self.intent_recognizer = IntentRecognizer()
-        self.input_processor = InputProcessor()
+        self.intent_recognizer = intent_recognizer if intent_recognizer is not None else IntentRecognizer()
+        self.input_processor = input_processor if input_processor is not None else InputProcessor()
         self.variables = {}  # Dictionary to store variables
         self.functions = {}  # Dictionary to store user-defined functions
         self.data_structures = {}  # Dictionary to store complex data structures
         self.algorithms = {}  # Dictionary to store implemented algorithms
         self.current_scope = {}  # Initialize current_scope
-        self.embeddings = OllamaEmbeddings()  # Instantiate OllamaEmbeddings
+        self.call_depth = 0  # Number of English function calls currently executing
+        self._switch_tables = {}  # Compiled switch statements, keyed by their cases and default; per session
+        self._execution_lock = threading.Lock()  # Serializes execution started from async callers
+        self._embeddings = embeddings
+        self.embedding_cache_dir = embedding_cache_dir
+        self.semantic_match_threshold = 0.5
+        # Recognized intents below this confidence are checked against the embedding index
+        self.min_recognition_confidence = 0.7
         self.language = default_language
         self.templates = LanguageTemplates()
+        self.performance = PerformanceStats(sample_rate=perf_sample_rate)
+
+    @cached_property
+    def embeddings(self):
+        if self._embeddings is not None:
+            return self._embeddings
+        from langchain_community.embeddings import OllamaEmbeddings
+        return OllamaEmbeddings()
+
+    @cached_property
+    def embedding_index(self):
+        return EmbeddingIndex(self.embeddings, cache_dir=self.embedding_cache_dir)
+
+    def warm_up(self):
+        """
+        Load the NLP data, language model and embedding index up front.
+
+        Heavy dependencies are otherwise loaded by the first instruction that needs
+        them; long-running servers call this so no request pays that cost.
+        """
+        self.input_processor.lemmatizer
+        self.input_processor.dep_parser
+        self.intent_recognizer.sia
+        self.intent_recognizer.intent_chain
+        self.match_known_instruction("warm up")
+
+    def use_session(self, session):
+        """
+        Run instructions against an InterpreterSession's state for the duration of a
+        with block, sharing this interpreter's NLP components and LLM client.
+        """
+        return bind_session(self, session, self.SESSION_ATTRIBUTES)
 
     def main_driver(self, english_instruction=None, test_file=None):
         if test_file:
@@ -29,14 +101,128 @@ class EnglishInterpreter:
         else:
             raise ValueError("Either english_instruction or test_file must be provided")
 
-    def process_single_instruction(self, english_instruction):
+    def process_single_instruction(self, english_instruction, batched=False):
+        """
+        Process one English instruction.
+
+        Args:
+            english_instruction (str): The instruction.
+            batched (bool): Recognize the intent through the intent recognizer's
+                micro-batcher, so instructions processed at the same time from several
+                threads share LLM prompts. Their execution is still one at a time.
+        """
+        if self._is_performance_stats_request(english_instruction):
+            return self._performance_stats_result()
+        span = self.performance.begin()
         intent_data = self.input_processor.process_input(english_instruction)
+        span.mark('input_processing')
+        if batched:
+            recognized_intent = self.intent_recognizer.submit_intent(intent_data, self._get_current_context()).result()
+            span.mark('intent_recognition')
+            return self._complete_instruction_serialized(english_instruction, recognized_intent, span)
         context = self._get_current_context()
         recognized_intent = self.intent_recognizer.recognize_intent(intent_data, context)
+        span.mark('intent_recognition')
+        return self._complete_instruction(english_instruction, recognized_intent, context, span)
+
+    def get_performance_stats(self):
+        """
+        Return per-stage and per-intent latency summaries for sampled instructions.
+
+        Returns:
+            dict: 'sample_rate', plus 'stages' and 'intents' mapping names to count,
+            mean, p50, p90, p99 and max durations in microseconds.
+        """
+        return self.performance.snapshot()
+
+    def set_performance_sampling(self, sample_rate):
+        """Time the given fraction of instructions from now on; 0 turns timing off."""
+        self.performance.sample_rate = sample_rate
+
+    def _is_performance_stats_request(self, english_instruction):
+        return english_instruction.strip().rstrip('.').lower() in self.PERFORMANCE_STATS_INSTRUCTIONS
+
+    def _performance_stats_result(self):
+        return {
+            'output': self.performance.report(),
+            'context': self._get_current_context(),
+            'intent': {'type': 'performance_stats'},
+            'translated_code': None
+        }
+
+    async def aprocess_single_instruction(self, english_instruction):
+        """
+        Asynchronous variant of process_single_instruction.
+
+        NLP parsing and LLM intent recognition are awaited, so other instructions on
+        the same event loop make progress while this one waits on CoreNLP or the LLM.
+        """
+        if self._is_performance_stats_request(english_instruction):
+            return self._performance_stats_result()
+        span = self.performance.begin()
+        recognized_intent = await self._arecognize_instruction(english_instruction, span)
+        return await self._acomplete_instruction(english_instruction, recognized_intent, span)
+
+    async def aprocess_instructions(self, instructions):
+        """
+        Process several instructions, overlapping their NLP and LLM latency.
+
+        Recognition runs concurrently for all instructions; execution still happens
+        one instruction at a time, in order, so results match sequential processing.
+
+        Returns:
+            list: (instruction, result) tuples in input order.
+        """
+        spans = [self.performance.begin() for _ in instructions]
+        # Performance stats requests are answered in order, without recognition
+        recognitions = [None if self._is_performance_stats_request(instruction)
+                        else asyncio.ensure_future(self._arecognize_instruction(instruction, span))
+                        for instruction, span in zip(instructions, spans)]
+        results = []
+        try:
+            for instruction, recognition, span in zip(instructions, recognitions, spans):
+                if recognition is None:
+                    result = self._performance_stats_result()
+                else:
+                    result = await self._acomplete_instruction(instruction, await recognition, span)
+                results.append((instruction, result))
+        finally:
+            for recognition in recognitions:
+                if recognition is not None:
+                    recognition.cancel()
+        return results
+
+    async def _arecognize_instruction(self, english_instruction, span=NULL_SPAN):
+        intent_data = await self.input_processor.aprocess_input(english_instruction)
+        span.mark('input_processing')
+        recognized_intent = await self.intent_recognizer.arecognize_intent(intent_data, self._get_current_context())
+        span.mark('intent_recognition')
+        return recognized_intent
+
+    async def _acomplete_instruction(self, english_instruction, recognized_intent, span=NULL_SPAN):
+        # Semantic matching and execution block, so they run on a worker thread instead of the event loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._complete_instruction_serialized, english_instruction,
+                                          recognized_intent, span)
+
+    def _complete_instruction_serialized(self, english_instruction, recognized_intent, span=NULL_SPAN):
+        # Instructions from concurrent tasks or threads still execute one at a time against the shared state
+        with self._execution_lock:
+            span.mark('execution_wait')
+            return self._complete_instruction(english_instruction, recognized_intent, self._get_current_context(),
+                                              span)
+
+    def _complete_instruction(self, english_instruction, recognized_intent, context, span=NULL_SPAN):
+        self._apply_semantic_match(recognized_intent, english_instruction)
+        span.mark('semantic_match')
         translated_code = self.translate_to_code(recognized_intent)
+        span.mark('translation')
         result = self._execute_instruction(translated_code, context)
         self._update_context(result, context)
+        span.mark('execution')
         output = self.output_generator.generate_output(result, context)
+        span.mark('output_generation')
+        span.finish(recognized_intent.get('type'))
         return {
             'output': output,
             'context': context,
@@ -44,6 +230,32 @@ class EnglishInterpreter:
             'translated_code': translated_code
         }
 
+    def match_known_instruction(self, english_instruction):
+        """
+        Find the known instruction exemplar closest to the given instruction.
+
+        Returns:
+            dict: The matched 'intent', 'exemplar' and similarity 'score', or None
+            if nothing scores above the semantic match threshold.
+        """
+        if not len(self.embedding_index):
+            self.embedding_index.add_exemplars(DEFAULT_INSTRUCTION_EXEMPLARS)
+        return self.embedding_index.match(english_instruction, min_score=self.semantic_match_threshold)
+
+    def _apply_semantic_match(self, recognized_intent, english_instruction):
+        # The embedding index supplies the intent type only when recognition failed or was unsure
+        if recognized_intent.get('type'):
+            return
+        primary_intent = recognized_intent.get('primary_intent')
+        if (primary_intent in self.KNOWN_INTENT_TYPES
+                and recognized_intent.get('confidence_score', 0.0) >= self.min_recognition_confidence):
+            recognized_intent['type'] = primary_intent
+            return
+        match = self.match_known_instruction(english_instruction)
+        if match:
+            recognized_intent['type'] = match['intent']
+            recognized_intent['semantic_match'] = match
+
     def translate_to_code(self, recognized_intent):
         template_name = self._get_template_name(recognized_intent)
         template_args = self._extract_template_args(recognized_intent)
@@ -79,6 +291,7 @@ class EnglishInterpreter:
             'control_structure': self._handle_control_structure,
             'function_definition': self._handle_function_definition,
             'function_call': self._handle_function_call,
+            'return_statement': self._handle_return_statement,
             'io_operation': self._handle_io_operation,
             'data_structure_operation': self._handle_data_structure_operation,
             'algorithm_execution': self._handle_algorithm_execution,
@@ -135,7 +348,7 @@ class EnglishInterpreter:
                 results.append(result)
         return {'status': 'success', 'results': results}
 
-    def _handle_variable_assignment(self, intent_data):
+    def _handle_variable_assignment(self, intent_data, context=None):
         try:
             variable_name = intent_data.get('variable_name')
             value = intent_data.get('value')
@@ -269,14 +482,14 @@ class EnglishInterpreter:
         else:
             current[last_part] = value
 
-    def _handle_control_structure(self, intent_data):
+    def _handle_control_structure(self, intent_data, context=None):
         try:
             structure_type = intent_data.get('structure_type')
             condition = intent_data.get('condition')
             action = intent_data.get('action')
             else_action = intent_data.get('else_action')
 
-            if not structure_type or not action:
+            if not structure_type or (not action and structure_type != 'switch'):
                 raise ValueError("Incomplete control structure information")
 
             if structure_type in ['if', 'while', 'for', 'switch', 'try']:
@@ -311,8 +524,11 @@ class EnglishInterpreter:
 
     def _execute_while(self, condition, action):
         result = {'status': 'success', 'message': "While loop executed"}
-        while self._evaluate_complex_condition(condition):
-            action_result = self._execute_action(action)
+        # Recognize the body and condition once, not on every iteration
+        compiled_action = self._compile_block(action)
+        condition_holds = self._compile_condition(condition)
+        while condition_holds():
+            action_result = self._execute_compiled_block(compiled_action)
             if action_result['status'] == 'error':
                 return action_result
             if 'break' in action_result:
@@ -327,10 +543,11 @@ class EnglishInterpreter:
         iterable = intent_data.get('iterable')
 
         result = {'status': 'success', 'message': "For loop executed"}
+        compiled_action = self._compile_block(action)
         if iterations:
             for i in range(int(iterations)):
                 self.variables['_index'] = i
-                action_result = self._execute_action(action)
+                action_result = self._execute_compiled_block(compiled_action)
                 if action_result['status'] == 'error':
                     return action_result
                 if 'break' in action_result:
@@ -341,7 +558,7 @@ class EnglishInterpreter:
             for i, item in enumerate(self._get_iterable(iterable)):
                 self.variables[iterator] = item
                 self.variables['_index'] = i
-                action_result = self._execute_action(action)
+                action_result = self._execute_compiled_block(compiled_action)
                 if action_result['status'] == 'error':
                     return action_result
                 if 'break' in action_result:
@@ -353,16 +570,32 @@ class EnglishInterpreter:
         return result
 
     def _execute_switch(self, condition, intent_data):
-        cases = intent_data.get('cases', {})
-        default = intent_data.get('default')
-
-        condition_value = self._evaluate_complex_condition(condition)
-        for case, action in cases.items():
-            if self._evaluate_complex_condition(f"{condition_value} == {case}"):
-                return self._execute_action(action)
-        if default:
-            return self._execute_action(default)
-        return {'status': 'success', 'message': "No matching case found"}
+        switch = self._switch_table(intent_data.get('cases', {}), intent_data.get('default'))
+        try:
+            condition_value = compile_expression(condition)(self.variables)
+        except Exception as e:
+            raise ValueError(f"Error evaluating condition: {str(e)}")
+        compiled_action = switch.compiled_action(condition_value)
+        if compiled_action is None:
+            return {'status': 'success', 'message': "No matching case found"}
+        return self._execute_compiled_block(compiled_action)
+
+    def _switch_table(self, cases, default):
+        # Build the dispatch table once per switch; repeated runs (e.g. in a loop) reuse it.
+        # It is kept here rather than in the intent, which callers receive and may serialize.
+        try:
+            key = (tuple(cases.items()), default)
+            switch = self._switch_tables.get(key)
+        except TypeError:
+            # Unhashable actions: compile the switch without caching it
+            return SwitchTable(cases, default, compile_action=self._compile_block)
+        if switch is None:
+            if len(self._switch_tables) >= self.MAX_SWITCH_TABLES:
+                # Drop the oldest table
+                del self._switch_tables[next(iter(self._switch_tables))]
+            switch = SwitchTable(cases, default, compile_action=self._compile_block)
+            self._switch_tables[key] = switch
+        return switch
 
     def _execute_try(self, try_action, except_action):
         try:
@@ -386,13 +619,29 @@ class EnglishInterpreter:
     def _execute_action(self, action):
         return self.process_single_instruction(action)
 
+    def _compile_condition(self, condition):
+        """Resolve a condition once into a callable that re-evaluates it against the current variables."""
+        try:
+            condition_holds = compile_condition(condition)
+        except Exception as e:
+            raise ValueError(f"Error evaluating condition: {str(e)}")
+        return lambda: condition_holds(self.variables)
+
+    def _execute_compiled_block(self, compiled_block):
+        result = {'status': 'success', 'message': "No instructions to execute"}
+        for compiled in compiled_block:
+            result = self._execute_instruction(compiled['intent'], self._get_current_context())
+            if result.get('status') == 'error' or 'break' in result or 'continue' in result:
+                break
+        return result
+
     def _get_iterable(self, iterable_name):
         if iterable_name in self.variables:
             return self.variables[iterable_name]
         else:
             raise ValueError(f"Iterable '{iterable_name}' not found")
 
-    def _handle_function_definition(self, intent_data):
+    def _handle_function_definition(self, intent_data, context=None):
         try:
             function_name = intent_data.get('function_name')
             parameters = intent_data.get('parameters', [])
@@ -404,15 +653,35 @@ class EnglishInterpreter:
             if not hasattr(self, 'functions'):
                 self.functions = {}
 
-            def dynamic_function(*args, **kwargs):
-                local_scope = self.variables.copy()
-                for param, arg in zip(parameters, args):
-                    local_scope[param] = arg
-                for key, value in kwargs.items():
-                    if key in parameters:
-                        local_scope[key] = value
-                return self._execute_function_body(body, local_scope)
+            # Recognize the body once; calls execute the compiled instructions directly
+            compiled_body = self._compile_block(body)
 
+            def dynamic_function(*args, **kwargs):
+                if self.call_depth >= self.MAX_CALL_DEPTH:
+                    raise RecursionError(f"Maximum recursion depth of {self.MAX_CALL_DEPTH} exceeded in '{function_name}'")
+                globals_ = self.variables.root if isinstance(self.variables, Scope) else self.variables
+                caller_variables = self.variables
+                self.call_depth += 1
+                tail_calls = 0
+                try:
+                    while True:
+                        local_values = dict(zip(parameters, args))
+                        local_values.update((key, value) for key, value in kwargs.items() if key in parameters)
+                        self.variables = Scope(globals_, local_values)
+                        result = self._execute_function_body(compiled_body, self.variables, function_name)
+                        # A self-recursive call in tail position reuses this frame instead of nesting
+                        if result is None or result.get('status') != 'tail_call':
+                            return result
+                        # Each reused frame still counts as a level of recursion
+                        tail_calls += 1
+                        if self.call_depth + tail_calls > self.MAX_CALL_DEPTH:
+                            raise RecursionError(f"Maximum recursion depth of {self.MAX_CALL_DEPTH} exceeded in '{function_name}'")
+                        args, kwargs = result['arguments'], result['keyword_arguments']
+                finally:
+                    self.variables = caller_variables
+                    self.call_depth -= 1
+
+            dynamic_function.compiled_body = compiled_body
             self.functions[function_name] = dynamic_function
 
             return {
@@ -426,18 +695,52 @@ class EnglishInterpreter:
                 'message': f"Error in function definition: {str(e)}"
             }
 
-    def _execute_function_body(self, body, local_scope):
+    def _compile_instruction(self, instruction, context=None):
+        """
+        Run the NLP and intent recognition pipeline for an instruction once, so the
+        result can be executed any number of times without repeating it.
+
+        Returns:
+            dict: The 'instruction' text and its recognized 'intent'.
+        """
+        if context is None:
+            context = self._get_current_context()
+        intent_data = self.input_processor.process_input(instruction)
+        recognized_intent = self.intent_recognizer.recognize_intent(intent_data, context)
+        self._apply_semantic_match(recognized_intent, instruction)
+        return {'instruction': instruction, 'intent': recognized_intent}
+
+    def _compile_block(self, body):
         instructions = [instr.strip() for instr in body.split(';') if instr.strip()]
+        return [self._compile_instruction(instruction) for instruction in instructions]
+
+    def _execute_function_body(self, compiled_body, local_scope, function_name=None):
         result = None
-        for instruction in instructions:
-            intent_data = self.input_processor.process_input(instruction)
-            recognized_intent = self.intent_recognizer.recognize_intent(intent_data)
-            result = self._execute_instruction(recognized_intent, context={'variables': local_scope})
-            if result.get('status') == 'error':
+        last = len(compiled_body) - 1
+        for position, compiled in enumerate(compiled_body):
+            intent = compiled['intent']
+            if position == last and intent.get('type') == 'function_call' and intent.get('function_name') == function_name:
+                return {
+                    'status': 'tail_call',
+                    'arguments': self._resolve_arguments(intent.get('arguments', []), local_scope),
+                    'keyword_arguments': {key: self._resolve_argument(value, local_scope)
+                                          for key, value in intent.get('keyword_arguments', {}).items()}
+                }
+            result = self._execute_instruction(intent, context={'variables': local_scope})
+            if result.get('status') in ('error', 'return'):
                 break
         return result
 
-    def _handle_function_call(self, intent_data):
+    def _resolve_arguments(self, arguments, variables):
+        return [self._resolve_argument(argument, variables) for argument in arguments]
+
+    def _resolve_argument(self, argument, variables):
+        # Arguments naming a variable are passed by value
+        if isinstance(argument, str) and argument in variables:
+            return variables[argument]
+        return argument
+
+    def _handle_function_call(self, intent_data, context=None):
         try:
             function_name = intent_data.get('function_name')
             arguments = intent_data.get('arguments', [])
@@ -446,7 +749,15 @@ class EnglishInterpreter:
             if function_name not in self.functions:
                 raise ValueError(f"Function '{function_name}' is not defined")
 
+            arguments = self._resolve_arguments(arguments, self.variables)
+            keyword_arguments = {key: self._resolve_argument(value, self.variables)
+                                 for key, value in keyword_arguments.items()}
             result = self.functions[function_name](*arguments, **keyword_arguments)
+            if isinstance(result, dict):
+                if result.get('status') == 'error':
+                    return result
+                if result.get('status') == 'return':
+                    result = result.get('data')
 
             return {
                 'status': 'success',
@@ -459,7 +770,7 @@ class EnglishInterpreter:
                 'message': f"Error in function call: {str(e)}"
             }
 
-    def _handle_return_statement(self, intent_data):
+    def _handle_return_statement(self, intent_data, context=None):
         value = intent_data.get('value')
         if value in self.variables:
             value = self.variables[value]
@@ -468,7 +779,7 @@ class EnglishInterpreter:
             'data': value
         }
 
-    def _handle_io_operation(self, intent_data):
+    def _handle_io_operation(self, intent_data, context=None):
         try:
             operation_type = intent_data.get('operation_type')
             target = intent_data.get('target')
@@ -504,7 +815,7 @@ class EnglishInterpreter:
         except Exception as e:
             return {'status': 'error', 'message': f"Error in I/O operation: {str(e)}"}
 
-    def _handle_data_structure_operation(self, intent_data):
+    def _handle_data_structure_operation(self, intent_data, context=None):
         try:
             operation_type = intent_data.get('operation_type')
             structure_name = intent_data.get('structure_name')
@@ -530,7 +841,7 @@ class EnglishInterpreter:
         except Exception as e:
             return {'status': 'error', 'message': f"Error in data structure operation: {str(e)}"}
 
-    def _handle_algorithm_execution(self, intent_data):
+    def _handle_algorithm_execution(self, intent_data, context=None):
         try:
             algorithm_name = intent_data.get('algorithm_name')
             input_data = intent_data.get('input_data')
@@ -549,27 +860,77 @@ class EnglishInterpreter:
             return {'status': 'error', 'message': f"Error in algorithm execution: {str(e)}"}
 
     def process_test_instructions(self, test_file):
-        instructions = self.read_test_instructions(test_file)
-        results = []
-        for instruction in instructions:
-            result = self.process_single_instruction(instruction)
-            results.append((instruction, result))
-        return results
+        return list(self.stream_test_instructions(test_file))
 
-    def read_test_instructions(self, file_path):
+    def stream_test_instructions(self, test_file, output_path=None):
+        """
+        Process a test file lazily, yielding each result as soon as it completes.
+
+        Instructions are read one line at a time and nothing is retained between
+        instructions, so memory use does not grow with the size of the file.
+
+        Args:
+            test_file (str): Path to the file of English instructions, one per line.
+            output_path (str, optional): A JSONL file that receives one record per
+                instruction as it completes. Records are flushed as they are written,
+                so an instruction that raises leaves the earlier records on disk.
+
+        Yields:
+            tuple: (instruction, result) for each non-blank line of the file.
+        """
+        output = open(output_path, 'w') if output_path else None
+        try:
+            for line_number, instruction in self._numbered_instructions(test_file):
+                result = self.process_single_instruction(instruction)
+                if output:
+                    output.write(json.dumps(self._result_record(line_number, instruction, result), default=str) + '\n')
+                    # Readers tailing the file see each record as soon as its instruction finishes
+                    output.flush()
+                yield instruction, result
+        finally:
+            if output:
+                output.close()
+
+    def _result_record(self, line_number, instruction, result):
+        # The context holds the whole interpreter state, so it is left out of the record
+        return {
+            'line': line_number,
+            'instruction': instruction,
+            'intent': result.get('intent'),
+            'translated_code': result.get('translated_code'),
+            'output': result.get('output')
+        }
+
+    def iter_test_instructions(self, file_path):
+        for _, instruction in self._numbered_instructions(file_path):
+            yield instruction
+
+    def _numbered_instructions(self, file_path):
         with open(file_path, 'r') as file:
-            return [line.strip() for line in file if line.strip()]
+            for line_number, line in enumerate(file, 1):
+                instruction = line.strip()
+                if instruction:
+                    yield line_number, instruction
+
+    def read_test_instructions(self, file_path):
+        return list(self.iter_test_instructions(file_path))
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="English Interpreter")
     parser.add_argument("--test", help="Path to test instructions file")
     parser.add_argument("--language", default="python", help="Target programming language")
+    parser.add_argument("--output", help="Write test results to this JSONL file as they complete")
+    parser.add_argument("--offline-embeddings", action="store_true", help="Use local hashing embeddings instead of Ollama")
+    parser.add_argument("--embedding-cache", default=DEFAULT_EMBEDDING_CACHE_DIR, help="Directory for cached instruction embeddings")
+    parser.add_argument("--perf-sample-rate", type=float, default=0.0, help="Fraction of instructions to time per pipeline stage")
     args = parser.parse_args()
 
-    interpreter = EnglishInterpreter(default_language=args.language)
+    embeddings = HashingEmbeddings() if args.offline_embeddings else None
+    interpreter = EnglishInterpreter(default_language=args.language, embeddings=embeddings,
+                                     embedding_cache_dir=args.embedding_cache,
+                                     perf_sample_rate=args.perf_sample_rate)
     if args.test:
-        results = interpreter.main_driver(test_file=args.test)
-        for instruction, result in results:
+        for instruction, result in interpreter.stream_test_instructions(args.test, output_path=args.output):
             print(f"Instruction: {instruction}")
             print(f"Translated Code: {result['translated_code']}")
             print(f"Output: {result['output']}")
@@ -3,15 +3,29 @@ import shutil
 import logging
 import subprocess
 import sys
-import psutil
-import requests
 import re
+import time
 from typing import Dict, Any
+from condition_compiler import ConditionError, compile_condition
+from metrics import REGISTRY
+from shell_pool import ShellPool
+from file_search import DEFAULT_MAX_MATCHES, search_directory, search_file
+
+INSTRUCTIONS = REGISTRY.counter('codetalk_instructions_total', 'Instructions executed, by engine and handler',
+                                ('engine', 'handler'))
+HANDLER_ERRORS = REGISTRY.counter('codetalk_handler_errors_total', 'Instructions that failed, by engine and handler',
+                                  ('engine', 'handler'))
+INSTRUCTION_SECONDS = REGISTRY.histogram('codetalk_instruction_duration_seconds',
+                                         'Time spent executing one instruction', ('engine',))
+_ENGINE = 'execution_engine'
+_INSTRUCTION_SECONDS = INSTRUCTION_SECONDS.labels(_ENGINE)
 
 class ExecutionEngine:
     def __init__(self):
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
+        # Persistent shells for system commands; workers start on first use
+        self.shell_pool = ShellPool(timeout=10)
 
     def execute(self, intent_data):
         intent = intent_data.get('primary_intent')
@@ -27,6 +41,7 @@ class ExecutionEngine:
             'execute_system_command': self._execute_system_command,
             'install_package': self._install_package,
             'search_file': self._search_file,
+            'search_directory': self._search_directory,
             'move_file': self._move_file,
             'copy_file': self._copy_file,
             'manage_process': self._manage_process,
@@ -43,11 +58,24 @@ class ExecutionEngine:
             'java_operation': self._process_java_instruction
         }
 
-        if intent in intent_map:
-            return intent_map[intent](entities)
-        else:
+        if intent not in intent_map:
+            HANDLER_ERRORS.labels(_ENGINE, 'unknown').inc()
             return f"I'm sorry, I don't know how to perform the action: {intent}. Please check your instruction and try again."
 
+        INSTRUCTIONS.labels(_ENGINE, intent).inc()
+        start = time.perf_counter()
+        try:
+            result = intent_map[intent](entities)
+        except Exception:
+            HANDLER_ERRORS.labels(_ENGINE, intent).inc()
+            raise
+        finally:
+            _INSTRUCTION_SECONDS.observe(time.perf_counter() - start)
+        # Handlers report failures as an apology rather than raising
+        if isinstance(result, str) and result.startswith("I'm sorry"):
+            HANDLER_ERRORS.labels(_ENGINE, intent).inc()
+        return result
+
     def _create_file(self, entities):
         filename = entities.get('filename')
         if not filename:
@@ -149,7 +177,7 @@ class ExecutionEngine:
             return "I'm sorry, I need a command to execute."
 
         try:
-            result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=10)
+            result = self.shell_pool.run(command)
             if result.returncode == 0:
                 return f"Command executed successfully. Output:\n{result.stdout}"
             else:
@@ -183,18 +211,60 @@ class ExecutionEngine:
             return "I'm sorry, I need both a filename and a search term to search within a file."
 
         try:
-            with open(filename, 'r') as file:
-                content = file.read()
-                if search_term in content:
-                    return f"The search term '{search_term}' was found in the file '{filename}'."
-                else:
-                    return f"The search term '{search_term}' was not found in the file '{filename}'."
+            result = search_file(filename, search_term, regex=bool(entities.get('regex')),
+                                 ignore_case=bool(entities.get('ignore_case')),
+                                 first_match=bool(entities.get('first_match')),
+                                 max_matches=entities.get('max_matches') or DEFAULT_MAX_MATCHES)
+            if not result['count']:
+                return f"The search term '{search_term}' was not found in the file '{filename}'."
+            count = f"{result['count']}{'+' if result['truncated'] else ''}"
+            locations = ', '.join(f"line {match['line']} (byte {match['offset']})" for match in result['matches'][:10])
+            if len(result['matches']) > 10:
+                locations += f" and {len(result['matches']) - 10} more"
+            return (f"The search term '{search_term}' was found in the file '{filename}': "
+                    f"{count} match{'es' if count != '1' else ''} at {locations}.")
         except FileNotFoundError:
             return f"I'm sorry, I couldn't find the file '{filename}'."
         except Exception as e:
             self.logger.error(f"Error searching file '{filename}': {str(e)}")
             return f"I'm sorry, I couldn't search the file '{filename}'. There was an error: {str(e)}"
 
+    def _search_directory(self, entities):
+        directory = entities.get('directory') or '.'
+        search_term = entities.get('search_term')
+        if not search_term:
+            return "I'm sorry, I need a search term to search a directory."
+
+        def globs(value):
+            # Entities may give globs as a list or as a comma-separated string
+            if isinstance(value, str):
+                return [glob.strip() for glob in value.split(',') if glob.strip()]
+            return value or None
+
+        try:
+            if not os.path.isdir(directory):
+                return f"I'm sorry, I couldn't find the directory '{directory}'."
+            max_results = int(entities.get('max_results') or 100)
+            lines = []
+            files = 0
+            truncated = False
+            for result in search_directory(directory, search_term, regex=bool(entities.get('regex')),
+                                           ignore_case=bool(entities.get('ignore_case')),
+                                           include=globs(entities.get('include')),
+                                           exclude=globs(entities.get('exclude')), max_results=max_results):
+                files += 1
+                self.logger.info(f"Found {result['count']} matches for '{search_term}' in '{result['path']}'")
+                lines.extend(f"{result['path']}:{match['line']}: {match['text']}" for match in result['matches'])
+                truncated = truncated or result['truncated']
+            if not lines:
+                return f"The search term '{search_term}' was not found in the directory '{directory}'."
+            cap = f" (stopped at {max_results})" if truncated or len(lines) >= max_results else ''
+            return (f"The search term '{search_term}' was found {len(lines)} time{'s' if len(lines) != 1 else ''} in {files} "
+                    f"file{'s' if files != 1 else ''} under '{directory}'{cap}:\n" + '\n'.join(lines))
+        except Exception as e:
+            self.logger.error(f"Error searching directory '{directory}': {str(e)}")
+            return f"I'm sorry, I couldn't search the directory '{directory}'. There was an error: {str(e)}"
+
     def _move_file(self, entities):
         source = entities.get('source')
         destination = entities.get('destination')
@@ -236,11 +306,13 @@ class ExecutionEngine:
                 subprocess.Popen(process_name)
                 return f"Started process '{process_name}'."
             elif action == 'stop':
+                import psutil
                 for proc in psutil.process_iter(['name']):
                     if proc.info['name'] == process_name:
                         proc.terminate()
                 return f"Stopped process '{process_name}'."
             elif action == 'list':
+                import psutil
                 processes = [p.info['name'] for p in psutil.process_iter(['name'])]
                 return f"Running processes:\n{', '.join(processes)}"
             else:
@@ -256,6 +328,7 @@ class ExecutionEngine:
             return "I'm sorry, I need both an operation and a URL to perform a network operation."
 
         try:
+            import requests
             if operation == 'get':
                 response = requests.get(url)
                 return f"GET request to {url} returned status code {response.status_code}"
@@ -368,11 +441,19 @@ class ExecutionEngine:
         action = parts[1].strip()
         return eval(iterable), action
 
+    def evaluate_condition(self, condition, variables):
+        """
+        Evaluate an English or infix condition against the given variables.
+
+        Raises:
+            ConditionError: If the condition cannot be compiled or evaluated.
+        """
+        return compile_condition(condition)(variables)
+
     def _evaluate_condition(self, condition):
-        # This is a simplified evaluation. In a real system, you'd need more robust parsing and safe evaluation
         try:
-            return eval(condition)
-        except:
+            return self.evaluate_condition(condition, {})
+        except ConditionError:
             return False
 
     def _execute_action(self, action, item=None):
@@ -0,0 +1,228 @@
+"""
+This module defines search_file, which finds a literal term or regular expression in
+a file without reading the file into memory. The file is memory-mapped and scanned
+with bytes.find or a compiled bytes pattern, and line numbers are computed by
+counting newlines in fixed-size chunks between matches, so memory use depends on the
+number of matches kept, not on the file size.
+
+search_directory runs search_file over a directory tree on a thread or process pool
+and yields each file's matches as soon as that file is done.
+"""
+
+import fnmatch
+import mmap
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+CHUNK_SIZE = 1 << 20
+# Matches kept by default, so a term on every line of a huge file cannot exhaust memory
+DEFAULT_MAX_MATCHES = 1000
+# Longest line text kept per match
+MAX_LINE_TEXT = 200
+# Bytes read from the start of a file to decide whether it is binary
+BINARY_SNIFF_SIZE = 8192
+
+
+def _compile(term: str, regex: bool, ignore_case: bool) -> Optional['re.Pattern']:
+    if not term:
+        raise ValueError("The search term must not be empty")
+    if not regex and not ignore_case:
+        return None
+    pattern = term if regex else re.escape(term)
+    return re.compile(pattern.encode('utf-8'), re.MULTILINE | (re.IGNORECASE if ignore_case else 0))
+
+
+def _find(data, term: str, pattern: Optional['re.Pattern']) -> Iterator[Tuple[int, int]]:
+    """Yield (start, end) byte offsets of non-overlapping matches."""
+    if pattern is not None:
+        for match in pattern.finditer(data):
+            yield match.start(), match.end()
+        return
+    needle = term.encode('utf-8')
+    position = data.find(needle)
+    while position != -1:
+        yield position, position + len(needle)
+        position = data.find(needle, position + len(needle))
+
+
+def count_newlines(data, start: int, end: int, chunk_size: int = CHUNK_SIZE) -> int:
+    """Count b'\\n' in data[start:end] without copying more than chunk_size bytes at a time."""
+    count = 0
+    for offset in range(start, end, chunk_size):
+        count += data[offset:min(offset + chunk_size, end)].count(b'\n')
+    return count
+
+
+def _line_text(data, start: int) -> bytes:
+    """The line containing offset start, or at most MAX_LINE_TEXT bytes of it around start."""
+    # Look for the line's ends only near the match, so a huge line costs no more than a short one
+    window_start = max(0, start - MAX_LINE_TEXT)
+    line_start = data.rfind(b'\n', window_start, start) + 1 or window_start
+    line_end = data.find(b'\n', start, line_start + MAX_LINE_TEXT)
+    if line_end == -1 and line_start + MAX_LINE_TEXT < len(data):
+        # The line is longer than the window: show the text from just before the match
+        line_start = max(line_start, start - MAX_LINE_TEXT // 2)
+        line_end = data.find(b'\n', start, line_start + MAX_LINE_TEXT)
+    return data[line_start:line_end if line_end != -1 else min(len(data), line_start + MAX_LINE_TEXT)]
+
+
+def search_file(path: str, term: str, regex: bool = False, ignore_case: bool = False, first_match: bool = False,
+                max_matches: Optional[int] = None, chunk_size: int = CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Search a file for term.
+
+    Args:
+        path (str): The file to search.
+        term (str): A literal string, or a regular expression when regex is True.
+            Patterns are matched against the UTF-8 bytes of the file in MULTILINE mode.
+        first_match (bool): Stop at the first match.
+        max_matches (int): Stop after this many matches.
+
+    Returns:
+        dict: 'path', 'count' (matches found), 'truncated' (whether the search stopped
+        at the limit before the end of the file) and 'matches', a list of dicts with the 1-based 'line', the byte
+        'offset' and the matching line's 'text'.
+
+    Raises:
+        ValueError: If term is empty.
+        re.error: If term is not a valid regular expression.
+        OSError: If the file cannot be read.
+    """
+    pattern = _compile(term, regex, ignore_case)
+    limit = 1 if first_match else max_matches
+    result = {'path': path, 'count': 0, 'truncated': False, 'matches': []}
+    with open(path, 'rb') as file:
+        # An empty file cannot be mapped
+        if file.seek(0, 2) == 0:
+            return result
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                # Read ahead, and let the kernel drop pages already scanned
+                data.madvise(mmap.MADV_SEQUENTIAL)
+            line, counted_to = 1, 0
+            for start, _ in _find(data, term, pattern):
+                line += count_newlines(data, counted_to, start, chunk_size)
+                counted_to = start
+                text = _line_text(data, start)
+                result['matches'].append({'line': line, 'offset': start,
+                                          'text': text.decode('utf-8', errors='replace').rstrip('\r')})
+                result['count'] += 1
+                if result['count'] == limit:
+                    # Stop without looking for more, so there may or may not be any
+                    result['truncated'] = True
+                    break
+    return result
+
+
+def is_binary(path: str) -> bool:
+    """Treat a file as binary when its first few kilobytes contain a NUL byte, as grep does."""
+    with open(path, 'rb') as file:
+        return b'\0' in file.read(BINARY_SNIFF_SIZE)
+
+
+def _matches_any(relative_path: str, name: str, globs: Sequence[str]) -> bool:
+    return any(fnmatch.fnmatch(name, glob) or fnmatch.fnmatch(relative_path, glob) for glob in globs)
+
+
+def iter_files(root: str, include: Optional[Sequence[str]] = None,
+               exclude: Optional[Sequence[str]] = None) -> Iterator[str]:
+    """
+    Walk root with os.scandir and yield the paths of regular files.
+
+    Globs are matched against a file's name and against its path relative to root.
+    A file is yielded when it matches an include glob (or no include globs are
+    given) and no exclude glob; a directory matching an exclude glob is not entered.
+    Symbolic links to directories are not followed.
+    """
+    exclude = exclude or ()
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+        except OSError:
+            continue
+        subdirectories = []
+        for entry in entries:
+            relative_path = os.path.relpath(entry.path, root).replace(os.sep, '/')
+            if _matches_any(relative_path, entry.name, exclude):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(entry.path)
+                elif entry.is_file() and (not include or _matches_any(relative_path, entry.name, include)):
+                    yield entry.path
+            except OSError:
+                continue
+        # Depth first, in name order
+        pending.extend(reversed(subdirectories))
+
+
+def _search_text_file(path: str, term: str, regex: bool, ignore_case: bool,
+                      max_matches: Optional[int]) -> Optional[Dict[str, Any]]:
+    """search_file for a pool worker: None for binary or unreadable files."""
+    try:
+        if is_binary(path):
+            return None
+        return search_file(path, term, regex=regex, ignore_case=ignore_case, max_matches=max_matches)
+    except (OSError, ValueError):
+        return None
+
+
+def search_directory(root: str, term: str, regex: bool = False, ignore_case: bool = False,
+                     include: Optional[Sequence[str]] = None, exclude: Optional[Sequence[str]] = None,
+                     max_results: Optional[int] = None, max_matches_per_file: Optional[int] = DEFAULT_MAX_MATCHES,
+                     workers: Optional[int] = None, use_processes: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Search every text file under root and yield search_file results for the files
+    that match, in the order the files finish.
+
+    Files are searched on a thread pool; use_processes=True uses a process pool
+    instead, which pays off for regular expressions expensive enough to be CPU bound.
+    Binary files are skipped. Only a few files per worker are queued at a time, so
+    walking a huge tree does not build a huge backlog.
+
+    Args:
+        include (list): Globs a file must match, e.g. ['*.py', 'logs/*.log'].
+        exclude (list): Globs for files and directories to skip, e.g. ['.git', '*.min.js'].
+        max_results (int): Stop after this many matches across all files. If the
+            last file yielded had more, it is cut short and marked truncated.
+        max_matches_per_file (int): The most matches kept for one file.
+
+    Raises:
+        ValueError: If term is empty.
+        re.error: If term is not a valid regular expression.
+    """
+    _compile(term, regex, ignore_case)
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    executor = executor_class(max_workers=workers)
+    files = iter_files(root, include, exclude)
+    running = set()
+    found = 0
+    try:
+        while True:
+            for path in files:
+                running.add(executor.submit(_search_text_file, path, term, regex, ignore_case, max_matches_per_file))
+                if len(running) >= workers * 4:
+                    break
+            if not running:
+                return
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if not result or not result['count']:
+                    continue
+                if max_results is not None and found + result['count'] >= max_results:
+                    if found + result['count'] > max_results:
+                        result['matches'] = result['matches'][:max_results - found]
+                        result['count'] = len(result['matches'])
+                        result['truncated'] = True
+                    yield result
+                    return
+                found += result['count']
+                yield result
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -1,29 +1,54 @@
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-from nltk import pos_tag, ne_chunk
-from nltk.tree import Tree
-from nltk.parse.corenlp import CoreNLPDependencyParser
+from functools import cached_property
+from corenlp_client import CORENLP_URL, aget_annotations
 
 class InputProcessor:
     """
     A class for processing input text using advanced Natural Language Processing techniques.
     """
 
-    def __init__(self):
+    # Matches the request CoreNLPDependencyParser.raw_parse sends
+    dependency_properties = {
+        'annotators': 'tokenize,pos,lemma,ssplit,depparse',
+        'outputFormat': 'json',
+        'tokenize.whitespace': 'false'
+    }
+
+    def __init__(self, corenlp_url=CORENLP_URL):
         """
-        Initialize the InputProcessor with necessary NLP components.
+        Initialize the InputProcessor. NLTK and its data are loaded on first use.
+
+        Args:
+            corenlp_url (str): The CoreNLP server used for dependency parsing.
         """
+        self.corenlp_url = corenlp_url
+
+    @cached_property
+    def _nltk(self):
+        import nltk
         nltk.download('punkt', quiet=True)
         nltk.download('stopwords', quiet=True)
         nltk.download('wordnet', quiet=True)
         nltk.download('averaged_perceptron_tagger', quiet=True)
         nltk.download('maxent_ne_chunker', quiet=True)
         nltk.download('words', quiet=True)
-        self.stop_words = set(stopwords.words('english'))
-        self.lemmatizer = WordNetLemmatizer()
-        self.dep_parser = CoreNLPDependencyParser(url='http://localhost:9000')
+        return nltk
+
+    @cached_property
+    def stop_words(self):
+        self._nltk
+        from nltk.corpus import stopwords
+        return set(stopwords.words('english'))
+
+    @cached_property
+    def lemmatizer(self):
+        self._nltk
+        from nltk.stem import WordNetLemmatizer
+        return WordNetLemmatizer()
+
+    @cached_property
+    def dep_parser(self):
+        from nltk.parse.corenlp import CoreNLPDependencyParser
+        return CoreNLPDependencyParser(url=self.corenlp_url)
 
     def process_input(self, english_instruction):
         """
@@ -33,16 +58,46 @@ class InputProcessor:
             english_instruction (str): The input text to be processed.
 
         Returns:
-            dict: A dictionary containing 'intent' and 'context' keys.
+            dict: A dictionary containing 'intent', 'context' and 'raw_text' keys.
+        """
+        analysis = self._analyze_tokens(english_instruction)
+
+        # Perform dependency parsing
+        parse, = self.dep_parser.raw_parse(english_instruction)
+        return self._build_result(english_instruction, analysis, list(parse.triples()))
+
+    async def aprocess_input(self, english_instruction, session=None):
         """
+        Asynchronous variant of process_input.
+
+        The CoreNLP dependency parse is requested without blocking the event loop, so
+        several instructions can wait on the server at the same time.
+
+        Args:
+            english_instruction (str): The input text to be processed.
+            session (aiohttp.ClientSession, optional): An HTTP session to reuse.
+
+        Returns:
+            dict: The same dictionary process_input returns.
+        """
+        analysis = self._analyze_tokens(english_instruction)
+        annotations = await aget_annotations(english_instruction, self.dependency_properties,
+                                             self.corenlp_url, session=session)
+        parse = self.dep_parser.make_tree(annotations['sentences'][0])
+        return self._build_result(english_instruction, analysis, list(parse.triples()))
+
+    def _analyze_tokens(self, english_instruction):
+        nltk = self._nltk
+        from nltk.tree import Tree
+
         # Tokenize the input text
-        tokens = word_tokenize(english_instruction)
+        tokens = nltk.word_tokenize(english_instruction)
 
         # Perform POS tagging
-        pos_tags = pos_tag(tokens)
+        pos_tags = nltk.pos_tag(tokens)
 
         # Perform named entity recognition
-        named_entities = ne_chunk(pos_tags)
+        named_entities = nltk.ne_chunk(pos_tags)
 
         # Extract named entities
         entities = []
@@ -53,21 +108,21 @@ class InputProcessor:
         # Lemmatize the tokens
         lemmas = [self.lemmatizer.lemmatize(token.lower()) for token, _ in pos_tags]
 
-        # Perform dependency parsing
-        parse, = self.dep_parser.raw_parse(english_instruction)
-        dependencies = list(parse.triples())
-
-        # Extract intent and context (this is a simplified example)
-        intent = lemmas[0] if lemmas else ""
-        context = {
+        return {
             'tokens': tokens,
             'lemmas': lemmas,
             'pos_tags': pos_tags,
-            'named_entities': entities,
-            'dependencies': dependencies
+            'named_entities': entities
         }
 
+    def _build_result(self, english_instruction, analysis, dependencies):
+        # Extract intent and context (this is a simplified example)
+        lemmas = analysis['lemmas']
+        intent = lemmas[0] if lemmas else ""
+        context = dict(analysis, dependencies=dependencies)
+
         return {
             'intent': intent,
-            'context': context
-        }
\ No newline at end of file
+            'context': context,
+            'raw_text': english_instruction
+        }
@@ -0,0 +1,214 @@
+"""
+This module defines an InstructionScheduler that runs a batch of parsed English
+instructions on a thread pool, executing independent instructions concurrently while
+preserving the results of sequential execution.
+"""
+
+import ast
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+# Every instruction reads this resource and barriers write it, so a barrier is
+# ordered after everything before it and before everything after it.
+_ALL = '*'
+
+_READ_ONLY_ACTIONS = {
+    'variable_management': {'get'},
+    'list_operation': {'get from'},
+    'dictionary_operation': {'get'},
+    'stack_operation': {'peek'},
+    'queue_operation': {'peek'},
+}
+
+_ACTION_KEYS = {
+    'list_operation': ('list_operation', 'list_name'),
+    'dictionary_operation': ('dict_operation', 'dict_name'),
+    'stack_operation': ('stack_operation', 'stack_name'),
+    'queue_operation': ('queue_operation', 'queue_name'),
+}
+
+
+class InstructionEffects:
+    """The resources an instruction reads and writes, e.g. 'var:x', 'func:add' or 'file:out.txt'."""
+
+    __slots__ = ('reads', 'writes')
+
+    def __init__(self, reads: Optional[Set[str]] = None, writes: Optional[Set[str]] = None):
+        self.reads = reads if reads is not None else set()
+        self.writes = writes if writes is not None else set()
+
+    @classmethod
+    def barrier(cls) -> 'InstructionEffects':
+        return cls(writes={_ALL})
+
+    def update(self, other: 'InstructionEffects'):
+        self.reads |= other.reads
+        self.writes |= other.writes
+
+
+def analyze_effects(parsed_instruction: Optional[Dict[str, Any]]) -> InstructionEffects:
+    """
+    Work out which variables, functions, files and external resources a parsed
+    instruction touches. Operations whose effects cannot be determined are barriers.
+    """
+    if parsed_instruction is None:
+        return InstructionEffects()
+
+    operation = parsed_instruction.get('operation')
+    effects = InstructionEffects()
+
+    if operation == 'variable_management':
+        name = f"var:{parsed_instruction['name']}"
+        if parsed_instruction['action'] in _READ_ONLY_ACTIONS[operation]:
+            effects.reads.add(name)
+        else:
+            effects.writes.add(name)
+            value = parsed_instruction.get('value')
+            if isinstance(value, str):
+                effects.reads |= {f"var:{n}" for n in _expression_names(value)}
+    elif operation == 'arithmetic':
+        effects.reads |= {f"var:{parsed_instruction['operand1']}", f"var:{parsed_instruction['operand2']}"}
+        effects.writes.add(f"var:{parsed_instruction['result_var']}")
+    elif operation == 'control_structure':
+        effects.reads.add(f"var:{parsed_instruction['condition_var']}")
+        effects.update(analyze_effects(parsed_instruction['true_action']))
+        effects.update(analyze_effects(parsed_instruction.get('false_action')))
+    elif operation == 'loop':
+        effects.writes.add(f"var:{parsed_instruction['loop_var']}")
+        effects.update(analyze_effects(parsed_instruction['action']))
+    elif operation == 'function_definition':
+        effects.writes.add(f"func:{parsed_instruction['name']}")
+    elif operation in ('function_call', 'function_call_with_assignment'):
+        effects.reads.add(f"func:{parsed_instruction.get('function_name', parsed_instruction.get('name'))}")
+        if 'result_var' in parsed_instruction:
+            effects.writes.add(f"var:{parsed_instruction['result_var']}")
+    elif operation in _ACTION_KEYS:
+        action_key, name_key = _ACTION_KEYS[operation]
+        name = f"var:{parsed_instruction[name_key]}"
+        if parsed_instruction[action_key] in _READ_ONLY_ACTIONS[operation]:
+            effects.reads.add(name)
+        else:
+            effects.writes.add(name)
+    elif operation == 'file_operation':
+        # Open file objects are stored in the variables under their file name
+        filename = parsed_instruction['filename']
+        effects.writes |= {f"var:{filename}", f"file:{filename}"}
+        effects.reads.add('filesystem')
+    elif operation == 'network_operation':
+        effects.writes.add('network')
+    elif operation in ('system_operation', 'parallel_system_operation', 'process_management'):
+        effects.writes |= {'system', 'filesystem'}
+    else:
+        return InstructionEffects.barrier()
+
+    return effects
+
+
+def _expression_names(expression: str) -> Set[str]:
+    try:
+        tree = ast.parse(expression, mode='eval')
+    except SyntaxError:
+        return set()
+    return {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+
+
+def build_dependency_graph(effects: List[InstructionEffects]) -> List[FrozenSet[int]]:
+    """
+    Return, for each instruction, the indices of earlier instructions it must wait for:
+    the last writer of everything it reads or writes, and every reader since that
+    write of anything it writes.
+    """
+    last_writer: Dict[str, int] = {}
+    readers_since_write: Dict[str, List[int]] = {}
+    dependencies = []
+    for index, effect in enumerate(effects):
+        reads = effect.reads | {_ALL}
+        deps = set()
+        for resource in reads | effect.writes:
+            if resource in last_writer:
+                deps.add(last_writer[resource])
+        for resource in effect.writes:
+            deps.update(readers_since_write.get(resource, ()))
+        for resource in reads - effect.writes:
+            readers_since_write.setdefault(resource, []).append(index)
+        for resource in effect.writes:
+            last_writer[resource] = index
+            readers_since_write[resource] = []
+        deps.discard(index)
+        dependencies.append(frozenset(deps))
+    return dependencies
+
+
+class InstructionScheduler:
+    """
+    Execute English instructions on an EnglishExecutionEngine, running instructions
+    that touch disjoint variables, tables and files at the same time.
+
+    All instructions are parsed up front and a read/write dependency graph is built
+    over the resources they touch; an instruction starts only once every earlier
+    instruction it conflicts with has finished, so the final state and each
+    instruction's result are the same as with sequential execution.
+    """
+
+    def __init__(self, engine: Any, max_workers: Optional[int] = None):
+        self.engine = engine
+        self.max_workers = max_workers
+
+    def parse(self, instructions: List[str],
+              line_numbers: Optional[List[int]] = None) -> List[Tuple[Optional[Dict[str, Any]], Optional[Exception]]]:
+        profiler = getattr(self.engine, 'profiler', None)
+        if line_numbers is None:
+            line_numbers = list(range(1, len(instructions) + 1))
+        parsed = []
+        for instruction, line_number in zip(instructions, line_numbers):
+            try:
+                parsed_instruction = self.engine.parse_instruction(instruction)
+                if profiler is not None:
+                    profiler.label_line(parsed_instruction, line_number, instruction)
+                parsed.append((parsed_instruction, None))
+            except Exception as e:
+                parsed.append((None, e))
+        return parsed
+
+    def run(self, instructions: List[str], line_numbers: Optional[List[int]] = None) -> List[Tuple[str, Any]]:
+        """
+        Execute the instructions and return (instruction, result) tuples in input order.
+        An instruction that fails to parse or raises has the exception as its result.
+        line_numbers name the instructions' lines for an engine profiler.
+        """
+        parsed = self.parse(instructions, line_numbers)
+        dependencies = build_dependency_graph([analyze_effects(p) for p, _ in parsed])
+        results: List[Any] = [error for _, error in parsed]
+
+        remaining = [len(deps) for deps in dependencies]
+        dependents: List[List[int]] = [[] for _ in dependencies]
+        for i, deps in enumerate(dependencies):
+            for dep in deps:
+                dependents[dep].append(i)
+        ready = [i for i, count in enumerate(remaining) if count == 0]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+            while ready or running:
+                for i in ready:
+                    running[executor.submit(self._execute, parsed[i][0])] = i
+                ready = []
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = running.pop(future)
+                    if parsed[i][1] is None:
+                        results[i] = future.result()
+                    for dependent in dependents[i]:
+                        remaining[dependent] -= 1
+                        if remaining[dependent] == 0:
+                            ready.append(dependent)
+
+        return list(zip(instructions, results))
+
+    def _execute(self, parsed_instruction: Optional[Dict[str, Any]]) -> Any:
+        if parsed_instruction is None:
+            return None
+        try:
+            return self.engine.execute_instruction(parsed_instruction)
+        except Exception as e:
+            return e
@@ -1,42 +1,64 @@
-import nltk
 import re
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords, wordnet
-from nltk.stem import WordNetLemmatizer
-from nltk.sentiment import SentimentIntensityAnalyzer
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import requests
-import json
-from langchain import LLMChain, PromptTemplate
-from langchain.llms import Gemma  # or LLaMA
+import time
+from functools import cached_property
+from micro_batcher import MicroBatcher
+from corenlp_client import aget_annotations, get_annotations
+from metrics import REGISTRY
+
+LLM_CALLS = REGISTRY.counter('codetalk_llm_calls_total', 'LLM prompts sent for intent recognition, by prompt kind',
+                             ('kind',))
+LLM_ERRORS = REGISTRY.counter('codetalk_llm_errors_total', 'LLM prompts that raised, by prompt kind', ('kind',))
+LLM_SECONDS = REGISTRY.histogram('codetalk_llm_call_duration_seconds', 'LLM prompt latency, by prompt kind',
+                                 ('kind',), buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0))
+
+_LEADING_KEYWORD = re.compile(r'\\b(\w+)(?![\w?*+{])')
+
+
+def _patterns_may_collide(patterns):
+    """
+    Whether two of the patterns could match at the same position.
+
+    Only patterns of the form \\bKEYWORD... with no top-level alternation are
+    understood; two such patterns cannot collide unless one keyword is a prefix of
+    the other. Anything else is assumed to collide.
+    """
+    keywords = []
+    for pattern, _ in patterns:
+        leading = _LEADING_KEYWORD.match(pattern)
+        if leading is None or '|' in pattern:
+            return True
+        keywords.append(leading.group(1))
+    return any(first.startswith(second) for i, first in enumerate(keywords)
+               for j, second in enumerate(keywords) if i != j)
+
 
 class IntentRecognizer:
     """
     A class for recognizing intents from processed input using semantic analysis and NLP techniques.
     """
 
+    corenlp_properties = {
+        'annotators': 'tokenize,ssplit,pos,lemma,ner,parse',
+        'outputFormat': 'json'
+    }
+
     def _get_corenlp_annotations(self, text):
-        url = "http://localhost:9000"
-        properties = {
-            'annotators': 'tokenize,ssplit,pos,lemma,ner,parse',
-            'outputFormat': 'json'
-        }
-        data = text.encode('utf-8')
-        response = requests.post(url, params={'properties': json.dumps(properties)}, data=data)
-        return json.loads(response.text)
+        return get_annotations(text, self.corenlp_properties)
 
-    def __init__(self):
+    async def _aget_corenlp_annotations(self, text, session=None):
+        return await aget_annotations(text, self.corenlp_properties, session=session)
+
+    def __init__(self, llm=None, max_batch_size=8, max_batch_wait_ms=10):
         """
         Initialize the IntentRecognizer with necessary NLP components for semantic analysis.
+
+        Args:
+            llm: The language model used for intent recognition. Defaults to Gemma; any
+                LangChain LLM (including a local fake) can be supplied instead.
+            max_batch_size (int): The most instructions sent in one batched prompt.
+            max_batch_wait_ms (float): How long a batch waits for more instructions.
         """
-        nltk.download('punkt', quiet=True)
-        nltk.download('stopwords', quiet=True)
-        nltk.download('wordnet', quiet=True)
-        nltk.download('vader_lexicon', quiet=True)
-        self.stop_words = set(stopwords.words('english'))
-        self.lemmatizer = WordNetLemmatizer()
-        self.sia = SentimentIntensityAnalyzer()
+        self._llm = llm
         self.language_specific_patterns = {
             'c': [
                 (r'\bprintf\s*\(', 'print_statement'),
@@ -71,8 +93,88 @@ class IntentRecognizer:
                 (r'\bextends\s+\w+', 'class_inheritance')
             ]
         }
-        self.llm = Gemma()  # or LLaMA()
-        self.intent_chain = LLMChain(llm=self.llm, prompt=self._create_intent_prompt())
+        self._compile_language_patterns()
+        self.intent_batcher = MicroBatcher(self._recognize_text_batch, max_batch_size=max_batch_size,
+                                           max_wait_ms=max_batch_wait_ms)
+
+    # NLTK data, the LLM and the LangChain chains are loaded on first use, so importing
+    # and constructing the recognizer stays cheap for sessions that never need them.
+
+    @cached_property
+    def _nltk(self):
+        import nltk
+        nltk.download('punkt', quiet=True)
+        nltk.download('stopwords', quiet=True)
+        nltk.download('wordnet', quiet=True)
+        nltk.download('vader_lexicon', quiet=True)
+        return nltk
+
+    @cached_property
+    def stop_words(self):
+        self._nltk
+        from nltk.corpus import stopwords
+        return set(stopwords.words('english'))
+
+    @cached_property
+    def lemmatizer(self):
+        self._nltk
+        from nltk.stem import WordNetLemmatizer
+        return WordNetLemmatizer()
+
+    @cached_property
+    def sia(self):
+        self._nltk
+        from nltk.sentiment import SentimentIntensityAnalyzer
+        return SentimentIntensityAnalyzer()
+
+    @cached_property
+    def llm(self):
+        if self._llm is not None:
+            return self._llm
+        from langchain.llms import Gemma  # or LLaMA
+        return Gemma()  # or LLaMA()
+
+    @cached_property
+    def intent_chain(self):
+        from langchain import LLMChain
+        return LLMChain(llm=self.llm, prompt=self._create_intent_prompt())
+
+    @cached_property
+    def batch_intent_chain(self):
+        from langchain import LLMChain
+        return LLMChain(llm=self.llm, prompt=self._create_batch_intent_prompt())
+
+    def _tokenize(self, text):
+        return self._nltk.word_tokenize(text)
+
+    def _create_intent_prompt(self):
+        from langchain import PromptTemplate
+        return PromptTemplate(
+            input_variables=['instruction'],
+            template=(
+                "Classify the following English programming instruction.\n"
+                "Answer in exactly this format:\n"
+                "Intent: <primary intent>\n"
+                "Entities: <comma-separated relevant entities>\n"
+                "Confidence: <number between 0 and 1>\n\n"
+                "Instruction: {instruction}\n"
+            )
+        )
+
+    def _create_batch_intent_prompt(self):
+        from langchain import PromptTemplate
+        return PromptTemplate(
+            input_variables=['instructions'],
+            template=(
+                "Classify each of the following numbered English programming instructions.\n"
+                "For every instruction, answer with its number in brackets on its own line, "
+                "followed by exactly this format:\n"
+                "Intent: <primary intent>\n"
+                "Entities: <comma-separated relevant entities>\n"
+                "Confidence: <number between 0 and 1>\n\n"
+                "Instructions:\n{instructions}\n"
+            )
+        )
 
     def recognize_intent(self, intent_data, context, language='generic'):
         """
@@ -89,16 +191,106 @@ class IntentRecognizer:
         text = intent_data['raw_text']
 
         # Use LangChain model for intent recognition
-        result = self.intent_chain.run(instruction=text)
+        result = self._run_chain(self.intent_chain, 'single', instruction=text)
+        return self._build_intent(result.strip().split('\n'), text, language)
 
+    async def arecognize_intent(self, intent_data, context, language='generic'):
+        """
+        Asynchronous variant of recognize_intent that awaits the LLM instead of blocking.
+
+        Returns:
+            dict: The same dictionary recognize_intent returns.
+        """
+        text = intent_data['raw_text']
+        result = await self._arun_chain(self.intent_chain, 'single', instruction=text)
+        return self._build_intent(result.strip().split('\n'), text, language)
+
+    def _run_chain(self, chain, kind, **inputs):
+        LLM_CALLS.labels(kind).inc()
+        start = time.perf_counter()
+        try:
+            return chain.run(**inputs)
+        except Exception:
+            LLM_ERRORS.labels(kind).inc()
+            raise
+        finally:
+            LLM_SECONDS.labels(kind).observe(time.perf_counter() - start)
+
+    async def _arun_chain(self, chain, kind, **inputs):
+        LLM_CALLS.labels(kind).inc()
+        start = time.perf_counter()
+        try:
+            return await chain.arun(**inputs)
+        except Exception:
+            LLM_ERRORS.labels(kind).inc()
+            raise
+        finally:
+            LLM_SECONDS.labels(kind).observe(time.perf_counter() - start)
+
+    def submit_intent(self, intent_data, context=None, language='generic'):
+        """
+        Queue an instruction for batched intent recognition.
+
+        Instructions submitted close together are sent to the LLM in a single prompt.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the same dictionary recognize_intent returns.
+        """
+        return self.intent_batcher.submit((intent_data['raw_text'], language))
+
+    def recognize_intents(self, intent_data_list, context=None, language='generic'):
+        """
+        Recognize the intents of several instructions using batched LLM prompts.
+
+        Returns:
+            list: One recognized intent dictionary per entry of intent_data_list, in order.
+        """
+        futures = [self.submit_intent(intent_data, context, language) for intent_data in intent_data_list]
+        return [future.result() for future in futures]
+
+    def _recognize_text_batch(self, items):
+        if len(items) == 1:
+            text, language = items[0]
+            result = self._run_chain(self.intent_chain, 'single', instruction=text)
+            return [self._build_intent(result.strip().split('\n'), text, language)]
+
+        numbered = '\n'.join(f"[{i}] {text}" for i, (text, _) in enumerate(items, 1))
+        result = self._run_chain(self.batch_intent_chain, 'batch', instructions=numbered)
+        blocks = self._split_batch_result(result)
+
+        intents = []
+        for i, (text, language) in enumerate(items, 1):
+            try:
+                intents.append(self._build_intent(blocks[i], text, language))
+            except (KeyError, IndexError, ValueError):
+                # The model skipped or garbled this item; recognize it on its own
+                try:
+                    single = self._run_chain(self.intent_chain, 'single', instruction=text)
+                    intents.append(self._build_intent(single.strip().split('\n'), text, language))
+                except Exception as e:
+                    intents.append(e)
+        return intents
+
+    def _split_batch_result(self, result):
+        blocks = {}
+        current = None
+        for line in result.strip().split('\n'):
+            header = re.match(r'^\s*\[(\d+)\]\s*(.*)$', line)
+            if header:
+                current = int(header.group(1))
+                blocks[current] = [header.group(2)] if header.group(2).strip() else []
+            elif current is not None and line.strip():
+                blocks[current].append(line.strip())
+        return blocks
+
+    def _build_intent(self, lines, text, language):
         # Parse the result and extract information
-        lines = result.strip().split('\n')
         primary_intent = lines[0].split(':')[1].strip()
         relevant_entities = self._parse_entities(lines[1])
         confidence_score = float(lines[2].split(':')[1].strip())
 
         # Use existing methods for language-specific matching
-        matched_intent = self._match_intent(word_tokenize(text), language)
+        matched_intent = self._match_intent(self._tokenize(text), language)
 
         return {
             'primary_intent': primary_intent,
@@ -108,13 +300,11 @@ class IntentRecognizer:
             'relevant_entities': relevant_entities
         }
 
-    def _match_intent(self, tokens, language):
-        instruction = ' '.join(tokens)
-        if language in self.language_specific_patterns:
-            for pattern, intent in self.language_specific_patterns[language]:
-                if re.search(pattern, instruction):
-                    return intent
-        return 'generic'
+    def _parse_entities(self, line):
+        entities = line.split(':', 1)[1].strip() if ':' in line else line.strip()
+        if entities.lower() in ('', 'none', 'n/a'):
+            return []
+        return [entity.strip() for entity in entities.split(',') if entity.strip()]
 
     def _analyze_semantic_intent(self, annotations):
         """
@@ -124,7 +314,7 @@ class IntentRecognizer:
         text = ' '.join(token['word'] for token in tokens)
 
         # Use LangChain model for complex instructions
-        result = self.intent_chain.run(instruction=text)
+        result = self._run_chain(self.intent_chain, 'single', instruction=text)
         lines = result.strip().split('\n')
         langchain_intent = lines[0].split(':')[1].strip()
 
@@ -217,8 +407,9 @@ class IntentRecognizer:
         sentiment_scores = self.sia.polarity_scores(text)
         sentiment_intensity = sentiment_scores['compound']
 
-        matched_intent = self._match_intent([token['word'] for token in tokens], language)
-        language_score = self._calculate_language_specific_confidence(tokens, language)
+        words = [token['word'] for token in tokens]
+        matched_intent = self._match_intent(words, language)
+        language_score = self._calculate_language_specific_confidence(words, language)
         intent_match_score = 1.0 if matched_intent != 'generic' else 0.5
 
         confidence = (dep_score * 0.4) + (abs(sentiment_intensity) * 0.2) + (language_score * 0.2) + (intent_match_score * 0.2)
@@ -254,27 +445,80 @@ class IntentRecognizer:
 
         return relevant_entities
 
-    def _match_intent(self, tokens, language):
-        instruction = ' '.join(tokens)
-        if language in self.language_specific_patterns:
-            for pattern, intent in self.language_specific_patterns[language]:
-                if re.search(pattern, instruction):
-                    return intent
+    def _compile_language_patterns(self):
+        """
+        Compile each language's patterns into one alternation with a named group per pattern.
+
+        Every alternative is wrapped in a lookahead, so a single finditer pass reports
+        each position where a pattern matches, and match.lastgroup names the first
+        pattern in list order that matches there. Groups are named p0, p1, ... after
+        the pattern's index rather than its intent, so an intent may appear under
+        several patterns.
+
+        If two patterns of a language could match at the same position, the later
+        one would be hidden by the earlier, so for such languages the later patterns
+        are also tried at each reported position. Patterns that start with distinct
+        keywords, like all the built-in ones, cannot collide and need only the scan.
+        """
+        self.compiled_language_patterns = {}
+        for language, patterns in self.language_specific_patterns.items():
+            alternation = re.compile('|'.join(f'(?=(?P<p{index}>{pattern}))'
+                                              for index, (pattern, _) in enumerate(patterns)))
+            compiled = [re.compile(pattern) for pattern, _ in patterns] if _patterns_may_collide(patterns) else None
+            self.compiled_language_patterns[language] = (alternation, compiled)
+
+    def _scan_language_patterns(self, text, language):
+        """
+        Scan text once against every pattern of the given language.
+
+        Returns:
+            dict: The index of each pattern that matches text, mapped to the text of
+            its leftmost match.
+        """
+        entry = self.compiled_language_patterns.get(language)
+        matches = {}
+        if entry is None:
+            return matches
+        alternation, compiled = entry
+        for match in alternation.finditer(text):
+            index = int(match.lastgroup[1:])
+            matches.setdefault(index, match.group(match.lastgroup))
+            if compiled is not None:
+                for later in range(index + 1, len(compiled)):
+                    if later not in matches:
+                        found = compiled[later].match(text, match.start())
+                        if found:
+                            matches[later] = found.group(0)
+        return matches
+
+    def _instruction_matches(self, tokens, language):
+        return self._scan_language_patterns(' '.join(tokens), language)
+
+    def _token_matches(self, tokens, language):
+        # No pattern can match a NUL, so joining on it finds exactly the patterns matching within a single token
+        return set(self._scan_language_patterns('\0'.join(tokens), language))
+
+    def _intent_from_matches(self, matches, language):
+        for index, (_, intent) in enumerate(self.language_specific_patterns.get(language, [])):
+            if index in matches:
+                return intent
         return 'generic'
 
+    def _language_score(self, token_matches, language):
+        patterns = self.language_specific_patterns.get(language)
+        if patterns:
+            return min(len(token_matches) / len(patterns), 1.0)
+        return 0.0
+
+    def _match_intent(self, tokens, language):
+        return self._intent_from_matches(self._instruction_matches(tokens, language), language)
+
     def _extract_intent_data(self, tokens, matched_intent, language):
-        instruction = ' '.join(tokens)
-        if language in self.language_specific_patterns:
-            for pattern, intent in self.language_specific_patterns[language]:
-                if intent == matched_intent:
-                    match = re.search(pattern, instruction)
-                    if match:
-                        return match.group(0)
+        matches = self._instruction_matches(tokens, language)
+        for index, (_, intent) in enumerate(self.language_specific_patterns.get(language, [])):
+            if intent == matched_intent and index in matches:
+                return matches[index]
         return None
 
     def _calculate_language_specific_confidence(self, tokens, language):
-        if language in self.language_specific_patterns:
-            patterns = self.language_specific_patterns[language]
-            matches = sum(1 for pattern, _ in patterns if any(re.search(pattern, token) for token in tokens))
-            return min(matches / len(patterns), 1.0)
-        return 0.0
\ No newline at end of file
+        return self._language_score(self._token_matches(tokens, language), language)
@@ -0,0 +1,94 @@
+"""
+This module is a thin client for the English interpreter server. It only depends on
+the standard library, so starting it costs nothing beyond the Python interpreter.
+"""
+
+import argparse
+import json
+import socket
+import urllib.request
+from typing import Any, Dict, Optional
+
+from interpreter_server import DEFAULT_SOCKET_PATH
+
+
+class InterpreterClient:
+    """Send instructions to a running interpreter server over a Unix socket or HTTP."""
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, url: Optional[str] = None, timeout: float = 300,
+                 session: Optional[str] = None):
+        self.socket_path = socket_path
+        self.url = url
+        self.timeout = timeout
+        self.session = session
+        self._socket = None
+        self._reader = None
+
+    def send(self, instruction: str) -> Dict[str, Any]:
+        return self.request({'instruction': instruction})
+
+    def request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if self.session is not None:
+            payload = dict(payload, session=self.session)
+        data = json.dumps(payload).encode('utf-8')
+        if self.url:
+            http_request = urllib.request.Request(self.url, data=data, headers={'Content-Type': 'application/json'})
+            with urllib.request.urlopen(http_request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+
+        if self._socket is None:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.settimeout(self.timeout)
+            self._socket.connect(self.socket_path)
+            self._reader = self._socket.makefile('rb')
+        self._socket.sendall(data + b'\n')
+        line = self._reader.readline()
+        if not line:
+            self.close()
+            raise ConnectionError("Interpreter server closed the connection")
+        return json.loads(line)
+
+    def close(self):
+        if self._socket is not None:
+            self._reader.close()
+            self._socket.close()
+            self._socket = None
+            self._reader = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _print_response(response: Dict[str, Any]):
+    if response.get('status') == 'success':
+        if response.get('translated_code') is not None:
+            print(f"Translated Code: {response['translated_code']}")
+        print(f"Output: {response.get('output', response.get('message'))}")
+    else:
+        print(f"Error: {response.get('message')}")
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="English Interpreter client")
+    parser.add_argument("instruction", nargs="?", help="Instruction to run; omit for an interactive prompt")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="Unix socket of the interpreter server")
+    parser.add_argument("--url", help="HTTP URL of the interpreter server, e.g. http://127.0.0.1:8765")
+    parser.add_argument("--session", help="Session id whose variables and functions to use")
+    args = parser.parse_args(argv)
+
+    with InterpreterClient(socket_path=args.socket, url=args.url, session=args.session) as client:
+        if args.instruction:
+            _print_response(client.send(args.instruction))
+            return
+        while True:
+            user_input = input("Enter an instruction in English (or 'exit' to quit): ")
+            if user_input.lower() == 'exit':
+                break
+            _print_response(client.send(user_input))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""
+This module runs the English interpreter as a long-lived server. A pool of warm
+EnglishInterpreter instances is created once at startup, so instructions sent over a
+Unix socket or local HTTP do not pay for NLTK downloads or model and client setup.
+"""
+
+import argparse
+import json
+import os
+import queue
+import socket
+import socketserver
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional
+
+from metrics import REGISTRY, start_http_server, write_to_textfile
+from session_manager import SessionManager, SessionMemoryError
+
+
+def default_socket_path() -> str:
+    """The per-user socket path: in $XDG_RUNTIME_DIR, or in a private directory under the temp directory."""
+    runtime_directory = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_directory:
+        return os.path.join(runtime_directory, 'codetalk-interpreter.sock')
+    user = os.getuid() if hasattr(os, 'getuid') else os.environ.get('USERNAME', 'user')
+    return os.path.join(tempfile.gettempdir(), f'codetalk-{user}', 'interpreter.sock')
+
+
+DEFAULT_SOCKET_PATH = default_socket_path()
+DEFAULT_HTTP_PORT = 8765
+
+
+def default_interpreter_factory(**options) -> Callable[[], Any]:
+    def factory():
+        from english_interpreter import EnglishInterpreter
+        interpreter = EnglishInterpreter(**options)
+        interpreter.warm_up()
+        return interpreter
+    return factory
+
+
+class InterpreterPool:
+    """A fixed set of warm interpreters, each used by one request at a time."""
+
+    def __init__(self, factory: Callable[[], Any], size: int = 1):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.size = size
+        self._idle: queue.Queue = queue.Queue()
+        for _ in range(size):
+            self._idle.put(factory())
+
+    @contextmanager
+    def acquire(self):
+        interpreter = self._idle.get()
+        try:
+            yield interpreter
+        finally:
+            self._idle.put(interpreter)
+
+
+def _private_directory(directory: str):
+    """Create directory for the current user alone, or check that an existing one is."""
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if not hasattr(os, 'getuid'):
+        return
+    status = os.lstat(directory)
+    if not stat.S_ISDIR(status.st_mode) or status.st_uid != os.getuid() or status.st_mode & 0o077:
+        raise PermissionError(f"{directory} must be a directory owned by the current user with mode 0700")
+
+
+def _remove_stale_socket(socket_path: str):
+    """Remove a socket left behind by a server that is no longer running; leave anything else alone."""
+    try:
+        status = os.lstat(socket_path)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(status.st_mode):
+        raise FileExistsError(f"{socket_path} exists and is not a socket; not removing it")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        pass
+    else:
+        raise OSError(f"Another server is listening on {socket_path}")
+    finally:
+        probe.close()
+    os.remove(socket_path)
+
+
+class InterpreterServer:
+    """
+    Serve English instructions from an InterpreterPool.
+
+    Requests and responses are JSON objects. A request carries an 'instruction'
+    (or a 'command' such as 'ping', 'stats', 'metrics' or 'close_session') and optionally a
+    'session' id; requests without one share the default session. The response
+    has a 'status' of 'success' or 'error' plus the interpreter's output.
+
+    Each session's variables and functions live in a lightweight InterpreterSession,
+    so thousands of sessions can share the pool's few heavy interpreters.
+    """
+
+    DEFAULT_SESSION = 'default'
+
+    def __init__(self, pool: InterpreterPool, sessions: Optional[SessionManager] = None):
+        self.pool = pool
+        self.sessions = sessions if sessions is not None else SessionManager()
+        self._servers = []
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        command = request.get('command')
+        if command == 'ping':
+            return {'status': 'success', 'message': 'pong'}
+        if command == 'stats':
+            return dict(self.sessions.metrics(), status='success', pool_size=self.pool.size)
+        if command == 'metrics':
+            return {'status': 'success', 'metrics': REGISTRY.render()}
+        if command == 'close_session':
+            closed = self.sessions.close(self._session_id(request))
+            return {'status': 'success' if closed else 'error',
+                    'message': 'Session closed' if closed else 'Unknown session'}
+
+        instruction = request.get('instruction')
+        if not instruction:
+            return {'status': 'error', 'message': "Request must include an 'instruction'"}
+        session = self.sessions.get(self._session_id(request))
+        try:
+            with session.lock:
+                with self.pool.acquire() as interpreter, interpreter.use_session(session):
+                    result = interpreter.process_single_instruction(instruction)
+                self.sessions.record_usage(session)
+            return {
+                'status': 'success',
+                'session': session.session_id,
+                'output': result.get('output'),
+                'translated_code': result.get('translated_code'),
+                'intent': result.get('intent')
+            }
+        except SessionMemoryError as e:
+            return {'status': 'error', 'session': session.session_id, 'message': f"Session closed: {str(e)}"}
+        except Exception as e:
+            return {'status': 'error', 'session': session.session_id,
+                    'message': f"Error processing instruction: {str(e)}"}
+
+    def _session_id(self, request: Dict[str, Any]) -> str:
+        # "session": null means no session, like a request without the key
+        session_id = request.get('session')
+        return self.DEFAULT_SESSION if session_id is None else session_id
+
+    def handle_raw_request(self, raw: bytes) -> bytes:
+        try:
+            request = json.loads(raw)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+            response = self.handle_request(request)
+        except ValueError as e:
+            response = {'status': 'error', 'message': f"Invalid request: {str(e)}"}
+        return json.dumps(response, default=str).encode('utf-8')
+
+    def create_unix_server(self, socket_path: str = DEFAULT_SOCKET_PATH) -> socketserver.BaseServer:
+        """
+        Create a threaded Unix socket server speaking newline-delimited JSON.
+
+        The socket is readable and writable by the current user only. A missing
+        directory for it is created with mode 0700, as is the default per-user one.
+
+        Raises:
+            FileExistsError: If socket_path exists and is not a socket.
+            OSError: If another server is listening on socket_path.
+            PermissionError: If the default socket directory is not private to the current user.
+        """
+        directory = os.path.dirname(os.path.abspath(socket_path))
+        if socket_path == DEFAULT_SOCKET_PATH or not os.path.isdir(directory):
+            _private_directory(directory)
+        _remove_stale_socket(socket_path)
+        server = socketserver.ThreadingUnixStreamServer(socket_path, self._unix_handler(), bind_and_activate=False)
+        # The umask is process-wide, so it is narrowed only around the bind
+        umask = os.umask(0o177)
+        try:
+            server.server_bind()
+        except BaseException:
+            server.server_close()
+            raise
+        finally:
+            os.umask(umask)
+        os.chmod(socket_path, 0o600)
+        server.server_activate()
+        server.daemon_threads = True
+        self._servers.append(server)
+        return server
+
+    def create_http_server(self, host: str = '127.0.0.1', port: int = DEFAULT_HTTP_PORT) -> ThreadingHTTPServer:
+        """Create a threaded HTTP server accepting JSON requests via POST."""
+        server = ThreadingHTTPServer((host, port), self._http_handler())
+        server.daemon_threads = True
+        self._servers.append(server)
+        return server
+
+    def serve_in_background(self, server: socketserver.BaseServer) -> threading.Thread:
+        thread = threading.Thread(target=server.serve_forever, name='interpreter-server', daemon=True)
+        thread.start()
+        return thread
+
+    def shutdown(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+            if isinstance(server.server_address, str) and os.path.exists(server.server_address):
+                os.remove(server.server_address)
+        self._servers = []
+
+    def _unix_handler(self):
+        interpreter_server = self
+
+        class UnixHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    self.wfile.write(interpreter_server.handle_raw_request(line) + b'\n')
+                    self.wfile.flush()
+
+        return UnixHandler
+
+    def _http_handler(self):
+        interpreter_server = self
+
+        class HTTPHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = interpreter_server.handle_raw_request(self.rfile.read(length))
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return HTTPHandler
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="English Interpreter server")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="Unix socket path to listen on")
+    parser.add_argument("--http", type=int, metavar="PORT", help="Listen on local HTTP instead of a Unix socket")
+    parser.add_argument("--pool-size", type=int, default=1, help="Number of warm interpreters")
+    parser.add_argument("--language", default="python", help="Target programming language")
+    parser.add_argument("--session-idle-timeout", type=float, default=3600, help="Seconds before an idle session is evicted")
+    parser.add_argument("--max-sessions", type=int, default=10000, help="Maximum number of live sessions")
+    parser.add_argument("--max-session-mb", type=float, default=64, help="Memory cap per session, in megabytes")
+    parser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on this local HTTP port")
+    parser.add_argument("--metrics-file", help="Write Prometheus metrics to this file on shutdown")
+    args = parser.parse_args(argv)
+
+    print(f"Loading {args.pool_size} interpreter(s)...")
+    pool = InterpreterPool(default_interpreter_factory(default_language=args.language), size=args.pool_size)
+    sessions = SessionManager(idle_timeout=args.session_idle_timeout, max_sessions=args.max_sessions,
+                              max_session_bytes=int(args.max_session_mb * 1024 * 1024))
+    server = InterpreterServer(pool, sessions)
+    if args.metrics_port:
+        start_http_server(args.metrics_port)
+        print(f"Serving metrics on http://127.0.0.1:{args.metrics_port}/metrics")
+    if args.http:
+        listener = server.create_http_server(port=args.http)
+        print(f"Serving on http://127.0.0.1:{args.http}")
+    else:
+        listener = server.create_unix_server(args.socket)
+        print(f"Serving on {args.socket}")
+    try:
+        listener.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.server_close()
+        if not args.http and os.path.exists(args.socket):
+            os.remove(args.socket)
+        if args.metrics_file:
+            write_to_textfile(args.metrics_file)
+
+
+if __name__ == "__main__":
+    main()
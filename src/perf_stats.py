@@ -0,0 +1,188 @@
+"""
+This module defines latency instrumentation for the interpreter pipeline. Sampled
+instructions record how long each stage took into HDR-style log-linear histograms,
+per stage and per intent type. When sampling is off, begin() hands out a shared
+no-op span, so the pipeline pays only a few empty method calls.
+"""
+
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# execution_wait is the time an instruction recognized concurrently (async or batched) waits for its turn to execute
+PIPELINE_STAGES = ('input_processing', 'intent_recognition', 'execution_wait', 'semantic_match', 'translation',
+                   'execution', 'output_generation')
+
+
+class LatencyHistogram:
+    """
+    A log-linear histogram of durations in nanoseconds.
+
+    Values below 2**sub_bucket_bits are counted exactly; above that each power of two
+    is split into 2**(sub_bucket_bits - 1) buckets, bounding the relative error of
+    any reported percentile to about 2**-(sub_bucket_bits - 1).
+    """
+
+    __slots__ = ('sub_bucket_bits', 'counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self, sub_bucket_bits: int = 6):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def _index(self, value: int) -> int:
+        magnitude = max(value.bit_length() - self.sub_bucket_bits, 0)
+        return (magnitude << (self.sub_bucket_bits - 1)) + (value >> magnitude)
+
+    def _bucket_bounds(self, index: int):
+        half = 1 << (self.sub_bucket_bits - 1)
+        if index < 2 * half:
+            return index, index
+        magnitude = index // half - 1
+        mantissa = index - (magnitude << (self.sub_bucket_bits - 1))
+        return mantissa << magnitude, ((mantissa + 1) << magnitude) - 1
+
+    def record(self, value: int):
+        value = max(int(value), 0)
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, percent: float) -> int:
+        """Return the value at the given percentile (0-100), or 0 if nothing was recorded."""
+        if not self.count:
+            return 0
+        rank = max(1, int(round(percent / 100.0 * self.count)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                low, high = self._bucket_bounds(index)
+                return min(max((low + high) // 2, self.min), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        """Durations in microseconds."""
+        to_us = 1 / 1000.0
+        return {
+            'count': self.count,
+            'mean_us': (self.total / self.count) * to_us if self.count else 0.0,
+            'p50_us': self.percentile(50) * to_us,
+            'p90_us': self.percentile(90) * to_us,
+            'p99_us': self.percentile(99) * to_us,
+            'max_us': (self.max or 0) * to_us
+        }
+
+
+class _NullSpan:
+    """The span handed out for unsampled instructions; every method does nothing."""
+
+    __slots__ = ()
+
+    def mark(self, stage: str):
+        pass
+
+    def finish(self, intent_type: Optional[str] = None):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Times consecutive pipeline stages of one instruction."""
+
+    __slots__ = ('stats', 'start', 'last', 'durations')
+
+    def __init__(self, stats: 'PerformanceStats'):
+        self.stats = stats
+        self.start = self.last = time.perf_counter_ns()
+        self.durations: List = []
+
+    def mark(self, stage: str):
+        """Close the stage that has been running since the previous mark."""
+        now = time.perf_counter_ns()
+        self.durations.append((stage, now - self.last))
+        self.last = now
+
+    def finish(self, intent_type: Optional[str] = None):
+        self.stats.record(self.durations, self.last - self.start, intent_type)
+
+
+class PerformanceStats:
+    """
+    Per-stage and per-intent latency histograms for sampled instructions.
+
+    Args:
+        sample_rate (float): The fraction of instructions to time; 0 turns timing off.
+    """
+
+    def __init__(self, sample_rate: float = 0.0):
+        self.sample_rate = sample_rate
+        self.stages: Dict[str, LatencyHistogram] = {}
+        self.intents: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self._lock = threading.Lock()
+
+    def begin(self):
+        """Start timing an instruction, or return NULL_SPAN if it is not sampled."""
+        if self.sample_rate <= 0.0:
+            return NULL_SPAN
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return NULL_SPAN
+        return Span(self)
+
+    def record(self, durations, total: int, intent_type: Optional[str] = None):
+        intent_type = intent_type or 'unknown'
+        with self._lock:
+            per_intent = self.intents.setdefault(intent_type, {})
+            for stage, duration in durations:
+                self.stages.setdefault(stage, LatencyHistogram()).record(duration)
+                per_intent.setdefault(stage, LatencyHistogram()).record(duration)
+            self.stages.setdefault('total', LatencyHistogram()).record(total)
+            per_intent.setdefault('total', LatencyHistogram()).record(total)
+
+    def reset(self):
+        with self._lock:
+            self.stages = {}
+            self.intents = {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return summaries of every histogram, in microseconds."""
+        with self._lock:
+            return {
+                'sample_rate': self.sample_rate,
+                'stages': {stage: histogram.summary() for stage, histogram in self.stages.items()},
+                'intents': {intent: {stage: histogram.summary() for stage, histogram in stages.items()}
+                            for intent, stages in self.intents.items()}
+            }
+
+    def report(self) -> str:
+        """Format the per-stage and per-intent summaries as a text table."""
+        snapshot = self.snapshot()
+        if not snapshot['stages']:
+            if self.sample_rate <= 0.0:
+                return "Performance sampling is off; enable it to collect stage timings."
+            return "No instructions have been timed yet."
+        lines = [f"{'stage':<20}{'count':>8}{'mean':>12}{'p50':>12}{'p90':>12}{'p99':>12}{'max':>12}  (microseconds)"]
+        order = [stage for stage in PIPELINE_STAGES + ('total',) if stage in snapshot['stages']]
+        for stage in order:
+            lines.append(self._format_row(stage, snapshot['stages'][stage]))
+        lines.append('')
+        lines.append(f"{'intent':<20}{'count':>8}{'mean':>12}{'p50':>12}{'p90':>12}{'p99':>12}{'max':>12}")
+        for intent, stages in sorted(snapshot['intents'].items()):
+            lines.append(self._format_row(intent, stages['total']))
+        return '\n'.join(lines)
+
+    @staticmethod
+    def _format_row(name: str, summary: Dict[str, Any]) -> str:
+        return (f"{name:<20}{summary['count']:>8}{summary['mean_us']:>12.1f}{summary['p50_us']:>12.1f}"
+                f"{summary['p90_us']:>12.1f}{summary['p99_us']:>12.1f}{summary['max_us']:>12.1f}")
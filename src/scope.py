@@ -0,0 +1,63 @@
+"""
+This module defines the Scope used for English function calls. A scope holds only
+the names bound by one call (its parameters and local assignments) and looks every
+other name up in its parent, so entering a function costs O(parameters) rather
+than a copy of every global variable.
+"""
+
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+
+class Scope(MutableMapping):
+    """
+    A mapping of local names backed by a parent mapping.
+
+    Reads fall through to the parent chain; writes and deletes only touch this
+    scope's locals, so a function cannot clobber the caller's variables.
+    """
+
+    __slots__ = ('locals', 'parent')
+
+    def __init__(self, parent: Optional[Mapping[str, Any]] = None, local_values: Optional[Dict[str, Any]] = None):
+        self.locals: Dict[str, Any] = local_values if local_values is not None else {}
+        self.parent = parent if parent is not None else {}
+
+    @property
+    def root(self) -> Mapping[str, Any]:
+        """The outermost mapping in the chain, i.e. the global variables."""
+        scope = self
+        while isinstance(scope, Scope):
+            scope = scope.parent
+        return scope
+
+    def __getitem__(self, name: str) -> Any:
+        if name in self.locals:
+            return self.locals[name]
+        return self.parent[name]
+
+    def __setitem__(self, name: str, value: Any):
+        self.locals[name] = value
+
+    def __delitem__(self, name: str):
+        del self.locals[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.locals or name in self.parent
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.locals
+        for name in self.parent:
+            if name not in self.locals:
+                yield name
+
+    def __len__(self) -> int:
+        return len(self.locals) + sum(1 for name in self.parent if name not in self.locals)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        if name in self.locals:
+            return self.locals[name]
+        return self.parent.get(name, default)
+
+    def __repr__(self) -> str:
+        return f"Scope({self.locals!r}, parent={type(self.parent).__name__})"
@@ -0,0 +1,187 @@
+"""
+This module defines a sampling profiler for English instruction scripts. The engine
+keeps a stack of English frames per thread: the script line being executed and the
+nested actions (loop bodies, branches) running inside it. A background thread
+samples those stacks and charges the wall and CPU time since the previous sample to
+the stack it sees, so the profile is in terms of English lines rather than Python
+functions. Profiles are written as collapsed stacks, the input format of
+flamegraph.pl, speedscope and similar tools.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+WALL = 'wall'
+CPU = 'cpu'
+
+_HAS_THREAD_CPU_CLOCKS = hasattr(time, 'pthread_getcpuclockid') and hasattr(time, 'clock_gettime')
+
+
+def frame_label(text: str) -> str:
+    """Make text usable as one frame of a collapsed stack."""
+    return ' '.join(text.replace(';', ',').split())
+
+
+class ScriptProfiler:
+    """
+    Attribute wall and CPU time to English instruction lines and nested actions.
+
+    The engine calls enter() and exit() around every instruction it executes; with
+    no profiler attached that costs one attribute check. CPU time is read from each
+    thread's CPU clock where the platform provides one (Linux); elsewhere only wall
+    time is recorded.
+
+    Args:
+        interval (float): Seconds between samples.
+    """
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.wall: Dict[str, float] = {}
+        self.cpu: Dict[str, float] = {}
+        self.samples = 0
+        self._stacks: Dict[int, List[str]] = {}
+        self._labels: Dict[int, Tuple[Dict[str, Any], str]] = {}
+        self._cpu_clocks: Dict[int, Optional[int]] = {}
+        self._cpu_last: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # Labels
+
+    def label(self, parsed_instruction: Dict[str, Any], text: str):
+        """Remember the English text a parsed instruction came from."""
+        # The parsed dict is kept alive so its id cannot be reused while profiling
+        self._labels[id(parsed_instruction)] = (parsed_instruction, frame_label(text))
+
+    def label_line(self, parsed_instruction: Dict[str, Any], line_number: int, text: str):
+        """Mark a parsed instruction as line line_number of the script."""
+        self.label(parsed_instruction, f"L{line_number}: {text}")
+
+    def label_for(self, parsed_instruction: Dict[str, Any]) -> str:
+        entry = self._labels.get(id(parsed_instruction))
+        if entry is not None and entry[0] is parsed_instruction:
+            return entry[1]
+        return parsed_instruction.get('operation', 'instruction')
+
+    # Frames
+
+    def enter(self, parsed_instruction: Dict[str, Any]):
+        ident = threading.get_ident()
+        stack = self._stacks.get(ident)
+        if stack is None:
+            with self._lock:
+                stack = self._stacks.setdefault(ident, [])
+        stack.append(self.label_for(parsed_instruction))
+
+    def exit(self):
+        self._stacks[threading.get_ident()].pop()
+
+    # Sampling
+
+    def start(self) -> 'ScriptProfiler':
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample_loop, name='script-profiler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> 'ScriptProfiler':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _thread_cpu_time(self, ident: int) -> Optional[float]:
+        if not _HAS_THREAD_CPU_CLOCKS:
+            return None
+        if ident not in self._cpu_clocks:
+            try:
+                self._cpu_clocks[ident] = time.pthread_getcpuclockid(ident)
+            except (OSError, ValueError):
+                self._cpu_clocks[ident] = None
+        clock = self._cpu_clocks[ident]
+        if clock is None:
+            return None
+        try:
+            return time.clock_gettime(clock)
+        except OSError:
+            # The thread has exited
+            self._cpu_clocks[ident] = None
+            return None
+
+    def _sample_loop(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            self.sample(now - last)
+            last = now
+
+    def sample(self, elapsed: float):
+        """Charge elapsed wall seconds, and each thread's CPU time since the last sample, to its current stack."""
+        with self._lock:
+            stacks = list(self._stacks.items())
+        for ident, stack in stacks:
+            frames = tuple(stack)
+            cpu_now = self._thread_cpu_time(ident)
+            cpu_delta = None
+            if cpu_now is not None:
+                cpu_last = self._cpu_last.get(ident)
+                self._cpu_last[ident] = cpu_now
+                cpu_delta = cpu_now - cpu_last if cpu_last is not None else None
+            if not frames:
+                continue
+            key = ';'.join(frames)
+            self.wall[key] = self.wall.get(key, 0.0) + elapsed
+            if cpu_delta is not None:
+                self.cpu[key] = self.cpu.get(key, 0.0) + cpu_delta
+        self.samples += 1
+
+    # Output
+
+    def collapsed(self, metric: str = WALL) -> List[str]:
+        """Collapsed-stack lines with times in microseconds, heaviest first."""
+        totals = self.wall if metric == WALL else self.cpu
+        lines = [(key, int(round(seconds * 1e6))) for key, seconds in totals.items()]
+        return [f"{key} {value}" for key, value in sorted(lines, key=lambda line: -line[1]) if value > 0]
+
+    def write_collapsed(self, path: str, metric: str = WALL):
+        with open(path, 'w') as file:
+            for line in self.collapsed(metric):
+                file.write(line + '\n')
+
+    def line_totals(self) -> List[Dict[str, Any]]:
+        """
+        Total and self time per frame.
+
+        Returns:
+            list: Dicts with 'frame', 'wall', 'self_wall', 'cpu' and 'self_cpu' in
+            seconds, sorted by total wall time.
+        """
+        frames: Dict[str, Dict[str, Any]] = {}
+        for metric, totals in ((WALL, self.wall), (CPU, self.cpu)):
+            for key, seconds in totals.items():
+                stack = key.split(';')
+                for depth, frame in enumerate(stack):
+                    entry = frames.setdefault(frame, {'frame': frame, 'wall': 0.0, 'self_wall': 0.0,
+                                                      'cpu': 0.0, 'self_cpu': 0.0})
+                    # A frame that recurses counts once toward its total
+                    if frame not in stack[:depth]:
+                        entry[metric] += seconds
+                    if depth == len(stack) - 1:
+                        entry[f"self_{metric}"] += seconds
+        return sorted(frames.values(), key=lambda entry: -entry['wall'])
+
+    def report(self, limit: int = 20) -> str:
+        lines = [f"{'wall ms':>10}{'self ms':>10}{'cpu ms':>10}  frame"]
+        for entry in self.line_totals()[:limit]:
+            lines.append(f"{entry['wall'] * 1000:>10.1f}{entry['self_wall'] * 1000:>10.1f}"
+                         f"{entry['cpu'] * 1000:>10.1f}  {entry['frame']}")
+        return '\n'.join(lines)
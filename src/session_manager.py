@@ -0,0 +1,205 @@
+"""
+This module defines lightweight interpreter sessions. A session holds only the
+per-user state (variables, functions, data structures); the expensive NLP resources,
+compiled grammar and LLM clients stay in shared interpreters, which run a session's
+instructions by temporarily binding its state.
+"""
+
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+class SessionMemoryError(MemoryError):
+    """Raised when a session's state grows past the per-session memory cap."""
+
+
+class InterpreterSession:
+    """The mutable state of one user's interpreter session."""
+
+    __slots__ = ('session_id', 'state', 'lock', 'created_at', 'last_used', 'memory_bytes', 'unmeasured_instructions')
+
+    def __init__(self, session_id: str, now: float):
+        self.session_id = session_id
+        self.state: Dict[str, Any] = {}
+        self.lock = threading.Lock()
+        self.created_at = now
+        self.last_used = now
+        self.memory_bytes = 0
+        self.unmeasured_instructions = 0
+
+
+@contextmanager
+def bind_session(owner: Any, session: InterpreterSession, attributes: Iterable[str],
+                 factories: Optional[Dict[str, Callable[[], Any]]] = None):
+    """
+    Swap a session's state into the given attributes of owner for the duration of
+    the block, then store any rebound values back into the session.
+
+    A session's value for an attribute is created on first use, by the matching
+    entry of factories or as an empty dict.
+    """
+    attributes = tuple(attributes)
+    factories = factories or {}
+    saved = {name: getattr(owner, name) for name in attributes}
+    for name in attributes:
+        if name not in session.state:
+            session.state[name] = factories[name]() if name in factories else {}
+        setattr(owner, name, session.state[name])
+    try:
+        yield session
+    finally:
+        for name in attributes:
+            session.state[name] = getattr(owner, name)
+            setattr(owner, name, saved[name])
+
+
+def estimate_size(obj: Any, max_depth: int = 32) -> int:
+    """Approximate the memory held by obj and the containers reachable from it."""
+    seen = set()
+    total = 0
+    stack = [(obj, 0)]
+    while stack:
+        current, depth = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if depth >= max_depth:
+            continue
+        if isinstance(current, dict):
+            for key, value in current.items():
+                stack.append((key, depth + 1))
+                stack.append((value, depth + 1))
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend((item, depth + 1) for item in current)
+    return total
+
+
+class SessionManager:
+    """
+    Create, look up and evict InterpreterSessions.
+
+    Sessions idle for longer than idle_timeout seconds are evicted, as are the least
+    recently used sessions once max_sessions or max_total_bytes is exceeded. A session
+    whose state exceeds max_session_bytes is closed.
+
+    Measuring a session walks its whole state, so it is done after every
+    measure_every-th instruction, and after every instruction once the session has
+    passed half of max_session_bytes.
+    """
+
+    def __init__(self, idle_timeout: float = 3600, max_sessions: int = 10000,
+                 max_session_bytes: Optional[int] = 64 * 1024 * 1024, max_total_bytes: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic, measure_every: int = 8):
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.max_session_bytes = max_session_bytes
+        self.max_total_bytes = max_total_bytes
+        self.clock = clock
+        self.measure_every = measure_every
+        self._sessions: 'OrderedDict[str, InterpreterSession]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        self._last_sweep = clock()
+        self.evictions = {'idle': 0, 'capacity': 0, 'memory': 0}
+
+    @property
+    def session_count(self) -> int:
+        return len(self._sessions)
+
+    def get(self, session_id: Optional[str] = None) -> InterpreterSession:
+        """Return the session with the given id, creating it (or a fresh id) if needed."""
+        now = self.clock()
+        with self._lock:
+            if now - self._last_sweep >= min(self.idle_timeout, 60):
+                self._evict_idle(now)
+            if session_id is None:
+                session_id = uuid.uuid4().hex
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = InterpreterSession(session_id, now)
+                self._sessions[session_id] = session
+                while len(self._sessions) > self.max_sessions:
+                    self._evict_oldest('capacity', keep=session_id)
+            else:
+                self._sessions.move_to_end(session_id)
+            session.last_used = now
+            return session
+
+    def close(self, session_id: str) -> bool:
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                self._total_bytes -= session.memory_bytes
+            return session is not None
+
+    def record_usage(self, session: InterpreterSession):
+        """
+        Count an instruction the session ran, re-measure the session when it is due and
+        enforce the memory caps.
+
+        Raises:
+            SessionMemoryError: If the session exceeds max_session_bytes; it is closed.
+        """
+        if self.max_session_bytes is None and self.max_total_bytes is None:
+            return
+        session.unmeasured_instructions += 1
+        near_cap = self.max_session_bytes is not None and session.memory_bytes * 2 > self.max_session_bytes
+        if session.memory_bytes and not near_cap and session.unmeasured_instructions < self.measure_every:
+            return
+        session.unmeasured_instructions = 0
+        size = estimate_size(session.state)
+        with self._lock:
+            if self._sessions.get(session.session_id) is not session:
+                return
+            self._total_bytes += size - session.memory_bytes
+            session.memory_bytes = size
+            if self.max_session_bytes is not None and size > self.max_session_bytes:
+                del self._sessions[session.session_id]
+                self._total_bytes -= size
+                self.evictions['memory'] += 1
+                raise SessionMemoryError(
+                    f"Session '{session.session_id}' uses {size} bytes, over the limit of {self.max_session_bytes}"
+                )
+            if self.max_total_bytes is not None:
+                while self._total_bytes > self.max_total_bytes and len(self._sessions) > 1:
+                    self._evict_oldest('memory', keep=session.session_id)
+
+    def evict_idle(self) -> int:
+        with self._lock:
+            return self._evict_idle(self.clock())
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'session_count': len(self._sessions),
+                'session_memory_bytes': self._total_bytes,
+                'evicted_idle': self.evictions['idle'],
+                'evicted_capacity': self.evictions['capacity'],
+                'evicted_memory': self.evictions['memory']
+            }
+
+    def _evict_idle(self, now: float) -> int:
+        self._last_sweep = now
+        expired = []
+        # Sessions are kept in least-recently-used order, so the idle ones come first
+        for session_id, session in self._sessions.items():
+            if now - session.last_used <= self.idle_timeout:
+                break
+            expired.append(session_id)
+        for session_id in expired:
+            self._total_bytes -= self._sessions.pop(session_id).memory_bytes
+        self.evictions['idle'] += len(expired)
+        return len(expired)
+
+    def _evict_oldest(self, reason: str, keep: str):
+        for session_id in self._sessions:
+            if session_id != keep:
+                self._total_bytes -= self._sessions.pop(session_id).memory_bytes
+                self.evictions[reason] += 1
+                return
@@ -0,0 +1,217 @@
+"""
+This module defines a ShellPool of long-lived /bin/sh workers. Starting a shell for
+every system command costs a fork, an exec and the shell's own startup; a worker
+instead reads commands from its stdin and runs each one in a subshell, so a command
+costs one fork inside an already running shell.
+
+Each command is followed by a uuid sentinel on stdout (with the exit status) and on
+stderr, which is how the reader knows where one command's output ends. A command
+that runs past its timeout has its worker's process group killed, and the worker is
+replaced on next use.
+"""
+
+import os
+import queue
+import selectors
+import shlex
+import signal
+import subprocess
+import threading
+import time
+import uuid
+from typing import List, Optional
+
+from metrics import REGISTRY
+
+SHELL = '/bin/sh'
+
+WORKER_STARTS = REGISTRY.counter('codetalk_shell_worker_starts_total', 'Shell worker processes started')
+WORKER_KILLS = REGISTRY.counter('codetalk_shell_worker_kills_total',
+                                'Shell workers lost to a timeout or an exited shell', ('reason',))
+
+_READ_SIZE = 65536
+
+
+class ShellWorker:
+    """
+    One persistent shell that runs commands sent to it one at a time.
+
+    Commands run as `( cd CWD && eval COMMAND; wait ) </dev/null`: the subshell keeps
+    cd, exit and variable assignments from leaking into later commands, eval turns a
+    syntax error into an exit status instead of a shell waiting for more input, wait
+    lets background jobs finish before the command counts as done, and the command
+    cannot read the worker's stdin. Like subprocess.run(shell=True), each
+    command starts in the caller's current directory.
+    """
+
+    def __init__(self, shell: str = SHELL):
+        self.shell = shell
+        self.commands_run = 0
+        self._process: Optional[subprocess.Popen] = None
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self):
+        # A session of its own lets a timeout kill the command's children along with the shell
+        self._process = subprocess.Popen([self.shell], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                         stderr=subprocess.PIPE, bufsize=0, start_new_session=True)
+        WORKER_STARTS.inc()
+
+    def kill(self):
+        if self._process is None:
+            return
+        try:
+            os.killpg(self._process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        self._process.wait()
+        for pipe in (self._process.stdin, self._process.stdout, self._process.stderr):
+            pipe.close()
+        self._process = None
+
+    def close(self):
+        """Let the shell exit after its current command by closing its stdin."""
+        if self._process is None:
+            return
+        try:
+            self._process.stdin.close()
+            self._process.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        self.kill()
+
+    def run(self, command: str, timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+        """
+        Run command and wait for it to finish.
+
+        Returns:
+            subprocess.CompletedProcess: With text stdout and stderr.
+
+        Raises:
+            subprocess.TimeoutExpired: If the command ran longer than timeout seconds.
+                The worker has been killed and restarts on its next command.
+        """
+        if not self.alive:
+            self.kill()
+            self.start()
+        sentinel = uuid.uuid4().hex
+        # wait keeps background jobs' output with the command that started them
+        script = (f"( cd -- {shlex.quote(os.getcwd())} && eval {shlex.quote(command)}; "
+                  f"status=$?; wait; exit $status ) </dev/null; "
+                  f"printf '\\n%s %d\\n' {sentinel} $?; printf '\\n%s\\n' {sentinel} >&2\n")
+        self.commands_run += 1
+        try:
+            self._process.stdin.write(script.encode('utf-8'))
+        except BrokenPipeError:
+            self.kill()
+            raise
+        stdout, stderr, returncode = self._read_until(sentinel.encode('ascii'), command, timeout)
+        return subprocess.CompletedProcess(command, returncode, stdout, stderr)
+
+    def _read_until(self, sentinel: bytes, command: str, timeout: Optional[float]):
+        process = self._process
+        deadline = None if timeout is None else time.monotonic() + timeout
+        buffers = {process.stdout: bytearray(), process.stderr: bytearray()}
+        markers = {process.stdout: b'\n' + sentinel + b' ', process.stderr: b'\n' + sentinel + b'\n'}
+        pending: List = list(buffers)
+        with selectors.DefaultSelector() as selector:
+            for pipe in pending:
+                selector.register(pipe, selectors.EVENT_READ)
+            while pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self.kill()
+                    WORKER_KILLS.labels('timeout').inc()
+                    raise subprocess.TimeoutExpired(command, timeout, output=_decode(buffers[process.stdout]),
+                                                    stderr=_decode(buffers[process.stderr]))
+                for key, _ in selector.select(remaining):
+                    pipe = key.fileobj
+                    data = os.read(pipe.fileno(), _READ_SIZE)
+                    if not data:
+                        # The shell itself exited, e.g. the command killed its parent
+                        self.kill()
+                        WORKER_KILLS.labels('exited').inc()
+                        return _decode(buffers[process.stdout]), _decode(buffers[process.stderr]), -1
+                    buffers[pipe] += data
+                    marker = markers[pipe]
+                    # The sentinel line is the last thing the worker writes for a command
+                    if buffers[pipe].endswith(b'\n') and marker in buffers[pipe][-len(marker) - 8:]:
+                        selector.unregister(pipe)
+                        pending.remove(pipe)
+
+        stdout = buffers[process.stdout]
+        end = stdout.rindex(markers[process.stdout])
+        returncode = int(stdout[end + len(markers[process.stdout]):].strip())
+        stderr = buffers[process.stderr]
+        return _decode(stdout[:end]), _decode(stderr[:len(stderr) - len(markers[process.stderr])]), returncode
+
+
+def _decode(data: bytes) -> str:
+    return bytes(data).decode('utf-8', errors='replace')
+
+
+class ShellPool:
+    """
+    Run shell commands on up to size persistent workers at once.
+
+    Workers start on demand; a caller waits for an idle worker when all of them are
+    busy. On platforms without /bin/sh, commands fall back to subprocess.run.
+
+    Args:
+        size (int): The most workers, and so the most commands running at once.
+        timeout (float): The default per-command timeout in seconds.
+    """
+
+    def __init__(self, size: int = 4, timeout: Optional[float] = 10.0, shell: str = SHELL):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.size = size
+        self.timeout = timeout
+        self.shell = shell
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._started = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _acquire(self) -> ShellWorker:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._started < self.size:
+                self._started += 1
+                return ShellWorker(self.shell)
+        return self._idle.get()
+
+    def run(self, command: str, timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+        """Run command on an idle worker; see ShellWorker.run. timeout defaults to the pool's."""
+        if self._closed:
+            raise RuntimeError("ShellPool is closed")
+        timeout = self.timeout if timeout is None else timeout
+        if not os.path.exists(self.shell):
+            return subprocess.run(command, shell=True, capture_output=True, text=True, timeout=timeout)
+        worker = self._acquire()
+        try:
+            return worker.run(command, timeout)
+        finally:
+            if self._closed:
+                worker.close()
+            else:
+                self._idle.put(worker)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def __enter__(self) -> 'ShellPool':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,114 @@
+"""
+This module defines the dispatch table used for English switch statements. Cases
+with a plain value are hashed into a dict keyed by their normalized value, so
+choosing a case costs O(1) however many cases there are. Range cases ("1 to 10")
+and predicate cases ("greater than 100") are checked in order only when no plain
+case matches.
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from condition_compiler import ConditionError, compile_condition
+
+_RANGE_CASE = re.compile(
+    r'^(?:between\s+|from\s+)?(-?\d+(?:\.\d+)?)\s*(?:to|through|and|\.\.|-)\s*(-?\d+(?:\.\d+)?)$',
+    re.IGNORECASE
+)
+_PREDICATE_CASE = re.compile(
+    r'^(?:is\s+)?(?:not\s+)?(?:greater|less|more|fewer|larger|smaller|bigger|at\s+least|at\s+most|'
+    r'equal\s+to|in\b|[<>]=?|[!=]=)',
+    re.IGNORECASE
+)
+_SUBJECT = '_switch_value'
+
+
+def normalize_case_value(value: Any) -> Any:
+    """
+    Normalize a case label or switch value so equal values hash alike.
+
+    Surrounding quotes and whitespace are dropped, numeric text becomes a number and
+    other text is case-folded, so 'Red', "red" and red all select the same case.
+    """
+    if not isinstance(value, str):
+        return value
+    text = value.strip()
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in '\'"':
+        text = text[1:-1]
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return text.casefold()
+
+
+def case_predicate(case: Any) -> Optional[Callable[[Any], bool]]:
+    """Return a predicate for a range or comparison case, or None for a plain value."""
+    if not isinstance(case, str):
+        return None
+    text = case.strip()
+    match = _RANGE_CASE.match(text)
+    if match:
+        low, high = sorted(float(bound) for bound in match.groups())
+        return lambda value: isinstance(value, (int, float)) and low <= value <= high
+    if _PREDICATE_CASE.match(text):
+        condition_holds = compile_condition(f"{_SUBJECT} {text}")
+        return lambda value: condition_holds({_SUBJECT: value})
+    return None
+
+
+class SwitchTable:
+    """
+    The compiled form of a switch statement.
+
+    Args:
+        cases (dict): Case labels mapped to their actions.
+        default: The action used when no case matches.
+        compile_action (callable, optional): Turns an action into its executable
+            form. Each action is compiled the first time its case is selected.
+    """
+
+    def __init__(self, cases: Mapping[Any, Any], default: Any = None,
+                 compile_action: Optional[Callable[[Any], Any]] = None):
+        self.table: Dict[Any, Any] = {}
+        self.predicates: List[Tuple[Callable[[Any], bool], Any]] = []
+        for case, action in cases.items():
+            predicate = case_predicate(case)
+            if predicate is not None:
+                self.predicates.append((predicate, action))
+            else:
+                # The first of several equal labels wins, as with a chain of comparisons
+                self.table.setdefault(normalize_case_value(case), action)
+        self.default = default
+        self.compile_action = compile_action
+        self._compiled: Dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.table) + len(self.predicates)
+
+    def lookup(self, value: Any) -> Any:
+        """Return the action for value, the default action, or None."""
+        try:
+            return self.table[normalize_case_value(value)]
+        except (KeyError, TypeError):
+            pass
+        for predicate, action in self.predicates:
+            try:
+                if predicate(value):
+                    return action
+            except ConditionError:
+                continue
+        return self.default
+
+    def compiled_action(self, value: Any) -> Any:
+        """Like lookup, but return the action's compiled form."""
+        action = self.lookup(value)
+        if action is None or self.compile_action is None:
+            return action
+        key = id(action)
+        if key not in self._compiled:
+            self._compiled[key] = self.compile_action(action)
+        return self._compiled[key]
@@ -0,0 +1,131 @@
+"""
+This module defines a structured, level-gated trace facility. Each event belongs to
+a subsystem ('parse', 'function', 'data', ...) and has a level; events below their
+subsystem's level are dropped before any message or repr is built. Recorded events
+go to an in-memory ring buffer, an optional JSONL sink and, optionally, the console.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional
+from metrics import REGISTRY
+
+DEBUG = 10
+INFO = 20
+ERROR = 40
+OFF = 100
+
+LEVEL_NAMES = {DEBUG: 'debug', INFO: 'info', ERROR: 'error', OFF: 'off'}
+_LEVELS_BY_NAME = {name: level for level, name in LEVEL_NAMES.items()}
+
+ERRORS = REGISTRY.counter('codetalk_errors_total', 'Error events reported through a tracer, by subsystem',
+                          ('subsystem',))
+
+
+def parse_level(level: Any) -> int:
+    if isinstance(level, str):
+        return _LEVELS_BY_NAME[level.lower()]
+    return int(level)
+
+
+class JSONLSink:
+    """Append trace events to a file, one JSON object per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'a')
+        self._lock = threading.Lock()
+
+    def write(self, event: Dict[str, Any]):
+        line = json.dumps(event, default=repr)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class Tracer:
+    """
+    Record structured events for the subsystems whose level admits them.
+
+    Messages take printf-style arguments that are only formatted when the event is
+    recorded, and callers on hot paths check enabled(subsystem, level) before
+    building expensive fields, so a disabled subsystem costs one dict lookup and a
+    comparison.
+
+    Args:
+        level (int or str): The default level for subsystems without their own.
+        buffer_size (int): How many recent events the ring buffer keeps.
+        sink_path (str, optional): A JSONL file that receives every recorded event.
+        echo (bool): Whether recorded events are also printed to the console.
+    """
+
+    def __init__(self, level: Any = INFO, buffer_size: int = 1000, sink_path: Optional[str] = None,
+                 echo: bool = False):
+        self.levels: Dict[str, int] = {'*': parse_level(level)}
+        self.events: deque = deque(maxlen=buffer_size)
+        self.sink: Optional[JSONLSink] = JSONLSink(sink_path) if sink_path else None
+        self.echo = echo
+
+    def fork(self) -> 'Tracer':
+        """
+        Create a tracer with its own ring buffer that shares this tracer's levels,
+        sink and echo setting, e.g. for one interpreter session.
+        """
+        tracer = Tracer.__new__(Tracer)
+        tracer.levels = self.levels
+        tracer.events = deque(maxlen=self.events.maxlen)
+        tracer.sink = self.sink
+        tracer.echo = self.echo
+        return tracer
+
+    def set_level(self, level: Any, subsystems: Iterable[str] = ('*',)):
+        """Set the level of the given subsystems at runtime; '*' is the default."""
+        level = parse_level(level)
+        for subsystem in subsystems:
+            self.levels[subsystem] = level
+
+    def enabled(self, subsystem: str, level: int = DEBUG) -> bool:
+        return level >= self.levels.get(subsystem, self.levels['*'])
+
+    def emit(self, subsystem: str, level: int, event: str, message: Optional[str] = None, *args: Any,
+             **fields: Any):
+        """Record an event if its subsystem's level admits it, formatting message % args."""
+        if level < self.levels.get(subsystem, self.levels['*']):
+            return
+        record = {'time': time.time(), 'subsystem': subsystem, 'level': LEVEL_NAMES.get(level, level),
+                  'event': event}
+        if message is not None:
+            record['message'] = message % args if args else message
+        record.update(fields)
+        self.events.append(record)
+        if self.sink is not None:
+            self.sink.write(record)
+        if self.echo and message is not None:
+            print(record['message'])
+
+    def debug(self, subsystem: str, event: str, message: Optional[str] = None, *args: Any, **fields: Any):
+        self.emit(subsystem, DEBUG, event, message, *args, **fields)
+
+    def info(self, subsystem: str, event: str, message: Optional[str] = None, *args: Any, **fields: Any):
+        self.emit(subsystem, INFO, event, message, *args, **fields)
+
+    def error(self, subsystem: str, event: str, message: Optional[str] = None, *args: Any, **fields: Any):
+        # Errors are counted even when the subsystem's level drops the event
+        ERRORS.labels(subsystem).inc()
+        self.emit(subsystem, ERROR, event, message, *args, **fields)
+
+    def recent(self, subsystem: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return recorded events from the ring buffer, oldest first."""
+        events = [event for event in self.events if subsystem is None or event['subsystem'] == subsystem]
+        return events[-limit:] if limit else events
+
+    def close(self):
+        if self.sink is not None:
+            self.sink.close()
+            self.sink = None
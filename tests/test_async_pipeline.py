@@ -0,0 +1,127 @@
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.fakes import FakeCoreNLPServer, FakeLLM
+from src.corenlp_client import aget_annotations
+from src.english_interpreter import EnglishInterpreter
+from src.intent_recognizer import IntentRecognizer
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+def fake_recognizer():
+    recognizer = IntentRecognizer()
+    recognizer._tokenize = str.split  # Avoid loading NLTK data
+    return recognizer, FakeLLM(latency=0.05).install(recognizer)
+
+class FakeAsyncInputProcessor:
+    async def aprocess_input(self, english_instruction, session=None):
+        await asyncio.sleep(0.01)
+        return {'raw_text': english_instruction}
+
+class FakeInputProcessor:
+    def process_input(self, english_instruction):
+        return {'raw_text': english_instruction}
+
+class TestAsyncPipeline(unittest.TestCase):
+    def test_arecognize_intent_awaits_the_llm(self):
+        recognizer, llm = fake_recognizer()
+
+        async def recognize_all():
+            texts = ["Define a function 'add'", "Call the 'greet' function", "Set 'x' to 1"]
+            return await asyncio.gather(*(recognizer.arecognize_intent({'raw_text': text}, {}) for text in texts))
+
+        intents = asyncio.run(recognize_all())
+        self.assertEqual([intent['primary_intent'] for intent in intents],
+                         ['function_definition', 'function_call', 'variable_assignment'])
+        self.assertEqual(intents[1]['relevant_entities'], ['greet'])
+        self.assertEqual(llm.calls, 3)
+        recognizer.intent_batcher.close()
+
+    def test_interpreter_executes_off_the_event_loop_in_order(self):
+        interpreter = EnglishInterpreter(embedding_cache_dir=None)
+        interpreter.input_processor = FakeAsyncInputProcessor()
+        interpreter.intent_recognizer, llm = fake_recognizer()
+        executed = []
+
+        def execute(recognized_intent, context):
+            executed.append((recognized_intent['primary_intent'], threading.get_ident()))
+            return {'status': 'success'}
+
+        interpreter.translate_to_code = lambda recognized_intent: recognized_intent
+        interpreter._execute_instruction = execute
+        interpreter.output_generator.generate_output = lambda result, context: result['status']
+        instructions = ["Call the 'greet' function", "Display 'x'", "Import 'math'"]
+        results = asyncio.run(interpreter.aprocess_instructions(instructions))
+        self.assertEqual([result['output'] for _, result in results], ['success'] * 3)
+        self.assertEqual([intent for intent, _ in executed], ['function_call', 'io_operation', 'module_import'])
+        self.assertNotIn(threading.get_ident(), {thread for _, thread in executed})
+        interpreter.intent_recognizer.intent_batcher.close()
+
+    def test_async_instructions_are_timed_and_answer_performance_stats(self):
+        interpreter = EnglishInterpreter(embedding_cache_dir=None, perf_sample_rate=1.0)
+        interpreter.input_processor = FakeAsyncInputProcessor()
+        interpreter.intent_recognizer, llm = fake_recognizer()
+        interpreter.translate_to_code = lambda recognized_intent: recognized_intent
+        interpreter._execute_instruction = lambda recognized_intent, context: {'status': 'success'}
+        interpreter.output_generator.generate_output = lambda result, context: result['status']
+
+        async def run():
+            results = await interpreter.aprocess_instructions(["Display 'x'", "Show performance stats",
+                                                               "Import 'math'"])
+            return results, await interpreter.aprocess_single_instruction("Show performance stats.")
+
+        results, stats = asyncio.run(run())
+        self.assertEqual(llm.calls, 2)
+        self.assertEqual(results[1][1]['intent']['type'], 'performance_stats')
+        self.assertIn('intent_recognition', results[1][1]['output'])
+        self.assertEqual(stats['intent']['type'], 'performance_stats')
+        stages = interpreter.get_performance_stats()['stages']
+        for stage in ('input_processing', 'intent_recognition', 'semantic_match', 'execution', 'total'):
+            self.assertEqual(stages[stage]['count'], 2, stage)
+        interpreter.intent_recognizer.intent_batcher.close()
+
+    def test_batched_instructions_from_threads_share_prompts(self):
+        recognizer = IntentRecognizer(max_batch_size=4, max_batch_wait_ms=200)
+        recognizer._tokenize = str.split
+        llm = FakeLLM().install(recognizer)
+        interpreter = EnglishInterpreter(embedding_cache_dir=None, perf_sample_rate=1.0,
+                                         input_processor=FakeInputProcessor(), intent_recognizer=recognizer)
+        self.assertIs(interpreter.intent_recognizer, recognizer)
+        executed = []
+
+        def execute(recognized_intent, context):
+            executed.append(recognized_intent['primary_intent'])
+            return {'status': 'success'}
+
+        interpreter.translate_to_code = lambda recognized_intent: recognized_intent
+        interpreter._execute_instruction = execute
+        interpreter.output_generator.generate_output = lambda result, context: result['status']
+        instructions = ["Call the 'greet' function", "Display 'x'", "Import 'math'", "Set 'x' to 1"]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda text: interpreter.process_single_instruction(text, batched=True),
+                                        instructions))
+        recognizer.intent_batcher.close()
+        self.assertEqual([result['output'] for result in results], ['success'] * 4)
+        self.assertEqual(sorted(executed), sorted(['function_call', 'io_operation', 'module_import',
+                                                   'variable_assignment']))
+        self.assertLess(llm.calls, 4)
+        self.assertEqual(interpreter.get_performance_stats()['stages']['execution_wait']['count'], 4)
+
+    @unittest.skipIf(aiohttp is None, "aiohttp is not installed")
+    def test_aget_annotations_against_a_local_corenlp(self):
+        with FakeCoreNLPServer() as server:
+            annotations = asyncio.run(aget_annotations("Set 'count' to 10", {}, server.url))
+        self.assertEqual(annotations['sentences'][0]['tokens'][0]['word'], 'Set')
+        self.assertEqual(server.requests, 1)
+
+    @unittest.skipIf(aiohttp is not None, "aiohttp is installed")
+    def test_aget_annotations_explains_missing_aiohttp(self):
+        with self.assertRaisesRegex(ImportError, 'pip install aiohttp'):
+            asyncio.run(aget_annotations("Set 'count' to 10", {}))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import json
+import unittest
+import urllib.request
+from benchmarks.fakes import FakeCoreNLPServer, FakeEmbeddings, FakeLLM
+
+class TestBenchmarkFakes(unittest.TestCase):
+    def test_corenlp_server_answers_annotation_requests(self):
+        with FakeCoreNLPServer() as server:
+            request = urllib.request.Request(server.url + '/?properties=%7B%7D', data=b"Set 'count' to 10")
+            with urllib.request.urlopen(request) as response:
+                sentence = json.loads(response.read())['sentences'][0]
+        self.assertEqual([token['pos'] for token in sentence['tokens']], ['VB', 'NN', 'NN', 'CD'])
+        self.assertEqual(sentence['basicDependencies'][0]['dep'], 'ROOT')
+        self.assertEqual(server.requests, 1)
+
+    def test_llm_answers_single_and_batched_prompts(self):
+        llm = FakeLLM()
+        self.assertEqual(llm.run(instruction="Define a function 'add'").split('\n')[0], "Intent: function_definition")
+        batch = llm.run(instructions="[1] Set 'x' to 1\n[2] Call the 'greet' function")
+        self.assertIn("[2] Intent: function_call", batch)
+        self.assertEqual((llm.calls, llm.items), (2, 3))
+
+    def test_embeddings_are_deterministic(self):
+        embeddings = FakeEmbeddings()
+        self.assertEqual(embeddings.embed_query("display 'x'"), embeddings.embed_documents(["display 'x'"])[0])
+        self.assertEqual(embeddings.calls, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+from benchmarks.harness import Benchmark, compare, run_benchmark
+
+class TestBenchmarkHarness(unittest.TestCase):
+    def test_run_benchmark_calibrates_loops(self):
+        calls = []
+        result = run_benchmark(Benchmark('noop', lambda: calls.append(1), setup=calls.clear), runs=3, min_time=0.001)
+        self.assertEqual(len(result['values']), 3)
+        self.assertGreater(result['loops'], 1)
+        self.assertLessEqual(result['min'], result['median'])
+
+    def test_compare_flags_regressions(self):
+        baseline = {'benchmarks': {'a': {'median': 1.0}, 'b': {'median': 1.0}, 'gone': {'median': 1.0}}}
+        results = {'benchmarks': {'a': {'median': 1.5}, 'b': {'median': 0.5}, 'new': {'median': 1.0}}}
+        rows = {row['name']: row for row in compare(results, baseline, threshold=0.25)}
+        self.assertEqual(sorted(rows), ['a', 'b'])
+        self.assertTrue(rows['a']['regression'])
+        self.assertTrue(rows['b']['improvement'])
+
+    def test_compare_divides_by_the_reference_workload(self):
+        # Everything took twice as long on a machine half as fast: no change
+        baseline = {'reference': 1.0, 'benchmarks': {'a': {'median': 1.0}, 'b': {'median': 1.0}}}
+        results = {'reference': 2.0, 'benchmarks': {'a': {'median': 2.0}, 'b': {'median': 3.0}}}
+        rows = {row['name']: row for row in compare(results, baseline, threshold=0.25)}
+        self.assertAlmostEqual(rows['a']['change'], 0.0)
+        self.assertFalse(rows['a']['regression'])
+        self.assertAlmostEqual(rows['b']['change'], 0.5)
+        self.assertTrue(rows['b']['regression'])
+
+if __name__ == '__main__':
+    unittest.main()
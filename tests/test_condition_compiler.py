@@ -0,0 +1,53 @@
+import unittest
+from src.condition_compiler import MAX_REPEAT_LENGTH, ConditionError, compile_condition, compile_expression, to_infix
+
+class TestConditionCompiler(unittest.TestCase):
+    variables = {'x': 6, 'y': 3, 'name': 'bob', 'fruits': ['apple', 'pear']}
+
+    def test_english_conditions(self):
+        cases = {
+            "'x' is greater than 5 and 'y' equals 3": True,
+            "the value of 'x' is less than or equal to 5": False,
+            "'x' plus 'y' is at least 9": True,
+            "'name' is not equal to \"alice\"": True,
+            "'apple' is in 'fruits'": True,
+            "'x' is 6 or 'y' is greater than 10": True,
+        }
+        for condition, expected in cases.items():
+            self.assertEqual(compile_condition(condition)(self.variables), expected, condition)
+
+    def test_infix_conditions(self):
+        self.assertTrue(compile_condition("x > 5 and y == 3")(self.variables))
+        self.assertTrue(compile_condition("len(fruits) == 2 and fruits[0] == 'apple'")(self.variables))
+        self.assertEqual(to_infix("'x' is more than 2")[0], "x > 2")
+
+    def test_unsafe_expressions_are_rejected(self):
+        for condition in ("__import__('os').system('true')", "x.__class__", "open('f')", "[c for c in 'ab']"):
+            with self.assertRaises(ConditionError):
+                compile_condition(condition)
+
+    def test_unknown_variable(self):
+        with self.assertRaises(ConditionError):
+            compile_condition("z > 1")(self.variables)
+
+    def test_quoted_names_are_not_rewritten_as_operators(self):
+        variables = {'times': 4, 'mod': 2, 'is': 1, 'true': 0}
+        self.assertEqual(to_infix("'times' is greater than 'mod'")[0], "times > mod")
+        self.assertTrue(compile_condition("'times' is greater than 'mod'")(variables))
+        self.assertTrue(compile_condition("'is' equals 1 and 'true' is 0")(variables))
+        self.assertEqual(compile_expression("'times' times 'mod'")(variables), 8)
+        # An undefined quoted name is still the string itself
+        self.assertEqual(compile_expression("'in'")({}), 'in')
+
+    def test_sequence_repetition_is_capped(self):
+        self.assertEqual(compile_expression("[0] * 3")({}), [0, 0, 0])
+        self.assertEqual(compile_expression("3 times 'x'")({'x': 'ab'}), 'ababab')
+        for expression in ("[0] * 1000000000000", "1000000000000 * 'ab'", f"'x' * {MAX_REPEAT_LENGTH + 1}"):
+            with self.assertRaises(ConditionError):
+                compile_expression(expression)({'x': 'y'})
+
+    def test_compiled_conditions_are_cached(self):
+        self.assertIs(compile_condition("'x' is 6"), compile_condition("'x' is 6"))
+
+if __name__ == '__main__':
+    unittest.main()
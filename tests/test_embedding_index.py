@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+from src.embedding_index import DEFAULT_INSTRUCTION_EXEMPLARS, EmbeddingIndex, HashingEmbeddings
+from src.english_interpreter import EnglishInterpreter
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class CountingEmbeddings(HashingEmbeddings):
+    def __init__(self):
+        super().__init__()
+        self.texts = 0
+
+    def embed_documents(self, texts):
+        self.texts += len(texts)
+        return super().embed_documents(texts)
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestEmbeddingIndex(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache_dir = directory.name
+
+    def test_exact_search_finds_the_exemplar(self):
+        index = EmbeddingIndex(HashingEmbeddings())
+        index.add_exemplars(DEFAULT_INSTRUCTION_EXEMPLARS)
+        text, intent = DEFAULT_INSTRUCTION_EXEMPLARS[6]
+        result = index.search(text, k=2)
+        self.assertEqual((result[0]['exemplar'], result[0]['intent']), (text, intent))
+        self.assertAlmostEqual(result[0]['score'], 1.0, places=5)
+        self.assertGreaterEqual(result[0]['score'], result[1]['score'])
+        self.assertIsNone(index.match("zzz qqq", min_score=0.9))
+
+    def test_ivf_search(self):
+        index = EmbeddingIndex(HashingEmbeddings(), ivf_threshold=10, n_probe=1)
+        index.add_exemplars(DEFAULT_INSTRUCTION_EXEMPLARS)
+        self.assertIsNotNone(index.ivf)
+        text, intent = DEFAULT_INSTRUCTION_EXEMPLARS[0]
+        self.assertEqual(sum(len(rows) for rows in index.ivf.lists), len(index))
+        self.assertLessEqual(len(index.ivf.candidates(index.matrix[0])), len(index))
+        # Probing every cluster makes the approximate search exact
+        index.ivf.n_probe = len(index.ivf.centroids)
+        self.assertEqual(index.search(text)[0]['intent'], intent)
+
+    def test_cache_hits_misses_and_persistence(self):
+        embeddings = CountingEmbeddings()
+        index = EmbeddingIndex(embeddings, cache_dir=self.cache_dir)
+        index.add_exemplars(DEFAULT_INSTRUCTION_EXEMPLARS)
+        self.assertEqual((index.cache.hits, index.cache.misses), (0, len(DEFAULT_INSTRUCTION_EXEMPLARS)))
+        self.assertTrue(os.path.exists(index.cache.path))
+
+        embeddings = CountingEmbeddings()
+        reloaded = EmbeddingIndex(embeddings, cache_dir=self.cache_dir)
+        reloaded.add_exemplars(DEFAULT_INSTRUCTION_EXEMPLARS)
+        self.assertEqual((reloaded.cache.hits, reloaded.cache.misses), (len(DEFAULT_INSTRUCTION_EXEMPLARS), 0))
+        self.assertEqual(embeddings.texts, 0)
+        numpy.testing.assert_allclose(reloaded.matrix, index.matrix)
+
+        reloaded.search("Call the 'greet' function")
+        self.assertEqual((reloaded.cache.misses, embeddings.texts), (1, 1))
+
+class TestSemanticMatch(unittest.TestCase):
+    def setUp(self):
+        self.embeddings = CountingEmbeddings()
+        self.interpreter = EnglishInterpreter(embeddings=self.embeddings, embedding_cache_dir=None)
+
+    def test_confident_recognition_skips_the_embedding_index(self):
+        recognized_intent = {'primary_intent': 'function_call', 'confidence_score': 0.9}
+        self.interpreter._apply_semantic_match(recognized_intent, "Call the 'greet' function")
+        self.assertEqual(recognized_intent['type'], 'function_call')
+        self.assertEqual(self.embeddings.texts, 0)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_unsure_recognition_falls_back_to_the_embedding_index(self):
+        recognized_intent = {'primary_intent': 'something else', 'confidence_score': 0.9}
+        self.interpreter._apply_semantic_match(recognized_intent, "Call the 'add' function with 5 and 7")
+        self.assertEqual(recognized_intent['type'], 'function_call')
+        self.assertEqual(recognized_intent['semantic_match']['exemplar'], "Call the 'add' function with 5 and 7")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -52,5 +52,16 @@ class TestEnglishExecutionEngine(unittest.TestCase):
             self.engine.execute_instruction(parsed_instruction)
         self.assertEqual(self.engine.variables['result'], 7)
 
+    def test_parallel_system_commands(self):
+        parsed_instruction = self.engine.parse_instruction("Run ls, uptime and date in parallel")
+        self.assertEqual(parsed_instruction['commands'], ['ls', 'uptime', 'date'])
+        parsed_instruction = self.engine.parse_instruction(
+            "Run 'echo a', 'echo b' and 'echo c' in parallel with at most 2 at a time")
+        self.assertEqual(parsed_instruction['max_concurrency'], 2)
+        self.assertEqual(self.engine.execute_instruction(parsed_instruction), ['a\n', 'b\n', 'c\n'])
+        # Nothing runs when any command is not allowed
+        parsed_instruction = self.engine.parse_instruction("Run 'echo a' and 'rm -rf x' in parallel")
+        self.assertIn("not allowed", self.engine.execute_instruction(parsed_instruction))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
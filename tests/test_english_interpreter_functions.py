@@ -0,0 +1,165 @@
+import json
+import os
+import tempfile
+import unittest
+from src.english_interpreter import EnglishInterpreter
+from src.scope import Scope
+from src.session_manager import SessionManager
+
+class FakeInputProcessor:
+    def __init__(self):
+        self.calls = 0
+
+    def process_input(self, english_instruction):
+        self.calls += 1
+        return {'intent': '', 'context': {}, 'raw_text': english_instruction}
+
+class FakeIntentRecognizer:
+    """Recognizes 'set NAME to VALUE', 'call NAME ARGS...' and 'return NAME' without NLP or an LLM."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def recognize_intent(self, intent_data, context=None, language='generic'):
+        self.calls += 1
+        words = intent_data['raw_text'].split()
+        if words[0] == 'set':
+            return {'type': 'variable_assignment', 'variable_name': words[1], 'value': words[3]}
+        if words[0] == 'call':
+            return {'type': 'function_call', 'function_name': words[1], 'arguments': words[2:]}
+        if words[0] == 'return':
+            return {'type': 'return_statement', 'value': words[1]}
+        return {'type': 'expression_evaluation', 'expression': ' '.join(words)}
+
+class TestEnglishInterpreter(unittest.TestCase):
+    def setUp(self):
+        self.interpreter = EnglishInterpreter()
+        self.interpreter.input_processor = FakeInputProcessor()
+        self.interpreter.intent_recognizer = FakeIntentRecognizer()
+
+    def test_function_body_is_recognized_once(self):
+        result = self.interpreter._handle_function_definition({
+            'function_name': 'setup', 'body': 'set x to 1; set y to 2'
+        })
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(self.interpreter.intent_recognizer.calls, 2)
+
+        for _ in range(5):
+            call = self.interpreter._handle_function_call({'function_name': 'setup'})
+            self.assertEqual(call['status'], 'success')
+        self.assertEqual(self.interpreter.intent_recognizer.calls, 2)
+        self.assertEqual(self.interpreter.input_processor.calls, 2)
+
+    def define(self, name, body, parameters=()):
+        result = self.interpreter._handle_function_definition({
+            'function_name': name, 'parameters': list(parameters), 'body': body
+        })
+        self.assertEqual(result['status'], 'success')
+
+    def test_function_locals_do_not_leak(self):
+        self.interpreter.variables['g'] = 'global'
+        self.define('f', 'set local to 1; return g', parameters=['p'])
+        call = self.interpreter._handle_function_call({'function_name': 'f', 'arguments': ['g']})
+        self.assertEqual(call['data'], 'global')
+        self.assertEqual(self.interpreter.variables, {'g': 'global'})
+
+    def test_recursion_depth_is_limited(self):
+        self.interpreter.MAX_CALL_DEPTH = 20
+        self.define('forever', 'call forever; set x to 1')
+        call = self.interpreter._handle_function_call({'function_name': 'forever'})
+        self.assertEqual(call['status'], 'error')
+        self.assertIn('recursion depth', call['message'])
+        self.assertEqual(self.interpreter.call_depth, 0)
+
+    def test_self_call_in_tail_position(self):
+        self.define('again', 'set x to 1; call again x', parameters=['n'])
+        compiled_body = self.interpreter.functions['again'].compiled_body
+        self.interpreter.variables = Scope({}, {'x': 7})
+        result = self.interpreter._execute_function_body(compiled_body, self.interpreter.variables, 'again')
+        self.assertEqual(result['status'], 'tail_call')
+        self.assertEqual(result['arguments'], [1])
+
+    def test_self_tail_call_is_limited_by_recursion_depth(self):
+        self.interpreter.MAX_CALL_DEPTH = 20
+        self.define('again', 'set x to 1; call again x', parameters=['n'])
+        with self.assertRaises(RecursionError):
+            self.interpreter.functions['again'](0)
+        self.assertEqual(self.interpreter.call_depth, 0)
+        call = self.interpreter._handle_function_call({'function_name': 'again', 'arguments': [0]})
+        self.assertEqual(call['status'], 'error')
+        self.assertIn('recursion depth', call['message'])
+
+    def test_loop_body_is_recognized_once(self):
+        result = self.interpreter._handle_control_structure({
+            'structure_type': 'for', 'action': 'set last to 1; set other to 2', 'iterations': 1000
+        })
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(self.interpreter.intent_recognizer.calls, 2)
+        self.assertEqual(self.interpreter.variables['_index'], 999)
+        self.assertEqual(self.interpreter.variables['other'], 2)
+
+    def test_switch_dispatch(self):
+        self.interpreter.variables['color'] = 'Red'
+        cases = {f"'shade{i}'": f"set picked to {i}" for i in range(500)}
+        cases.update({"'red'": 'set picked to red', 'greater than 10': 'set picked to big'})
+        intent_data = {'structure_type': 'switch', 'condition': "'color'", 'cases': cases,
+                       'default': 'set picked to none'}
+        original = json.dumps(intent_data)
+        for _ in range(3):
+            self.assertEqual(self.interpreter._handle_control_structure(intent_data)['status'], 'success')
+        self.assertEqual(self.interpreter.variables['picked'], 'red')
+        self.assertEqual(self.interpreter.intent_recognizer.calls, 1)
+        # The compiled switch is cached on the interpreter, not in the intent
+        self.assertEqual(json.dumps(intent_data), original)
+        self.assertEqual(len(self.interpreter._switch_tables), 1)
+
+        self.interpreter.variables['color'] = 42
+        self.interpreter._handle_control_structure(intent_data)
+        self.assertEqual(self.interpreter.variables['picked'], 'big')
+
+    def test_switch_tables_are_kept_per_session(self):
+        intent_data = {'structure_type': 'switch', 'condition': "'color'", 'cases': {"'red'": 'set picked to red'}}
+        sessions = SessionManager()
+        tables = []
+        for name in ('a', 'b'):
+            with self.interpreter.use_session(sessions.get(name)):
+                self.interpreter.variables['color'] = 'red'
+                self.interpreter._handle_control_structure(intent_data)
+                self.assertEqual(self.interpreter.variables['picked'], 'red')
+                tables.append(self.interpreter._switch_tables)
+        self.assertIsNot(tables[0], tables[1])
+        self.assertEqual([len(table) for table in tables], [1, 1])
+        self.assertEqual(self.interpreter._switch_tables, {})
+        # Each session compiled the switch's action in its own context
+        self.assertEqual(self.interpreter.intent_recognizer.calls, 2)
+
+    def test_stream_test_instructions_writes_a_record_per_instruction(self):
+        def process(instruction):
+            if instruction == 'explode':
+                raise RuntimeError("recognition failed")
+            return {'output': instruction.upper(), 'context': self.interpreter._get_current_context(),
+                    'intent': {'type': 'expression_evaluation'}, 'translated_code': instruction}
+
+        self.interpreter.process_single_instruction = process
+        with tempfile.TemporaryDirectory() as directory:
+            test_file = os.path.join(directory, 'instructions.txt')
+            output_path = os.path.join(directory, 'results.jsonl')
+            with open(test_file, 'w') as file:
+                file.write("first\n\n  second  \nexplode\nnever reached\n")
+
+            def records():
+                with open(output_path) as file:
+                    return [json.loads(line) for line in file]
+
+            stream = self.interpreter.stream_test_instructions(test_file, output_path=output_path)
+            self.assertEqual(next(stream), ('first', process('first')))
+            # The record is on disk while the stream is still open
+            self.assertEqual(records(), [{'line': 1, 'instruction': 'first', 'intent': {'type': 'expression_evaluation'},
+                                          'translated_code': 'first', 'output': 'FIRST'}])
+            self.assertEqual(next(stream)[0], 'second')
+            self.assertRaises(RuntimeError, next, stream)
+            self.assertEqual([(record['line'], record['output']) for record in records()],
+                             [(1, 'FIRST'), (3, 'SECOND')])
+
+if __name__ == '__main__':
+    unittest.main()
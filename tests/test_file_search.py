@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+from src.execution_engine import ExecutionEngine
+from src.file_search import MAX_LINE_TEXT, iter_files, search_directory, search_file
+
+class TestFileSearch(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'app.log')
+        with open(self.path, 'w') as file:
+            file.write("start\nERROR disk full\nok\nerror again\n\nERROR twice ERROR")
+
+    def test_matches_report_lines_and_offsets(self):
+        # A tiny chunk size exercises newline counting across many chunks
+        result = search_file(self.path, 'ERROR', chunk_size=3)
+        self.assertEqual(result['count'], 3)
+        self.assertEqual([(m['line'], m['offset']) for m in result['matches']], [(2, 6), (6, 38), (6, 50)])
+        self.assertEqual(result['matches'][0]['text'], 'ERROR disk full')
+        self.assertFalse(result['truncated'])
+
+    def test_regex_case_and_limits(self):
+        result = search_file(self.path, r'^error', regex=True, ignore_case=True)
+        self.assertEqual([m['line'] for m in result['matches']], [2, 4, 6])
+        result = search_file(self.path, 'ERROR', first_match=True)
+        self.assertEqual((result['count'], result['truncated']), (1, True))
+        self.assertEqual(search_file(self.path, 'ERROR', max_matches=2)['count'], 2)
+        self.assertEqual(search_file(self.path, 'missing')['matches'], [])
+
+    def test_long_line_text_contains_the_match(self):
+        with open(self.path, 'w') as file:
+            file.write("short NEEDLE\n" + "x" * 1000 + "NEEDLE" + "y" * 1000 + "\n" + "z" * 150 + "NEEDLE")
+        first, long_line, last = search_file(self.path, 'NEEDLE')['matches']
+        self.assertEqual(first['text'], 'short NEEDLE')
+        self.assertEqual(long_line['line'], 2)
+        self.assertIn('NEEDLE', long_line['text'])
+        self.assertLessEqual(len(long_line['text']), MAX_LINE_TEXT)
+        # A line that fits is reported whole
+        self.assertEqual(last['text'], "z" * 150 + "NEEDLE")
+
+    def test_execution_engine_reports_matches(self):
+        engine = ExecutionEngine()
+        intent = {'primary_intent': 'search_file',
+                  'relevant_entities': {'filename': self.path, 'search_term': 'disk'}}
+        self.assertEqual(engine.execute(intent),
+                         f"The search term 'disk' was found in the file '{self.path}': 1 match at line 2 (byte 12).")
+
+class TestSearchDirectory(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = directory.name
+        files = {
+            'a.py': "import os\n# TODO tidy\n",
+            'notes.txt': "TODO one\nTODO two\n",
+            'pkg/b.py': "x = 1  # TODO\n",
+            'pkg/blob.bin': "TODO\0binary",
+            '.git/config': "TODO in git\n",
+        }
+        for name, content in files.items():
+            path = os.path.join(self.root, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as file:
+                file.write(content)
+
+    def relative(self, paths):
+        return sorted(os.path.relpath(path, self.root).replace(os.sep, '/') for path in paths)
+
+    def test_walk_applies_include_and_exclude_globs(self):
+        self.assertEqual(self.relative(iter_files(self.root, include=['*.py'])), ['a.py', 'pkg/b.py'])
+        self.assertEqual(self.relative(iter_files(self.root, exclude=['.git', 'pkg/*'])), ['a.py', 'notes.txt'])
+
+    def test_search_skips_binary_files_and_caps_results(self):
+        for use_processes in (False, True):
+            results = list(search_directory(self.root, 'TODO', exclude=['.git'], workers=2,
+                                            use_processes=use_processes))
+            self.assertEqual(self.relative(result['path'] for result in results), ['a.py', 'notes.txt', 'pkg/b.py'])
+        results = list(search_directory(self.root, 'TODO', max_results=2))
+        self.assertEqual(sum(result['count'] for result in results), 2)
+
+    def test_long_lines_show_the_match(self):
+        with open(os.path.join(self.root, 'app.min.js'), 'w') as file:
+            file.write("var a=1;" * 500 + "TODO" + ";var b=2" * 500)
+        results = list(search_directory(self.root, 'TODO', include=['*.js']))
+        self.assertEqual(len(results), 1)
+        match, = results[0]['matches']
+        self.assertIn('TODO', match['text'])
+        self.assertLessEqual(len(match['text']), MAX_LINE_TEXT)
+
+    def test_execution_engine_searches_a_directory(self):
+        engine = ExecutionEngine()
+        intent = {'primary_intent': 'search_directory',
+                  'relevant_entities': {'directory': self.root, 'search_term': 'tidy', 'include': '*.py, *.txt'}}
+        self.assertEqual(engine.execute(intent), f"The search term 'tidy' was found 1 time in 1 file under "
+                                                 f"'{self.root}':\n{os.path.join(self.root, 'a.py')}:2: # TODO tidy")
+
+if __name__ == '__main__':
+    unittest.main()
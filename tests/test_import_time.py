@@ -0,0 +1,43 @@
+import os
+import re
+import subprocess
+import sys
+import unittest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+# Cold-start budget for importing the interpreter, in microseconds (python -X importtime)
+IMPORT_BUDGET_US = 500000
+
+HEAVY_MODULES = ('nltk', 'sklearn', 'langchain', 'langchain_community', 'psutil', 'requests', 'numpy', 'aiohttp')
+
+class TestImportTime(unittest.TestCase):
+    def _import(self, module, code=''):
+        env = dict(os.environ, PYTHONPATH=SRC_DIR)
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f"import sys, {module}{code}"],
+            capture_output=True, text=True, env=env, cwd=SRC_DIR
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return result
+
+    def _cumulative_us(self, stderr, module):
+        for line in stderr.splitlines():
+            match = re.match(r'import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)$', line)
+            if match and match.group(2) == module:
+                return int(match.group(1))
+        self.fail(f"No import time reported for {module}")
+
+    def test_interpreter_import_within_budget(self):
+        for module in ('english_interpreter', 'english_execution_engine'):
+            result = self._import(module)
+            self.assertLess(self._cumulative_us(result.stderr, module), IMPORT_BUDGET_US)
+
+    def test_heavy_dependencies_are_not_imported(self):
+        code = ("; english_interpreter.EnglishInterpreter()"
+                f"; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+        result = self._import('english_interpreter', code)
+        self.assertEqual(result.stdout.strip(), '')
+
+if __name__ == '__main__':
+    unittest.main()
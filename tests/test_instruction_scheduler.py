@@ -0,0 +1,49 @@
+import unittest
+from src.english_execution_engine import EnglishExecutionEngine
+from src.instruction_scheduler import analyze_effects, build_dependency_graph
+
+class TestInstructionScheduler(unittest.TestCase):
+    instructions = [
+        "Create a variable named 'a' with value 10",
+        "Create a variable named 'b' with value 3",
+        "Create a variable named 'x' with value 1",
+        "Set 'c' to 'a' plus 'b'",
+        "Define a function named 'add' that takes 'a' and 'b' as parameters and returns 'a' plus 'b'",
+        "Set 'result' to the result of calling 'add' with 3 and 4",
+        "Create stack named 's'",
+        "Push stack named 's' item 5",
+        "For i from 1 to 5, add 'i' to 'x'",
+        "Set 'd' to 'c' times 'x'",
+        "This is not an instruction",
+        "Create a variable named 'a' with value 0",
+    ]
+
+    def test_dependency_graph(self):
+        engine = EnglishExecutionEngine()
+        effects = [analyze_effects(engine.parse_instruction(i)) for i in self.instructions[:6]]
+        deps = build_dependency_graph(effects)
+        self.assertEqual(deps[0], frozenset())
+        self.assertEqual(deps[1], frozenset())
+        self.assertEqual(deps[3], {0, 1})
+        self.assertEqual(deps[4], frozenset())
+        self.assertEqual(deps[5], {4})
+
+    def test_parallel_matches_sequential(self):
+        sequential = EnglishExecutionEngine()
+        parallel = EnglishExecutionEngine()
+        expected = sequential.execute_instructions(self.instructions)
+        actual = parallel.execute_instructions(self.instructions, parallel=True, max_workers=4)
+
+        self.assertEqual([i for i, _ in actual], self.instructions)
+        for (_, want), (_, got) in zip(expected, actual):
+            if isinstance(want, Exception):
+                self.assertIsInstance(got, type(want))
+            else:
+                self.assertEqual(got, want)
+        self.assertEqual(parallel.variables, sequential.variables)
+        self.assertEqual(parallel.variables['d'], 13 * 16)
+        self.assertEqual(parallel.variables['a'], 0)
+        self.assertEqual(parallel.variables['result'], 7)
+
+if __name__ == '__main__':
+    unittest.main()
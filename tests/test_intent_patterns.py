@@ -0,0 +1,79 @@
+import random
+import re
+import unittest
+from src.intent_recognizer import IntentRecognizer
+
+# The per-pattern loops the compiled alternation replaced
+
+def reference_match_intent(patterns, tokens):
+    instruction = ' '.join(tokens)
+    for pattern, intent in patterns:
+        if re.search(pattern, instruction):
+            return intent
+    return 'generic'
+
+def reference_extract_intent_data(patterns, tokens, matched_intent):
+    instruction = ' '.join(tokens)
+    for pattern, intent in patterns:
+        if intent == matched_intent:
+            match = re.search(pattern, instruction)
+            if match:
+                return match.group(0)
+    return None
+
+def reference_language_confidence(patterns, tokens):
+    matches = sum(1 for pattern, _ in patterns if any(re.search(pattern, token) for token in tokens))
+    return min(matches / len(patterns), 1.0)
+
+# Fragments that make the patterns match, partly match and overlap one another
+VOCABULARY = [
+    'print', 'print(', '(', ')', 'input', 'input(', 'def', 'class', 'import', 'from', 'os', 'x', 'Foo',
+    'console.log', 'console.log(', 'prompt', 'prompt(', 'function', 'let', 'const', 'var', '=', 'extends',
+    'printf', 'printf(', 'scanf', 'scanf(', '#include', '<stdio.h>', 'int', 'main', 'struct', 'cin', '>>',
+    'cout', '<<', 'System.out.println', 'System.out.println(', 'Scanner', 'sc', 'public', 'private',
+    'interface', 'Shape', 'String', 'name', 'a', ';', '{', '}',
+]
+
+class TestLanguagePatterns(unittest.TestCase):
+    def setUp(self):
+        self.recognizer = IntentRecognizer()
+
+    def assert_equivalent(self, language, tokens):
+        patterns = self.recognizer.language_specific_patterns[language]
+        intent = self.recognizer._match_intent(tokens, language)
+        self.assertEqual(intent, reference_match_intent(patterns, tokens), tokens)
+        for _, candidate in patterns:
+            self.assertEqual(self.recognizer._extract_intent_data(tokens, candidate, language),
+                             reference_extract_intent_data(patterns, tokens, candidate), (tokens, candidate))
+        self.assertEqual(self.recognizer._calculate_language_specific_confidence(tokens, language),
+                         reference_language_confidence(patterns, tokens), tokens)
+
+    def test_matches_the_per_pattern_loops_on_random_instructions(self):
+        rng = random.Random(29)
+        for language in self.recognizer.language_specific_patterns:
+            for _ in range(500):
+                tokens = [rng.choice(VOCABULARY) for _ in range(rng.randint(1, 8))]
+                self.assert_equivalent(language, tokens)
+
+    def test_built_in_patterns_need_only_the_single_scan(self):
+        for language, (_, compiled) in self.recognizer.compiled_language_patterns.items():
+            self.assertIsNone(compiled, language)
+
+    def test_reports_every_pattern_matching_at_the_same_position(self):
+        # Both patterns match at position 0; only the first alternative is reported there
+        self.recognizer.language_specific_patterns['toy'] = [(r'\bab', 'first'), (r'\ba\w+', 'second')]
+        self.recognizer._compile_language_patterns()
+        self.assertEqual(self.recognizer._extract_intent_data(['abc'], 'second', 'toy'), 'abc')
+        self.assertEqual(self.recognizer._calculate_language_specific_confidence(['abc'], 'toy'), 1.0)
+        self.assert_equivalent('toy', ['abc'])
+
+    def test_intent_may_appear_under_several_patterns(self):
+        self.recognizer.language_specific_patterns['toy'] = [(r'\bprint\s*\(', 'print_statement'),
+                                                            (r'\becho\b', 'print_statement'),
+                                                            (r'\bread\b', 'input_statement')]
+        self.recognizer._compile_language_patterns()
+        for tokens in (['echo', 'x'], ['echo', 'print(', 'x', ')'], ['read', 'x'], ['x']):
+            self.assert_equivalent('toy', tokens)
+
+if __name__ == '__main__':
+    unittest.main()
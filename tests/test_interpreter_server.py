@@ -0,0 +1,106 @@
+import os
+import socket
+import stat
+import tempfile
+import unittest
+from src.interpreter_server import InterpreterPool, InterpreterServer
+from src.interpreter_client import InterpreterClient
+from src.session_manager import bind_session
+
+class FakeInterpreter:
+    instances = 0
+
+    def __init__(self):
+        FakeInterpreter.instances += 1
+        self.variables = {}
+
+    def use_session(self, session):
+        return bind_session(self, session, ('variables',))
+
+    def process_single_instruction(self, instruction):
+        if instruction == 'fail':
+            raise RuntimeError("boom")
+        if instruction.startswith('set '):
+            name, value = instruction[4:].split('=')
+            self.variables[name] = value
+        elif instruction.startswith('get '):
+            return {'output': self.variables.get(instruction[4:]), 'translated_code': None, 'intent': {'type': 'get'}}
+        return {'output': instruction.upper(), 'translated_code': f"# {instruction}", 'intent': {'type': 'echo'}}
+
+class TestInterpreterServer(unittest.TestCase):
+    def setUp(self):
+        FakeInterpreter.instances = 0
+        self.server = InterpreterServer(InterpreterPool(FakeInterpreter, size=2))
+
+    def tearDown(self):
+        self.server.shutdown()
+
+    def test_unix_socket_round_trip(self):
+        socket_path = os.path.join(tempfile.mkdtemp(), 'interpreter.sock')
+        self.server.serve_in_background(self.server.create_unix_server(socket_path))
+        with InterpreterClient(socket_path=socket_path, timeout=5) as client:
+            self.assertEqual(client.request({'command': 'ping'})['message'], 'pong')
+            response = client.send("hello")
+            self.assertEqual(response['status'], 'success')
+            self.assertEqual(response['output'], 'HELLO')
+            self.assertEqual(client.send("fail")['status'], 'error')
+            self.assertEqual(client.send("again")['output'], 'AGAIN')
+        self.assertEqual(FakeInterpreter.instances, 2)
+
+    @unittest.skipUnless(hasattr(os, 'getuid'), "Unix sockets only")
+    def test_unix_socket_is_private(self):
+        directory = os.path.join(tempfile.mkdtemp(), 'missing')
+        socket_path = os.path.join(directory, 'interpreter.sock')
+        self.server.serve_in_background(self.server.create_unix_server(socket_path))
+        self.assertEqual(stat.S_IMODE(os.stat(socket_path).st_mode), 0o600)
+        self.assertEqual(stat.S_IMODE(os.stat(directory).st_mode), 0o700)
+
+    @unittest.skipUnless(hasattr(os, 'getuid'), "Unix sockets only")
+    def test_only_stale_sockets_are_replaced(self):
+        directory = tempfile.mkdtemp()
+        not_a_socket = os.path.join(directory, 'notes.txt')
+        with open(not_a_socket, 'w') as file:
+            file.write('keep me')
+        with self.assertRaises(FileExistsError):
+            self.server.create_unix_server(not_a_socket)
+        with open(not_a_socket) as file:
+            self.assertEqual(file.read(), 'keep me')
+
+        stale_path = os.path.join(directory, 'stale.sock')
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(stale_path)
+        stale.close()
+        self.server.serve_in_background(self.server.create_unix_server(stale_path))
+        with InterpreterClient(socket_path=stale_path, timeout=5) as client:
+            self.assertEqual(client.request({'command': 'ping'})['message'], 'pong')
+        # A live server's socket is not taken over
+        with self.assertRaises(OSError):
+            InterpreterServer(InterpreterPool(FakeInterpreter, size=1)).create_unix_server(stale_path)
+
+    def test_http_round_trip(self):
+        http_server = self.server.create_http_server(port=0)
+        self.server.serve_in_background(http_server)
+        url = f"http://127.0.0.1:{http_server.server_address[1]}/"
+        client = InterpreterClient(url=url, timeout=5)
+        self.assertEqual(client.send("hi")['translated_code'], '# hi')
+        self.assertEqual(client.request({'nothing': True})['status'], 'error')
+
+    def test_sessions_are_isolated(self):
+        self.server.handle_request({'instruction': 'set x=1', 'session': 'a'})
+        self.server.handle_request({'instruction': 'set x=2', 'session': 'b'})
+        self.assertEqual(self.server.handle_request({'instruction': 'get x', 'session': 'a'})['output'], '1')
+        self.assertEqual(self.server.handle_request({'instruction': 'get x', 'session': 'b'})['output'], '2')
+        self.assertIsNone(self.server.handle_request({'instruction': 'get x'})['output'])
+        self.assertEqual(self.server.handle_request({'command': 'stats'})['session_count'], 3)
+        self.assertEqual(self.server.handle_request({'command': 'close_session', 'session': 'a'})['status'], 'success')
+        self.assertIsNone(self.server.handle_request({'instruction': 'get x', 'session': 'a'})['output'])
+
+    def test_null_session_uses_the_default_session(self):
+        self.server.handle_request({'instruction': 'set x=1'})
+        for _ in range(3):
+            response = self.server.handle_request({'instruction': 'get x', 'session': None})
+            self.assertEqual((response['session'], response['output']), ('default', '1'))
+        self.assertEqual(self.server.handle_request({'command': 'stats'})['session_count'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import threading
+import unittest
+import urllib.request
+from src import english_execution_engine
+from src.english_execution_engine import EnglishExecutionEngine
+from src.metrics import MetricsRegistry, start_http_server, write_to_textfile
+from src.tracing import Tracer
+
+class TestMetrics(unittest.TestCase):
+    def test_counters_sum_across_threads(self):
+        registry = MetricsRegistry()
+        counter = registry.counter('requests_total', 'Requests', ('handler',))
+
+        def work():
+            for _ in range(1000):
+                counter.labels('a').inc()
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(counter.labels('a').value, 4000)
+        self.assertIs(registry.counter('requests_total', 'Requests', ('handler',)), counter)
+        self.assertIn('requests_total{handler="a"} 4000', registry.render())
+
+    def test_histogram_renders_cumulative_buckets(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram('latency_seconds', 'Latency', buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value)
+        text = registry.render()
+        self.assertIn('# TYPE latency_seconds histogram', text)
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{le="1"} 3', text)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 4', text)
+        self.assertIn('latency_seconds_count 4', text)
+
+    def test_engine_counts_instructions_and_table_sizes(self):
+        registry = english_execution_engine.REGISTRY
+        engine = EnglishExecutionEngine(tracer=Tracer())
+        executed = english_execution_engine.INSTRUCTIONS.labels('english_execution_engine', 'variable_management')
+        before = executed.value
+        engine.execute_instruction(engine.parse_instruction("Create a variable named 'x' with value 5"))
+        self.assertEqual(executed.value, before + 1)
+        engine.simulated_database['metrics_test_table'] = [{'id': 1}, {'id': 2}]
+        self.assertIn('codetalk_simulated_database_rows{table="metrics_test_table"} 2', registry.render())
+
+    def test_http_endpoint_and_file_dump(self):
+        registry = MetricsRegistry()
+        registry.gauge('pool_size', 'Pool size').set(3)
+        server = start_http_server(0, registry=registry)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url) as response:
+                self.assertIn('pool_size 3', response.read().decode('utf-8'))
+        finally:
+            server.shutdown()
+            server.server_close()
+        path = os.path.join(tempfile.mkdtemp(), 'metrics.prom')
+        write_to_textfile(path, registry)
+        with open(path) as file:
+            self.assertIn('# TYPE pool_size gauge', file.read())
+
+if __name__ == '__main__':
+    unittest.main()
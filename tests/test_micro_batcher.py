@@ -0,0 +1,146 @@
+import threading
+import unittest
+from benchmarks import fakes
+from src.intent_recognizer import IntentRecognizer
+from src.micro_batcher import MicroBatcher
+
+class FakeLLM:
+    """Answers a list of prompts with one call, recording each batch it was given."""
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, prompts):
+        self.calls.append(list(prompts))
+        return [f"Intent: {prompt.split()[0].lower()}" for prompt in prompts]
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_batches_up_to_max_size(self):
+        llm = FakeLLM()
+        batcher = MicroBatcher(llm, max_batch_size=3, max_wait_ms=1000)
+        futures = [batcher.submit(f"Create variable {i}") for i in range(6)]
+        results = [future.result(timeout=5) for future in futures]
+        batcher.close()
+        self.assertEqual(results, ["Intent: create"] * 6)
+        self.assertEqual([len(call) for call in llm.calls], [3, 3])
+
+    def test_flushes_partial_batch_after_wait(self):
+        llm = FakeLLM()
+        batcher = MicroBatcher(llm, max_batch_size=100, max_wait_ms=20)
+        future = batcher.submit("Display the value")
+        self.assertEqual(future.result(timeout=5), "Intent: display")
+        batcher.close()
+        self.assertEqual(llm.calls, [["Display the value"]])
+
+    def test_concurrent_callers_share_batches(self):
+        llm = FakeLLM()
+        batcher = MicroBatcher(llm, max_batch_size=8, max_wait_ms=200)
+        results = {}
+
+        def caller(i):
+            results[i] = batcher.submit(f"Call function {i}").result(timeout=5)
+
+        threads = [threading.Thread(target=caller, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        batcher.close()
+        self.assertEqual(len(results), 8)
+        self.assertLess(len(llm.calls), 8)
+
+    def test_per_item_and_batch_errors(self):
+        def process(items):
+            if "fail all" in items:
+                raise RuntimeError("model unavailable")
+            return [ValueError(item) if item == "bad" else item.upper() for item in items]
+
+        batcher = MicroBatcher(process, max_batch_size=2, max_wait_ms=1000)
+        good, bad = batcher.submit("good"), batcher.submit("bad")
+        self.assertEqual(good.result(timeout=5), "GOOD")
+        self.assertRaises(ValueError, bad.result, 5)
+        failed = batcher.submit("fail all")
+        batcher.close()
+        self.assertRaises(RuntimeError, failed.result, 5)
+        self.assertRaises(RuntimeError, batcher.submit, "late")
+
+class UnreliableLLM(fakes.FakeLLM):
+    """A fake chain that leaves some instructions out of a batch answer and garbles others."""
+    def __init__(self, skip=(), garble=()):
+        super().__init__()
+        self.skip = set(skip)
+        self.garble = set(garble)
+        self.prompts = []
+
+    def _respond(self, inputs):
+        self.prompts.append(dict(inputs))
+        response, delay = super()._respond(inputs)
+        if 'instructions' not in inputs:
+            return response, delay
+        blocks = []
+        for block in response.split('\n['):
+            number = int(block.lstrip('[').split(']')[0])
+            if number in self.skip:
+                continue
+            if number in self.garble:
+                block = block.replace('Confidence: 0.9', 'Confidence: very')
+            blocks.append(block)
+        return '\n['.join(blocks), delay
+
+class TestIntentRecognizerBatching(unittest.TestCase):
+    texts = ["Define a function 'add'", "Call the 'greet' function", "Print 'hello'", "Set 'x' to 1"]
+
+    def recognize(self, llm):
+        recognizer = IntentRecognizer(max_batch_size=len(self.texts), max_batch_wait_ms=1000)
+        recognizer._tokenize = str.split  # Avoid loading NLTK data
+        llm.install(recognizer)
+        futures = [recognizer.submit_intent({'raw_text': text}) for text in self.texts]
+        results = [future.result(timeout=5) for future in futures]
+        recognizer.intent_batcher.close()
+        return results
+
+    def test_submitted_instructions_share_one_prompt(self):
+        llm = UnreliableLLM()
+        results = self.recognize(llm)
+        self.assertEqual(llm.calls, 1)
+        self.assertEqual([result['primary_intent'] for result in results],
+                         [fakes.classify(text) for text in self.texts])
+        self.assertEqual(results[0]['relevant_entities'], ['add'])
+        self.assertEqual(results[2]['confidence_score'], 0.9)
+
+    def test_skipped_and_garbled_items_are_recognized_on_their_own(self):
+        llm = UnreliableLLM(skip={2}, garble={4})
+        results = self.recognize(llm)
+        self.assertEqual([result['primary_intent'] for result in results],
+                         [fakes.classify(text) for text in self.texts])
+        self.assertEqual([result['confidence_score'] for result in results], [0.9] * 4)
+        # One batch prompt, then one single prompt for each item the batch answer lost
+        self.assertEqual(llm.calls, 3)
+        self.assertEqual([prompt['instruction'] for prompt in llm.prompts[1:]], [self.texts[1], self.texts[3]])
+
+    def test_single_fallback_error_fails_only_its_item(self):
+        llm = UnreliableLLM(skip={2})
+        original = llm._respond
+
+        def respond(inputs):
+            if 'instruction' in inputs:
+                raise RuntimeError("model unavailable")
+            return original(inputs)
+
+        llm._respond = respond
+        recognizer = IntentRecognizer(max_batch_size=2, max_batch_wait_ms=1000)
+        recognizer._tokenize = str.split
+        llm.install(recognizer)
+        first, second = (recognizer.submit_intent({'raw_text': text}) for text in self.texts[2:])
+        self.assertEqual(first.result(timeout=5)['primary_intent'], fakes.classify(self.texts[2]))
+        self.assertRaises(RuntimeError, second.result, 5)
+        recognizer.intent_batcher.close()
+
+    def test_split_batch_result(self):
+        recognizer = IntentRecognizer()
+        blocks = recognizer._split_batch_result(
+            "Here you go:\n[1] Intent: print\nEntities: x\n\n  Confidence: 0.8\n[2]\nIntent: call\n[10] Intent: set")
+        self.assertEqual(blocks, {1: ['Intent: print', 'Entities: x', 'Confidence: 0.8'],
+                                  2: ['Intent: call'], 10: ['Intent: set']})
+
+if __name__ == '__main__':
+    unittest.main()
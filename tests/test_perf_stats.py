@@ -0,0 +1,44 @@
+import random
+import unittest
+from src.perf_stats import NULL_SPAN, LatencyHistogram, PerformanceStats
+from src.english_interpreter import EnglishInterpreter
+
+class TestPerfStats(unittest.TestCase):
+    def test_histogram_percentiles_are_close(self):
+        histogram = LatencyHistogram()
+        values = sorted(random.Random(1).randint(1000, 10 ** 7) for _ in range(20000))
+        for value in values:
+            histogram.record(value)
+        for percent in (50, 90, 99):
+            exact = values[int(percent / 100 * len(values)) - 1]
+            self.assertAlmostEqual(histogram.percentile(percent), exact, delta=exact * 0.04)
+        self.assertEqual(histogram.percentile(100), values[-1])
+        self.assertEqual(histogram.count, len(values))
+
+    def test_sampling_off_uses_null_span(self):
+        stats = PerformanceStats()
+        self.assertIs(stats.begin(), NULL_SPAN)
+        self.assertIn("sampling is off", stats.report())
+
+    def test_stages_and_intents_are_recorded(self):
+        stats = PerformanceStats(sample_rate=1.0)
+        for intent in ('variable_assignment', 'variable_assignment', 'function_call'):
+            span = stats.begin()
+            span.mark('input_processing')
+            span.mark('execution')
+            span.finish(intent)
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot['stages']['total']['count'], 3)
+        self.assertEqual(snapshot['intents']['variable_assignment']['execution']['count'], 2)
+        self.assertIn('function_call', stats.report())
+
+    def test_show_performance_stats_instruction(self):
+        interpreter = EnglishInterpreter(perf_sample_rate=1.0)
+        interpreter.performance.record([('execution', 1500)], 2000, 'io_operation')
+        result = interpreter.process_single_instruction("Show performance stats.")
+        self.assertEqual(result['intent']['type'], 'performance_stats')
+        self.assertIn('io_operation', result['output'])
+        self.assertEqual(interpreter.get_performance_stats()['stages']['execution']['count'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+from src.english_execution_engine import EnglishExecutionEngine
+from src.script_profiler import ScriptProfiler
+from src.tracing import Tracer
+
+class TestScriptProfiler(unittest.TestCase):
+    def profiled_engine(self):
+        engine = EnglishExecutionEngine(tracer=Tracer())
+        engine.profiler = profiler = ScriptProfiler()
+        arithmetic = engine.handle_arithmetic_operation
+
+        # Take a sample whenever the loop body runs, so the test does not depend on timing
+        def sampled_arithmetic(*args):
+            profiler.sample(0.001)
+            return arithmetic(*args)
+
+        engine.handle_arithmetic_operation = sampled_arithmetic
+        return engine, profiler
+
+    def test_samples_are_attributed_to_lines_and_nested_actions(self):
+        engine, profiler = self.profiled_engine()
+        engine.execute_instructions(["Create a variable named 'x' with value 0",
+                                     "For i from 1 to 3, add 'i' to 'x'"], line_numbers=[1, 4])
+        self.assertEqual(engine.variables['x'], 6)
+        self.assertEqual(profiler.collapsed(), ["L4: For i from 1 to 3, add 'i' to 'x';add 'i' to 'x' 3000"])
+        totals = {entry['frame']: entry for entry in profiler.line_totals()}
+        self.assertAlmostEqual(totals["L4: For i from 1 to 3, add 'i' to 'x'"]['wall'], 0.003)
+        self.assertEqual(totals["L4: For i from 1 to 3, add 'i' to 'x'"]['self_wall'], 0.0)
+
+    def test_parallel_execution_and_collapsed_file(self):
+        engine, profiler = self.profiled_engine()
+        engine.execute_instructions(["Create a variable named 'x' with value 0",
+                                     "For i from 1 to 2, add 'i' to 'x'"], parallel=True)
+        self.assertEqual(engine.variables['x'], 3)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'profile.folded')
+            profiler.write_collapsed(path)
+            with open(path) as file:
+                self.assertEqual(file.read(), "L2: For i from 1 to 2, add 'i' to 'x';add 'i' to 'x' 2000\n")
+
+    def test_sampler_thread_records_wall_time(self):
+        profiler = ScriptProfiler(interval=0.001)
+        with profiler:
+            profiler.enter({'operation': 'loop'})
+            while profiler.samples < 3:
+                pass
+            profiler.exit()
+        self.assertGreater(profiler.wall['loop'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from src.session_manager import SessionManager, SessionMemoryError, bind_session
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class Owner:
+    def __init__(self):
+        self.variables = {'shared': True}
+
+class TestSessionManager(unittest.TestCase):
+    def test_idle_sessions_are_evicted(self):
+        clock = FakeClock()
+        manager = SessionManager(idle_timeout=10, clock=clock)
+        manager.get('old')
+        clock.now = 8
+        manager.get('recent')
+        clock.now = 15
+        self.assertEqual(manager.evict_idle(), 1)
+        self.assertEqual(manager.metrics()['session_count'], 1)
+        self.assertEqual(manager.metrics()['evicted_idle'], 1)
+
+    def test_capacity_evicts_least_recently_used(self):
+        manager = SessionManager(max_sessions=2)
+        first = manager.get('a')
+        manager.get('b')
+        manager.get('a')
+        manager.get('c')
+        self.assertIs(manager.get('a'), first)
+        self.assertEqual(manager.metrics()['evicted_capacity'], 1)
+
+    def test_memory_cap_closes_session(self):
+        manager = SessionManager(max_session_bytes=10000)
+        session = manager.get('big')
+        session.state['variables'] = {'data': list(range(5000))}
+        with self.assertRaises(SessionMemoryError):
+            manager.record_usage(session)
+        self.assertEqual(manager.session_count, 0)
+
+    def test_sessions_are_measured_every_few_instructions(self):
+        manager = SessionManager(max_session_bytes=10000, measure_every=4)
+        session = manager.get('growing')
+        manager.record_usage(session)
+        session.state['variables'] = {'data': list(range(5000))}
+        for _ in range(3):
+            manager.record_usage(session)
+        self.assertEqual(manager.session_count, 1)
+        with self.assertRaises(SessionMemoryError):
+            manager.record_usage(session)
+        self.assertEqual(manager.session_count, 0)
+
+    def test_sessions_near_the_cap_are_measured_every_instruction(self):
+        manager = SessionManager(max_session_bytes=10000, measure_every=100)
+        session = manager.get('near')
+        session.state['variables'] = {'data': list(range(200))}
+        manager.record_usage(session)
+        self.assertGreater(session.memory_bytes * 2, manager.max_session_bytes)
+        session.state['variables']['data'].extend(range(5000))
+        with self.assertRaises(SessionMemoryError):
+            manager.record_usage(session)
+
+    def test_bind_session_swaps_state(self):
+        owner = Owner()
+        session = SessionManager().get('s')
+        with bind_session(owner, session, ('variables',)):
+            owner.variables['x'] = 1
+        self.assertEqual(owner.variables, {'shared': True})
+        self.assertEqual(session.state['variables'], {'x': 1})
+
+if __name__ == '__main__':
+    unittest.main()
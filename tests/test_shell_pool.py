@@ -0,0 +1,60 @@
+import subprocess
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from src.execution_engine import ExecutionEngine
+from src.shell_pool import ShellPool
+
+class TestShellPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = ShellPool(size=2, timeout=5)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_output_and_exit_status_are_framed_per_command(self):
+        result = self.pool.run("printf 'no newline'; echo oops >&2; exit 3")
+        self.assertEqual((result.returncode, result.stdout, result.stderr), (3, 'no newline', 'oops\n'))
+        result = self.pool.run("echo \"it's\" 'fine'; cd /")
+        self.assertEqual((result.returncode, result.stdout, result.stderr), (0, "it's fine\n", ''))
+        # The worker survives a syntax error and the cd above did not leak
+        self.assertEqual(self.pool.run("if then").returncode, 2)
+        self.assertNotEqual(self.pool.run("pwd").stdout, '/\n')
+
+    def test_background_output_stays_with_its_command(self):
+        pool = ShellPool(size=1)
+        try:
+            result = pool.run("(sleep 0.3; echo late) & echo now")
+            self.assertEqual(result.stdout, 'now\nlate\n')
+            self.assertEqual(pool.run("echo next").stdout, 'next\n')
+            self.assertEqual(pool.run("false & exit 4").returncode, 4)
+        finally:
+            pool.close()
+
+    def test_timeout_kills_and_restarts_the_worker(self):
+        pool = ShellPool(size=1)
+        try:
+            with self.assertRaises(subprocess.TimeoutExpired):
+                pool.run("echo started; sleep 5", timeout=0.2)
+            self.assertEqual(pool.run("echo again").stdout, 'again\n')
+        finally:
+            pool.close()
+
+    def test_commands_run_concurrently_across_workers(self):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(self.pool.run, ["sleep 0.3; echo a", "sleep 0.3; echo b"]))
+        self.assertLess(time.perf_counter() - start, 0.55)
+        self.assertEqual([result.stdout for result in results], ['a\n', 'b\n'])
+
+    def test_execution_engine_uses_the_pool(self):
+        engine = ExecutionEngine()
+        intent = {'primary_intent': 'execute_system_command', 'relevant_entities': {'command': 'echo hello'}}
+        self.assertEqual(engine.execute(intent), "Command executed successfully. Output:\nhello\n")
+        # $$ is the worker shell's pid even inside the subshell, so a reused worker reports the same one
+        intent['relevant_entities']['command'] = 'echo $$'
+        self.assertEqual(engine.execute(intent), engine.execute(intent))
+        engine.shell_pool.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+from src.switch_dispatch import SwitchTable, normalize_case_value
+
+class TestSwitchDispatch(unittest.TestCase):
+    def test_plain_cases_are_normalized(self):
+        switch = SwitchTable({"'Red'": 'red action', '2': 'two', 'blue': 'blue action'}, default='fallback')
+        self.assertEqual(switch.lookup('red'), 'red action')
+        self.assertEqual(switch.lookup(' BLUE '), 'blue action')
+        self.assertEqual(switch.lookup(2), 'two')
+        self.assertEqual(switch.lookup(2.0), 'two')
+        self.assertEqual(switch.lookup('green'), 'fallback')
+        self.assertEqual(switch.lookup(['unhashable']), 'fallback')
+        self.assertEqual(normalize_case_value('"3.5"'), 3.5)
+
+    def test_range_and_predicate_cases(self):
+        switch = SwitchTable({'0': 'zero', '1 to 9': 'small', 'between 10 and 99': 'medium',
+                              'is at least 100': 'large'})
+        self.assertEqual(switch.lookup(0), 'zero')
+        self.assertEqual(switch.lookup(5), 'small')
+        self.assertEqual(switch.lookup(42), 'medium')
+        self.assertEqual(switch.lookup(1000), 'large')
+        self.assertIsNone(switch.lookup(-1))
+        self.assertIsNone(switch.lookup('text'))
+
+    def test_actions_compile_once(self):
+        compiled = []
+        switch = SwitchTable({'a': 'do a', 'b': 'do b'}, compile_action=lambda action: compiled.append(action) or action.upper())
+        for _ in range(3):
+            self.assertEqual(switch.compiled_action('a'), 'DO A')
+        self.assertEqual(compiled, ['do a'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from src.english_execution_engine import EnglishExecutionEngine
+from src.session_manager import SessionManager
+from src.tracing import DEBUG, ERROR, OFF, Tracer
+
+class TestTracing(unittest.TestCase):
+    def test_levels_are_set_per_subsystem(self):
+        tracer = Tracer(buffer_size=3)
+        tracer.debug('parse', 'instruction', instruction='x')
+        self.assertEqual(tracer.recent(), [])
+        tracer.set_level(DEBUG, ['parse'])
+        for i in range(5):
+            tracer.debug('parse', 'instruction', instruction=i)
+        tracer.info('data', 'created', "Created a new list 'l'")
+        self.assertEqual([event.get('instruction') for event in tracer.recent()], [3, 4, None])
+        self.assertEqual(len(tracer.recent('parse')), 2)
+        tracer.set_level(OFF)
+        self.assertFalse(tracer.enabled('data', ERROR))
+
+    def test_messages_are_formatted_only_when_recorded(self):
+        formatted = []
+
+        class Value:
+            def __str__(self):
+                formatted.append(1)
+                return 'value'
+
+        tracer = Tracer(level=ERROR)
+        tracer.info('data', 'appended', "Appended %s to list '%s'", Value(), 'l')
+        self.assertEqual((tracer.recent(), formatted), ([], []))
+        tracer.set_level(DEBUG)
+        tracer.info('data', 'appended', "Appended %s to list '%s'", Value(), 'l')
+        self.assertEqual(tracer.recent()[-1]['message'], "Appended value to list 'l'")
+
+    def test_echo_prints_the_formatted_message(self):
+        tracer = Tracer(echo=True)
+        output = StringIO()
+        with redirect_stdout(output):
+            tracer.info('data', 'assigned', "Variable '%s' has been assigned the value: %s", 'x', 5)
+            tracer.info('data', 'plain', "100% done")
+            tracer.debug('data', 'dropped', "Not %s", 'shown')
+        self.assertEqual(output.getvalue(), "Variable 'x' has been assigned the value: 5\n100% done\n")
+
+    def test_engine_records_only_errors_by_default(self):
+        engine = EnglishExecutionEngine()
+        self.assertFalse(engine.tracer.echo)
+        engine.execute_instruction(engine.parse_instruction("Create a variable named 'x' with value 5"))
+        self.assertEqual(engine.tracer.recent(), [])
+
+    def test_jsonl_sink(self):
+        path = os.path.join(tempfile.mkdtemp(), 'trace.jsonl')
+        tracer = Tracer(sink_path=path)
+        tracer.error('file', 'error', "Error in file operation: boom", filename='f.txt')
+        tracer.close()
+        with open(path) as file:
+            event = json.loads(file.readline())
+        self.assertEqual((event['subsystem'], event['level'], event['filename']), ('file', 'error', 'f.txt'))
+
+    def test_engine_traces_debug_events_when_enabled(self):
+        engine = EnglishExecutionEngine(tracer=Tracer())
+        engine.execute_instruction(engine.parse_instruction("Create a variable named 'x' with value 5"))
+        self.assertEqual(engine.tracer.recent('parse'), [])
+        engine.tracer.set_level(DEBUG, ['parse'])
+        engine.parse_instruction("Create a variable named 'y' with value 6")
+        self.assertEqual(engine.tracer.recent('parse')[-1]['instruction'], "Create a variable named 'y' with value 6")
+
+    def test_sessions_have_their_own_ring_buffer(self):
+        engine = EnglishExecutionEngine(tracer=Tracer())
+        manager = SessionManager()
+        with engine.use_session(manager.get('a')):
+            engine.execute_instruction(engine.parse_instruction("Create a variable named 'x' with value 5"))
+            session_events = engine.tracer.recent()
+        self.assertTrue(session_events)
+        self.assertEqual(engine.tracer.recent(), [])
+
+if __name__ == '__main__':
+    unittest.main()